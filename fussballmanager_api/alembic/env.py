@@ -16,10 +16,20 @@ if config.config_file_name is not None:
 
 # add your model's MetaData object here
 # for 'autogenerate' support
-from app.db.database import Base
-from app.models import user_model, member_model
+from app.db.base import Base
+from app.db.database import get_settings
 target_metadata = Base.metadata
 
+# Migrate the database the app is configured for (DATABASE_URL / .env)
+config.set_main_option("sqlalchemy.url", get_settings().database_url.replace("%", "%%"))
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The SQLite FTS5 table and its shadow tables are created by DDL hooks, not models
+    if type_ == "table" and reflected and name.startswith("members_fts"):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -42,6 +52,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -65,7 +76,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
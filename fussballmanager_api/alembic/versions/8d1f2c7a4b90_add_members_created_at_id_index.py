@@ -0,0 +1,28 @@
+"""add members created_at id index
+
+Revision ID: 8d1f2c7a4b90
+Revises: 3652be1d7134
+Create Date: 2026-10-17 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d1f2c7a4b90'
+down_revision: Union[str, Sequence[str], None] = '3652be1d7134'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_members_created_at_id', 'members', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_members_created_at_id', table_name='members')
@@ -0,0 +1,33 @@
+"""add members lower(email) and team order indexes
+
+Revision ID: a4d7e2c9f813
+Revises: f1a9c3e7b246
+Create Date: 2026-10-17 18:21:07.553912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d7e2c9f813'
+down_revision: Union[str, Sequence[str], None] = 'f1a9c3e7b246'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_members_email_lower', 'members', [sa.text('lower(email)')], unique=False)
+    # Replaces ix_members_team: same leading column, and also serves the page order
+    op.create_index('idx_members_team_created_at_id', 'members', ['team', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_members_team', table_name='members')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_members_team', 'members', ['team'], unique=False)
+    op.drop_index('idx_members_team_created_at_id', table_name='members')
+    op.drop_index('ix_members_email_lower', table_name='members')
@@ -0,0 +1,31 @@
+"""add members birthdate index for age groups
+
+Revision ID: b3d9f5a2c718
+Revises: e8c2a6f4b195
+Create Date: 2026-10-17 23:12:40.218457
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d9f5a2c718'
+down_revision: Union[str, Sequence[str], None] = 'e8c2a6f4b195'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Age groups filter on birthdate ranges; team and status make their counts index-only
+    op.create_index(
+        'idx_members_birthdate_team_status', 'members', ['birthdate', 'team', 'status'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_members_birthdate_team_status', table_name='members')
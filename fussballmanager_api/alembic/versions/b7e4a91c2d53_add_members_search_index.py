@@ -0,0 +1,72 @@
+"""add members search index
+
+Revision ID: b7e4a91c2d53
+Revises: 8d1f2c7a4b90
+Create Date: 2026-10-17 10:03:48.915274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4a91c2d53'
+down_revision: Union[str, Sequence[str], None] = '8d1f2c7a4b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PG_SEARCH_TEXT = "(lower(first_name || ' ' || last_name || ' ' || coalesce(email, '')))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("""CREATE VIRTUAL TABLE members_fts USING fts5(
+            first_name, last_name, email,
+            content='members', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )""")
+        op.execute("""CREATE TRIGGER members_fts_ai AFTER INSERT ON members BEGIN
+            INSERT INTO members_fts(rowid, first_name, last_name, email)
+            VALUES (new.rowid, new.first_name, new.last_name, new.email);
+        END""")
+        op.execute("""CREATE TRIGGER members_fts_ad AFTER DELETE ON members BEGIN
+            INSERT INTO members_fts(members_fts, rowid, first_name, last_name, email)
+            VALUES ('delete', old.rowid, old.first_name, old.last_name, old.email);
+        END""")
+        op.execute("""CREATE TRIGGER members_fts_au AFTER UPDATE OF first_name, last_name, email ON members BEGIN
+            INSERT INTO members_fts(members_fts, rowid, first_name, last_name, email)
+            VALUES ('delete', old.rowid, old.first_name, old.last_name, old.email);
+            INSERT INTO members_fts(rowid, first_name, last_name, email)
+            VALUES (new.rowid, new.first_name, new.last_name, new.email);
+        END""")
+        # Index the existing rows
+        op.execute("INSERT INTO members_fts(members_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            'ix_members_search_tsv', 'members',
+            [sa.text(f"to_tsvector('simple'::regconfig, {PG_SEARCH_TEXT})")],
+            postgresql_using='gin'
+        )
+        op.create_index(
+            'ix_members_search_trgm', 'members',
+            [sa.text(f"{PG_SEARCH_TEXT} gin_trgm_ops")],
+            postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS members_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS members_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS members_fts_ai")
+        op.execute("DROP TABLE IF EXISTS members_fts")
+    elif dialect == "postgresql":
+        op.drop_index('ix_members_search_trgm', table_name='members')
+        op.drop_index('ix_members_search_tsv', table_name='members')
@@ -0,0 +1,49 @@
+"""add member_roles table
+
+Revision ID: c3a58e0f7d21
+Revises: b7e4a91c2d53
+Create Date: 2026-10-17 11:26:05.538812
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a58e0f7d21'
+down_revision: Union[str, Sequence[str], None] = 'b7e4a91c2d53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    member_roles = op.create_table('member_roles',
+    sa.Column('member_id', sa.String(length=36), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('member_id', 'role')
+    )
+    op.create_index('idx_member_roles_role_member', 'member_roles', ['role', 'member_id'], unique=False)
+
+    # Backfill from the members.roles JSON lists
+    members = sa.table('members', sa.column('id', sa.String), sa.column('roles', sa.JSON))
+    bind = op.get_bind()
+    rows = []
+    for member_id, roles in bind.execute(sa.select(members.c.id, members.c.roles)):
+        rows.extend({"member_id": member_id, "role": role} for role in dict.fromkeys(roles or []))
+        if len(rows) >= BATCH_SIZE:
+            bind.execute(member_roles.insert(), rows)
+            rows = []
+    if rows:
+        bind.execute(member_roles.insert(), rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_member_roles_role_member', table_name='member_roles')
+    op.drop_table('member_roles')
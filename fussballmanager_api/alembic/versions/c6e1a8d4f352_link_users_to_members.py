@@ -0,0 +1,41 @@
+"""link users to members explicitly
+
+Revision ID: c6e1a8d4f352
+Revises: b3d9f5a2c718
+Create Date: 2026-10-18 09:41:17.305129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e1a8d4f352'
+down_revision: Union[str, Sequence[str], None] = 'b3d9f5a2c718'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Same storage as members.id (see UUIDKey). Existing accounts are not linked by
+    # email: registration emails are unverified, an admin links accounts instead
+    dialect = op.get_bind().dialect.name
+    key = postgresql.UUID(as_uuid=False) if dialect == 'postgresql' else sa.LargeBinary(length=16)
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('member_id', key, nullable=True))
+        batch_op.create_unique_constraint('uq_users_member_id', ['member_id'])
+        batch_op.create_foreign_key(
+            'fk_users_member_id_members', 'members', ['member_id'], ['id'], ondelete='SET NULL'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_constraint('fk_users_member_id_members', type_='foreignkey')
+        batch_op.drop_constraint('uq_users_member_id', type_='unique')
+        batch_op.drop_column('member_id')
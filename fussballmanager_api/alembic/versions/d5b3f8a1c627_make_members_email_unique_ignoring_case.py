@@ -0,0 +1,44 @@
+"""make members email unique ignoring case
+
+Revision ID: d5b3f8a1c627
+Revises: a4d7e2c9f813
+Create Date: 2026-10-17 19:47:33.016482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b3f8a1c627'
+down_revision: Union[str, Sequence[str], None] = 'a4d7e2c9f813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The old existence check was racy, so duplicates may exist; they have to be
+    # resolved by hand (which member keeps the address is not ours to decide)
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT lower(email) FROM members WHERE email IS NOT NULL "
+        "GROUP BY lower(email) HAVING count(*) > 1"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f"{len(duplicates)} email address(es) are used by several members, e.g. {duplicates[:5]}. "
+            "Change or clear them, then run the migration again."
+        )
+    op.create_index('ux_members_email_lower', 'members', [sa.text('lower(email)')], unique=True)
+    op.drop_index('ix_members_email_lower', table_name='members')
+    # No query reads the raw email column any more
+    op.drop_index('ix_members_email', table_name='members')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_members_email', 'members', ['email'], unique=False)
+    op.create_index('ix_members_email_lower', 'members', [sa.text('lower(email)')], unique=False)
+    op.drop_index('ux_members_email_lower', table_name='members')
@@ -0,0 +1,96 @@
+"""add users, clubs, events and payments tables
+
+Revision ID: e2f6b8d0a915
+Revises: c3a58e0f7d21
+Create Date: 2026-10-17 15:02:41.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f6b8d0a915'
+down_revision: Union[str, Sequence[str], None] = 'c3a58e0f7d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('clubs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('founded_year', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_clubs_id'), 'clubs', ['id'], unique=False)
+
+    # Databases set up before migrations covered users already have the table
+    # (it used to be created by the app on import), only club_id is new there
+    if sa.inspect(op.get_bind()).has_table('users'):
+        with op.batch_alter_table('users') as batch_op:
+            batch_op.add_column(sa.Column('club_id', sa.Integer(), nullable=True))
+            batch_op.create_index(batch_op.f('ix_users_club_id'), ['club_id'], unique=False)
+            batch_op.create_foreign_key('fk_users_club_id_clubs', 'clubs', ['club_id'], ['id'])
+    else:
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('club_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], name='fk_users_club_id_clubs'),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_users_club_id'), 'users', ['club_id'], unique=False)
+        op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+        op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+        op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+
+    op.create_table('events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('club_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['club_id'], ['clubs.id'], ),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_events_id'), 'events', ['id'], unique=False)
+    op.create_table('payments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('member_id', sa.String(length=36), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('due_date', sa.Date(), nullable=False),
+    sa.Column('payment_date', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_payments_id'), 'payments', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_payments_id'), table_name='payments')
+    op.drop_table('payments')
+    op.drop_index(op.f('ix_events_id'), table_name='events')
+    op.drop_table('events')
+    # users predates this revision on older databases, so only club_id is removed
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_constraint('fk_users_club_id_clubs', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_users_club_id'))
+        batch_op.drop_column('club_id')
+    op.drop_index(op.f('ix_clubs_id'), table_name='clubs')
+    op.drop_table('clubs')
@@ -0,0 +1,180 @@
+"""store member ids as binary uuids
+
+Revision ID: e8c2a6f4b195
+Revises: d5b3f8a1c627
+Create Date: 2026-10-17 21:05:52.690314
+
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c2a6f4b195'
+down_revision: Union[str, Sequence[str], None] = 'd5b3f8a1c627'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Member key columns: (table, column, foreign key name on Postgres)
+KEY_COLUMNS = [
+    ('members', 'id', None),
+    ('member_roles', 'member_id', 'member_roles_member_id_fkey'),
+    ('payments', 'member_id', 'payments_member_id_fkey'),
+]
+
+SQLITE_FTS_TRIGGERS = [
+    """CREATE TRIGGER members_fts_ai AFTER INSERT ON members BEGIN
+        INSERT INTO members_fts(rowid, first_name, last_name, email)
+        VALUES (new.rowid, new.first_name, new.last_name, new.email);
+    END""",
+    """CREATE TRIGGER members_fts_ad AFTER DELETE ON members BEGIN
+        INSERT INTO members_fts(members_fts, rowid, first_name, last_name, email)
+        VALUES ('delete', old.rowid, old.first_name, old.last_name, old.email);
+    END""",
+    """CREATE TRIGGER members_fts_au AFTER UPDATE OF first_name, last_name, email ON members BEGIN
+        INSERT INTO members_fts(members_fts, rowid, first_name, last_name, email)
+        VALUES ('delete', old.rowid, old.first_name, old.last_name, old.email);
+        INSERT INTO members_fts(rowid, first_name, last_name, email)
+        VALUES (new.rowid, new.first_name, new.last_name, new.email);
+    END""",
+]
+
+
+def members_table(key):
+    return [
+        sa.Column('id', key, nullable=False),
+        sa.Column('first_name', sa.String(length=100), nullable=False),
+        sa.Column('last_name', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('birthdate', sa.Date(), nullable=True),
+        sa.Column('roles', sa.JSON(), nullable=False),
+        sa.Column('team', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_by', sa.String(length=36), nullable=True),
+        sa.Column('updated_by', sa.String(length=36), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+
+
+def member_roles_table(key):
+    return [
+        sa.Column('member_id', key, nullable=False),
+        sa.Column('role', sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('member_id', 'role'),
+    ]
+
+
+def payments_table(key):
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('member_id', key, nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('payment_date', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+
+
+def members_indexes(legacy):
+    indexes = [
+        ('idx_members_team_status', 'members', ['team', 'status']),
+        ('idx_members_created_at_id', 'members', ['created_at', 'id']),
+        ('idx_members_team_created_at_id', 'members', ['team', 'created_at', 'id']),
+    ]
+    if legacy:
+        indexes.append(('ix_members_id', 'members', ['id']))
+    return indexes
+
+
+def rebuild_sqlite(name, columns, key_column, convert, indexes, keep_rowid=False):
+    """
+    Copy a table into a new one with a different key column type, converting the
+    values with the SQL function `convert`. SQLite cannot change a column type in
+    place; batch mode is not used because members must keep its rowids (the FTS
+    index refers to them) and its triggers.
+    """
+    tmp = f"_{name}_new"
+    op.create_table(tmp, *columns)
+    names = [c.name for c in columns if isinstance(c, sa.Column)]
+    select_list = ", ".join(f"{convert}({n})" if n == key_column else n for n in names)
+    rowid = "rowid, " if keep_rowid else ""
+    op.execute(f"INSERT INTO {tmp} ({rowid}{', '.join(names)}) SELECT {rowid}{select_list} FROM {name}")
+    # Drops the table's indexes and triggers as well
+    op.drop_table(name)
+    op.rename_table(tmp, name)
+    for index_name, table, index_columns in indexes:
+        op.create_index(index_name, table, index_columns, unique=False)
+
+
+def to_bytes(value):
+    return None if value is None else uuid.UUID(value).bytes
+
+
+def to_text(value):
+    return None if value is None else str(uuid.UUID(bytes=bytes(value)))
+
+
+def convert_sqlite(key, convert, legacy):
+    bind = op.get_bind()
+    if bind.exec_driver_sql("PRAGMA foreign_keys").scalar():
+        # Dropping members would cascade into member_roles
+        raise RuntimeError("Run this migration with PRAGMA foreign_keys=OFF")
+    bind.connection.dbapi_connection.create_function("convert_key", 1, convert, deterministic=True)
+
+    rebuild_sqlite('members', members_table(key), 'id', 'convert_key', members_indexes(legacy), keep_rowid=True)
+    op.create_index('ux_members_email_lower', 'members', [sa.text('lower(email)')], unique=True)
+    for trigger in SQLITE_FTS_TRIGGERS:
+        op.execute(trigger)
+    rebuild_sqlite(
+        'member_roles', member_roles_table(key), 'member_id', 'convert_key',
+        [('idx_member_roles_role_member', 'member_roles', ['role', 'member_id'])],
+    )
+    payment_indexes = [('ix_payments_id', 'payments', ['id'])]
+    if not legacy:
+        payment_indexes.append(('ix_payments_member_id', 'payments', ['member_id']))
+    rebuild_sqlite('payments', payments_table(key), 'member_id', 'convert_key', payment_indexes)
+
+
+def convert_postgresql(type_name):
+    for table, column, foreign_key in KEY_COLUMNS:
+        if foreign_key:
+            op.drop_constraint(foreign_key, table, type_='foreignkey')
+    for table, column, _ in KEY_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}")
+    op.create_foreign_key(
+        'member_roles_member_id_fkey', 'member_roles', 'members', ['member_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key('payments_member_id_fkey', 'payments', 'members', ['member_id'], ['id'])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        convert_sqlite(sa.LargeBinary(length=16), to_bytes, legacy=False)
+    else:
+        if dialect == 'postgresql':
+            convert_postgresql('uuid')
+        op.drop_index('ix_members_id', table_name='members')
+        op.create_index('ix_payments_member_id', 'payments', ['member_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        convert_sqlite(sa.String(length=36), to_text, legacy=True)
+    else:
+        op.drop_index('ix_payments_member_id', table_name='payments')
+        op.create_index('ix_members_id', 'members', ['id'], unique=False)
+        if dialect == 'postgresql':
+            convert_postgresql('varchar(36)')
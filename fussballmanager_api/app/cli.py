@@ -0,0 +1,71 @@
+"""
+Administrative commands, run against the configured database (DATABASE_URL):
+
+    python -m app.cli make-admin <username>
+    python -m app.cli make-admin <username> --member-id <member id>
+
+Accounts only get roles through the member an admin linked them to (PUT
+/admin/users/{id}/member), so the first admin of a deployment is made here.
+"""
+
+import argparse
+import sys
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.models.member_model import Member
+from app.models.user_model import User
+from app.repositories.member_repo import MemberRepository
+from app.schemas.member_schema import MemberCreate, MemberUpdate
+
+
+def make_admin(db: Session, username: str, member_id: Optional[str] = None) -> Member:
+    """
+    Make the account `username` an admin: link it to the member `member_id`, by
+    default its linked member or a new one, and give that member the admin role.
+    Raises LookupError for an unknown user or member, ValueError if the member
+    is linked to another account.
+    """
+    user = db.scalars(select(User).where(User.username == username)).first()
+    if user is None:
+        raise LookupError(f"No user named '{username}'")
+    repo = MemberRepository(db)
+    target = member_id or user.member_id
+    member = repo.get_by_id(target) if target else None
+    if member is None and member_id is not None:
+        raise LookupError(f"No member with id '{member_id}'")
+    if member is None:
+        member = repo.create_member(MemberCreate(first_name=username, last_name="Admin", roles=["admin"]))
+    elif "admin" not in member.roles or member.status != "active":
+        member = repo.update_member(member, MemberUpdate(roles=list(dict.fromkeys([*member.roles, "admin"])), status="active"))
+
+    if user.member_id != member.id:
+        linked = db.scalars(select(User.username).where(User.member_id == member.id)).first()
+        if linked is not None:
+            raise ValueError(f"Member {member.id} is linked to the account '{linked}'")
+        user.member_id = member.id
+        db.commit()
+    return member
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+    admin = commands.add_parser("make-admin", help="Link an account to an admin member")
+    admin.add_argument("username")
+    admin.add_argument("--member-id", help="Member to link and give the admin role (default: a new member)")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        try:
+            member = make_admin(db, args.username, args.member_id)
+        except (LookupError, ValueError) as exc:
+            print(exc, file=sys.stderr)
+            return 1
+        print(f"'{args.username}' is an admin, linked to member {member.id}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
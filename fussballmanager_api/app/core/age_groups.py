@@ -0,0 +1,62 @@
+"""
+Youth age groups (U9 ... U19, senior) of the current season.
+
+A member's age group follows from the birthdate and the season's cutoff date:
+U<n> holds the members born in the year that ends at the cutoff n years before
+it, e.g. with the default 1 January cutoff of season 2026/27 (cutoff 2027-01-01)
+U15 are the members born in 2012. U9 also holds everyone younger, senior
+everyone older than U19. Members without a birthdate are in no group.
+
+Nothing is stored per member: a group is a birthdate range, which
+idx_members_birthdate_team_status serves as an index range scan. The ranges move
+with the date, so the groups roll over on SEASON_START without a batch job.
+"""
+
+from datetime import date
+from typing import Literal, Optional, Tuple, get_args
+from app.db.database import get_settings
+
+AgeGroup = Literal["U9", "U10", "U11", "U12", "U13", "U14", "U15", "U16", "U17", "U18", "U19", "senior"]
+AGE_GROUPS = get_args(AgeGroup)
+YOUTH_AGES = range(9, 20)
+
+
+def month_day(value: str) -> Tuple[int, int]:
+    """A "MM-DD" setting as (month, day); 29 February is rejected, it is not in every year"""
+    month, day = (int(part) for part in value.split("-"))
+    date(2001, month, day)
+    return month, day
+
+
+def season_cutoff(today: date, season_start: str = "07-01", cutoff: str = "01-01") -> date:
+    """Cutoff date of the season `today` is in: the first `cutoff` on or after the season start"""
+    start = date(today.year, *month_day(season_start))
+    if today < start:
+        start = start.replace(year=start.year - 1)
+    boundary = date(start.year, *month_day(cutoff))
+    return boundary if boundary >= start else boundary.replace(year=boundary.year + 1)
+
+
+def current_cutoff() -> date:
+    """Cutoff of the season running today (SEASON_START, AGE_GROUP_CUTOFF)"""
+    settings = get_settings()
+    return season_cutoff(date.today(), settings.season_start, settings.age_group_cutoff)
+
+
+def birthdate_range(age_group: str, cutoff: date) -> Tuple[Optional[date], Optional[date]]:
+    """Birthdates of `age_group` as [earliest, before) for `cutoff`, None for no bound"""
+    if age_group == "senior":
+        return None, cutoff.replace(year=cutoff.year - YOUTH_AGES[-1])
+    age = int(age_group[1:])
+    earliest = cutoff.replace(year=cutoff.year - age)
+    if age == YOUTH_AGES[0]:
+        return earliest, None
+    return earliest, cutoff.replace(year=cutoff.year - age + 1)
+
+
+def in_age_group(birthdate: Optional[date], age_group: str, cutoff: date) -> bool:
+    """birthdate_range for one already loaded birthdate"""
+    if birthdate is None:
+        return False
+    earliest, before = birthdate_range(age_group, cutoff)
+    return (earliest is None or birthdate >= earliest) and (before is None or birthdate < before)
@@ -0,0 +1,63 @@
+import hashlib
+from typing import Awaitable, Callable, Iterable, Optional
+from fastapi import Request, Response
+from app.core.cache import TTLCache
+from app.db.database import get_settings
+
+# Rendered JSON bodies by ETag. The version stamp is part of the ETag, so a write
+# makes every entry unreachable; eviction is by size (LRU) and TTL.
+response_cache = TTLCache(
+    maxsize=get_settings().member_response_cache_size,
+    ttl=get_settings().member_response_cache_ttl
+)
+
+
+def make_etag(version: int, parts: Iterable[str]) -> str:
+    """Strong ETag for a representation: data version plus whatever selects it"""
+    digest = hashlib.sha1("\x1f".join(parts).encode()).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def request_etag(
+    request: Request, version: Optional[int], principal: str, extra: Iterable[str] = ()
+) -> Optional[str]:
+    """
+    ETag of a GET: version, path, normalized query string and caller, None without
+    a version. `extra` is whatever else the response depends on, e.g. the season.
+    """
+    if version is None:
+        return None
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    return make_etag(version, [request.url.path, query, principal, *extra])
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison and may list several tags or be *"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+async def conditional_json(
+    request: Request,
+    etag: Optional[str],
+    render: Callable[[], Awaitable[bytes]]
+) -> Response:
+    """
+    304 if the client already has `etag`, else the JSON body from the response
+    cache or from `render()`. Without an ETag the body is always rendered.
+    """
+    if etag is None:
+        return Response(content=await render(), media_type="application/json")
+
+    # no-cache: clients may store the response but must revalidate it
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get(etag)
+    if body is None:
+        body = await render()
+        response_cache.set(etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,249 @@
+import csv
+import io
+import json
+import re
+from datetime import date, datetime
+from tempfile import SpooledTemporaryFile
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from app.schemas.member_schema import MemberCreate
+
+# Content types accepted by POST /members/import
+IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+# Rows validated, checked and inserted per transaction
+IMPORT_BATCH_SIZE = 500
+
+# Export formats of GET /members/export
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Rows fetched from the database cursor at a time, and written per chunk
+EXPORT_BATCH_SIZE = 1000
+
+# Uploads larger than this are spooled to a temporary file instead of memory
+IMPORT_SPOOL_MAX_MEMORY = 1024 * 1024
+IMPORT_READ_CHUNK = 64 * 1024
+
+# Row = (line number, parsed fields or None, parse error or None)
+Row = Tuple[int, Optional[dict], Optional[str]]
+
+
+async def spool_body(chunks: AsyncIterator[bytes]) -> SpooledTemporaryFile:
+    """
+    Read a request body to the end into a spooled file. The body has to be consumed
+    before a streaming response starts: afterwards the server only delivers
+    disconnect messages.
+    """
+    spool = SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_MEMORY)
+    async for chunk in chunks:
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+async def iter_spool(spool: SpooledTemporaryFile) -> AsyncIterator[bytes]:
+    """Read a spooled body back in chunks and close it when done"""
+    try:
+        while chunk := spool.read(IMPORT_READ_CHUNK):
+            yield chunk
+    finally:
+        spool.close()
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without reading it all into memory"""
+    buffer = b""
+    first = True
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            text = line.decode("utf-8", errors="replace").rstrip("\r")
+            if first:
+                text, first = text.lstrip("\ufeff"), False
+            yield text
+    if buffer:
+        text = buffer.decode("utf-8", errors="replace").rstrip("\r")
+        yield text.lstrip("\ufeff") if first else text
+
+
+async def iter_csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[Row]:
+    """
+    Parse CSV with a header row. Quoted fields may span lines: a record is complete
+    once it contains an even number of quote characters.
+    """
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    line_no = start = 0
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            start = line_no
+        pending.append(line)
+        record = "\n".join(pending)
+        if record.count('"') % 2:
+            continue
+        pending = []
+        try:
+            values = next(csv.reader([record]), [])
+        except csv.Error as exc:
+            yield start, None, f"Invalid CSV: {exc}"
+            continue
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) > len(header):
+            yield start, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield start, dict(zip(header, values)), None
+    if pending:
+        yield start, None, "Invalid CSV: unterminated quoted field"
+
+
+async def iter_ndjson_rows(lines: AsyncIterator[str]) -> AsyncIterator[Row]:
+    """Parse one JSON object per line"""
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            yield line_no, None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(data, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, data, None
+
+
+def csv_member_fields(row: Dict[str, str]) -> dict:
+    """CSV cells are strings: empty cells mean "not given", roles are separated by ; , or |"""
+    data = {key: value.strip() for key, value in row.items() if key and value and value.strip()}
+    if "roles" in data:
+        data["roles"] = [role.strip() for role in re.split(r"[;,|]", data["roles"]) if role.strip()]
+    return data
+
+
+def validation_messages(exc: ValidationError) -> List[str]:
+    return [f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}" for error in exc.errors()]
+
+
+async def import_members(repo, rows: AsyncIterator[Row], fmt: str, created_by: Optional[str]):
+    """
+    Validate rows with MemberCreate and insert them in batches of IMPORT_BATCH_SIZE,
+    one transaction per batch. Email uniqueness is checked once per batch against the
+    database and across the whole file in memory.
+
+    Yields NDJSON-ready dicts: one per rejected row, one per committed batch and a
+    final summary.
+    """
+    seen_emails = set()
+    batch: List[Tuple[int, MemberCreate]] = []
+    imported = failed = 0
+
+    async def flush():
+        nonlocal imported, failed
+        results = []
+        emails = [member.email.lower() for _, member in batch if member.email]
+        taken = await repo.existing_emails(emails) if emails else set()
+        accepted = []
+        for line, member in batch:
+            if member.email and member.email.lower() in taken:
+                failed += 1
+                results.append({"line": line, "status": "error", "errors": ["email: Email already exists"]})
+            else:
+                accepted.append((line, member))
+        if accepted:
+            try:
+                await repo.bulk_create([member for _, member in accepted], created_by=created_by)
+                imported += len(accepted)
+            except SQLAlchemyError as exc:
+                # e.g. an email taken since the check; bulk_create rolled the batch back
+                failed += len(accepted)
+                results.extend(
+                    {"line": line, "status": "error", "errors": [f"Insert failed: {exc.__class__.__name__}"]}
+                    for line, _ in accepted
+                )
+        results.append({"status": "committed", "imported": imported, "failed": failed})
+        batch.clear()
+        return results
+
+    async for line, data, error in rows:
+        if error is None:
+            try:
+                member = MemberCreate.model_validate(csv_member_fields(data) if fmt == "csv" else data)
+            except ValidationError as exc:
+                error = validation_messages(exc)
+        if error is None and member.email:
+            email = member.email.lower()
+            if email in seen_emails:
+                error = ["email: Duplicate email in import"]
+            seen_emails.add(email)
+        if error is not None:
+            failed += 1
+            yield {"line": line, "status": "error", "errors": error if isinstance(error, list) else [error]}
+            continue
+
+        batch.append((line, member))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            for result in await flush():
+                yield result
+
+    if batch:
+        for result in await flush():
+            yield result
+    yield {"status": "done", "imported": imported, "failed": failed}
+
+
+def export_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def csv_cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        # Same separator the import understands
+        return ";".join(value)
+    return str(export_value(value))
+
+
+def export_chunk(rows: Sequence[Any], columns: List[str], fmt: str, header: bool = False) -> str:
+    """Serialize a batch of result rows (tuples in `columns` order) as CSV or NDJSON"""
+    if fmt == "ndjson":
+        return "".join(
+            json.dumps({name: export_value(value) for name, value in zip(columns, row)}) + "\n"
+            for row in rows
+        )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(columns)
+    writer.writerows([csv_cell(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def export_members(partitions: AsyncIterator[Sequence[Any]], columns: List[str], fmt: str):
+    """Yield the export body chunk by chunk, one chunk per fetched batch of rows"""
+    header = fmt == "csv"
+    async for rows in partitions:
+        yield export_chunk(rows, columns, fmt, header)
+        header = False
+    if header:
+        # No rows at all: a CSV still gets its header line
+        yield export_chunk([], columns, fmt, header)
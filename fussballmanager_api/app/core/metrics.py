@@ -0,0 +1,214 @@
+"""
+Request and database metrics in the Prometheus text format.
+
+The middleware times every request and opens a RequestStats for it in a context
+variable; the SQLAlchemy cursor hooks (see app.db.database.instrument_engine) add
+each statement's count and duration to the stats of the request that issued it.
+Metrics are kept per process: with several workers each one reports its own.
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Route label of requests that matched no route, so unknown paths do not create new series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # labels -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._values.get(labels)
+        return series[-1] if series else 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        names = self.labelnames + ("le",)
+        with self._lock:
+            for labels, series in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, series):
+                    cumulative += bucket_count
+                    lines.append(f"{self.name}_bucket{format_labels(names, labels + (format_value(bound),))} {cumulative}")
+                lines.append(f"{self.name}_sum{format_labels(self.labelnames, labels)} {format_value(series[-2])}")
+                lines.append(f"{self.name}_count{format_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Time to handle a request, including streaming the body", ("method", "route")
+)
+http_request_db_duration = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL statements per request", ("method", "route")
+)
+http_request_queries = Histogram(
+    "http_request_queries", "SQL statements executed per request", ("method", "route"), buckets=QUERY_BUCKETS
+)
+db_queries = Counter("db_queries_total", "SQL statements executed, inside or outside requests")
+db_query_duration = Histogram("db_query_duration_seconds", "Duration of single SQL statements")
+n_plus_one_requests = Counter(
+    "http_request_query_threshold_exceeded_total",
+    "Requests that executed more statements than the N+1 warning threshold",
+    ("method", "route"),
+)
+
+REGISTRY = [
+    http_requests, http_request_duration, http_request_db_duration, http_request_queries,
+    db_queries, db_query_duration, n_plus_one_requests,
+]
+
+
+@dataclass
+class RequestStats:
+    request: Optional[str] = None  # "METHOD /path"
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+def record_query(seconds: float) -> None:
+    """Called by the engine hooks after every statement"""
+    db_queries.inc()
+    db_query_duration.observe(seconds)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += seconds
+
+
+def render_metrics(extra: Iterable[str] = ()) -> str:
+    lines = [line for metric in REGISTRY for line in metric.render()]
+    lines.extend(extra)
+    return "\n".join(lines) + "\n"
+
+
+def gauge(name: str, documentation: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    """Exposition lines of a gauge computed at scrape time"""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} gauge"]
+    for labels, value in samples:
+        lines.append(f"{name}{format_labels(list(labels), list(labels.values()))} {format_value(value)}")
+    return lines
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware), so the timing covers streamed
+    bodies too and the context variable reaches the threadpool running sync routes.
+    """
+
+    def __init__(self, app, query_warn_threshold: int = 0):
+        self.app = app
+        self.query_warn_threshold = query_warn_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(request=f"{scope['method']} {scope['path']}")
+        token = current_request_stats.set(stats)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request_stats.reset(token)
+            # FastAPI stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            self.record(scope["method"], route, status, elapsed, stats)
+
+    def record(self, method: str, route: str, status: int, elapsed: float, stats: RequestStats) -> None:
+        http_requests.inc(method, route, str(status))
+        http_request_duration.observe(elapsed, method, route)
+        http_request_db_duration.observe(stats.db_seconds, method, route)
+        http_request_queries.observe(stats.queries, method, route)
+        if self.query_warn_threshold and stats.queries > self.query_warn_threshold:
+            n_plus_one_requests.inc(method, route)
+            logger.warning(
+                "%s %s executed %d SQL statements (threshold %d), possible N+1 query pattern",
+                method, route, stats.queries, self.query_warn_threshold,
+            )
@@ -0,0 +1,24 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, member_id: str) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of a member"""
+    raw = json.dumps([created_at.isoformat(), member_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, member_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(member_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
@@ -1,12 +1,120 @@
+from dataclasses import dataclass
 from functools import wraps
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, FrozenSet, Iterable, List, Optional, Union
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy import Select, event, false, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.security import get_settings
+from app.db.database import get_async_db
 from app.models.user_model import User
 from app.models.member_model import Member
 from app.routes.auth import get_current_user
 
+if TYPE_CHECKING:
+    # The repositories apply scopes, so they import this module
+    from app.repositories.member_repo import AsyncMemberRepository
+
+
+@dataclass(frozen=True)
+class Scope:
+    """
+    What a user may see: the roles and team of the member an admin linked to the
+    account (User.member_id), no roles while that member is inactive. Rules:
+    - Admin can access any member
+    - Coach can only access members in their team (and themselves)
+    - Player/Parent can only access themselves
+    """
+    user_id: int
+    member_id: Optional[str]
+    roles: FrozenSet[str]
+    teams: FrozenSet[int]
+
+    @property
+    def unrestricted(self) -> bool:
+        return "admin" in self.roles
+
+    @property
+    def key(self) -> Optional[tuple]:
+        """Identifies the set of visible members, e.g. for caches of derived data"""
+        if self.unrestricted:
+            return None
+        teams = tuple(sorted(self.teams)) if "coach" in self.roles else ()
+        return (self.member_id if self.roles else None, teams)
+
+    def member_clause(self):
+        """
+        WHERE clause for the members this scope may access, None for no restriction.
+        Pushed into the member queries, so pages and counts only ever see visible rows.
+        """
+        if self.unrestricted:
+            return None
+        clauses = []
+        if "coach" in self.roles and self.teams:
+            clauses.append(Member.team.in_(sorted(self.teams)))
+        if self.roles and self.member_id:
+            clauses.append(Member.id == self.member_id)
+        return or_(*clauses) if clauses else false()
+
+    def can_access(self, member: Member) -> bool:
+        """member_clause for an already loaded member"""
+        if self.unrestricted:
+            return True
+        if not self.roles:
+            return False
+        return member.id == self.member_id or ("coach" in self.roles and member.team in self.teams)
+
+
+# Scopes by user id, dropped when the linked member or the user changes in this
+# process (see forget_scopes); other workers pick up changes after the TTL
+scope_cache = TTLCache(
+    maxsize=get_settings().rbac_scope_cache_size,
+    ttl=get_settings().rbac_scope_cache_ttl
+)
+
+
+def scope_query(member_id: str) -> Select:
+    """The linked member, by primary key"""
+    return select(Member.id, Member.roles, Member.team, Member.status).where(Member.id == member_id)
+
+
+def build_scope(user: User, member: Optional[tuple]) -> Scope:
+    if member is None or member[3] != "active":
+        # Anyone can register: accounts no admin linked to a member (see app.cli for
+        # the first admin), and those of deleted or deactivated members, have no roles
+        return Scope(user.id, user.member_id, frozenset(), frozenset())
+    member_id, roles, team, _ = member
+    teams = frozenset() if team is None else frozenset([team])
+    return Scope(user.id, member_id, frozenset(roles or []), teams)
+
+
+async def get_current_scope(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> Scope:
+    """Scope of the caller, one primary key query per linked user and cache lifetime"""
+    scope = scope_cache.get(current_user.id)
+    if scope is None:
+        member = None
+        if current_user.member_id is not None:
+            member = (await db.execute(scope_query(current_user.member_id))).first()
+        scope = build_scope(current_user, member)
+        scope_cache.set(current_user.id, scope)
+    return scope
+
+
+def forget_scopes(member_ids: Iterable[str] = ()) -> None:
+    """Drop the cached scopes of the users linked to the written members"""
+    member_ids = set(member_ids)
+    if member_ids:
+        scope_cache.pop_matching(lambda scope: scope.member_id in member_ids)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_scope(mapper, connection, target):
+    scope_cache.pop(target.id)
+
 
 def require_role(*roles: str):
     """
@@ -37,24 +145,36 @@ def require_any_role(roles: List[str]):
     return decorator
 
 
-def check_user_roles(user: User, required_roles: List[str]) -> bool:
+def check_user_roles(scope: Scope, required_roles: List[str]) -> bool:
     """Check if user has any of the required roles"""
-    # For now, we'll assume all users have admin role
-    # In a real implementation, you'd check user.roles against required_roles
-    return True
+    return not scope.roles.isdisjoint(required_roles)
 
 
-def check_member_access(user: User, member: Member, required_roles: List[str]) -> bool:
+def check_member_access(scope: Scope, member: Member, required_roles: List[str]) -> bool:
     """
-    Check if user has access to modify a specific member.
-    Rules:
-    - Admin can access any member
-    - Coach can only access members in their team
-    - Player/Parent can only access themselves
+    Check if user has access to modify a specific member (see Scope for the
+    rules). Queries apply Scope.member_clause instead of loading and checking.
     """
-    # For now, assume all users are admin
-    # In a real implementation, you'd check user roles and team membership
-    return True
+    return check_user_roles(scope, required_roles) and scope.can_access(member)
+
+
+# Roles and status decide what a linked account may do (inactive members have
+# no roles, see build_scope) and emails identify members, so only admins change
+# them; setting a member inactive is a soft delete, which is admin only as well
+ADMIN_FIELDS = frozenset(["roles", "status", "email"])
+
+
+def check_member_changes(scope: Scope, member_id: str, changes: dict) -> bool:
+    """
+    Check if user may set `changes` (field -> value) on a member they can access:
+    admins anything, others no ADMIN_FIELDS and not the team of their own member,
+    which would move a coach's scope to another team
+    """
+    if scope.unrestricted:
+        return True
+    if not ADMIN_FIELDS.isdisjoint(changes):
+        return False
+    return not ("team" in changes and member_id == scope.member_id)
 
 
 def get_user_id_from_token(current_user: User = Depends(get_current_user)) -> str:
@@ -62,36 +182,31 @@ def get_user_id_from_token(current_user: User = Depends(get_current_user)) -> st
     return str(current_user.id)
 
 
-def validate_member_permissions(
+async def validate_member_permissions(
     member_id: str,
     required_roles: List[str],
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    scope: Scope,
+    repo: "AsyncMemberRepository"
 ) -> Member:
     """
     Validate that the current user has permission to access/modify the member.
     Returns the member if access is granted, raises HTTPException otherwise.
+    The member is read through `repo`, a repository limited to `scope`: members
+    outside the user's scope are not found, without telling whether they exist.
     """
-    # Get the member
-    member = db.query(Member).filter(Member.id == member_id).first()
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Member not found"
-        )
-    
     # Check if user has required roles
-    if not check_user_roles(current_user, required_roles):
+    if not check_user_roles(scope, required_roles):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Insufficient permissions"
         )
     
-    # Check specific member access
-    if not check_member_access(current_user, member, required_roles):
+    # Get the member, if the user may access it
+    member = await repo.get_by_id(member_id)
+    if not member:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied to this member"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Member not found"
         )
     
     return member
@@ -1,30 +1,128 @@
+import asyncio
+import threading
 from datetime import datetime, timedelta, timezone
-from passlib.context import CryptContext
-from jose import jwt
+from typing import Optional, Tuple
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 from functools import lru_cache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 class Settings(BaseSettings):
     # Same idea: read .env but ignore unrelated keys
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
     jwt_secret: str = Field(default="change_me_in_prod", alias="JWT_SECRET")
     jwt_alg: str = Field(default="HS256", alias="JWT_ALG")
     access_token_expire_minutes: int = Field(default=60, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
+    # Resolved users kept in memory by get_current_user (0 disables)
+    principal_cache_ttl: float = Field(default=60.0, alias="PRINCIPAL_CACHE_TTL")
+    principal_cache_size: int = Field(default=1024, alias="PRINCIPAL_CACHE_SIZE")
+    # Permission scopes (roles and teams) of users, see app.core.rbac (0 disables)
+    rbac_scope_cache_ttl: float = Field(default=300.0, alias="RBAC_SCOPE_CACHE_TTL")
+    rbac_scope_cache_size: int = Field(default=1024, alias="RBAC_SCOPE_CACHE_SIZE")
+    # bcrypt cost; existing hashes with another cost are rehashed on login
+    bcrypt_rounds: int = Field(default=12, ge=4, le=31, alias="BCRYPT_ROUNDS")
+    # Processes hashing passwords (0 runs bcrypt in the default thread pool instead)
+    password_hash_workers: int = Field(default=2, ge=0, alias="PASSWORD_HASH_WORKERS")
+    # Hash jobs allowed to run or wait at once, more are rejected right away
+    password_hash_max_pending: int = Field(default=32, ge=1, alias="PASSWORD_HASH_MAX_PENDING")
 
 @lru_cache
 def get_settings() -> Settings:
     return Settings()
 
+# passlib/bcrypt and jose are imported on first use rather than with the app,
+# which keeps worker start-up and the hash worker processes lean
+
+@lru_cache
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=get_settings().bcrypt_rounds)
+
 def hash_password(pw: str) -> str:
-    return pwd_context.hash(pw)
+    return get_pwd_context().hash(pw)
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    return get_pwd_context().verify(plain, hashed)
+
+def verify_and_update_password(plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password; if the hash is outdated (passlib's needs_update, e.g. other
+    bcrypt cost) also return a new hash to store, otherwise None.
+    """
+    return get_pwd_context().verify_and_update(plain, hashed)
+
+
+class PasswordHasherBusy(Exception):
+    """Too many password hash jobs are pending, the request should be retried later"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a small, dedicated process pool so that bursts of logins neither
+    block the event loop nor take over the threads serving other requests.
+    At most `max_pending` jobs may run or wait at once, further calls fail fast
+    with PasswordHasherBusy instead of queueing up.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self.workers and self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    import multiprocessing
+                    from concurrent.futures import ProcessPoolExecutor
+                    # spawn: forking a process that already runs threads is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise PasswordHasherBusy()
+            self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    async def hash(self, pw: str) -> str:
+        return await self.run(hash_password, pw)
+
+    async def verify_and_update(self, plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        return await self.run(verify_and_update_password, plain, hashed)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=get_settings().password_hash_workers,
+    max_pending=get_settings().password_hash_max_pending
+)
 
 def create_access_token(sub: str) -> str:
+    from jose import jwt
     s = get_settings()
     expire = datetime.now(tz=timezone.utc) + timedelta(minutes=s.access_token_expire_minutes)
     return jwt.encode({"sub": sub, "exp": expire}, s.jwt_secret, algorithm=s.jwt_alg)
+
+def decode_access_token(token: str) -> Optional[str]:
+    """Subject of a valid token, None if the token is invalid or expired"""
+    from jose import JWTError, jwt
+    s = get_settings()
+    try:
+        payload = jwt.decode(token, s.jwt_secret, algorithms=[s.jwt_alg])
+    except JWTError:
+        return None
+    return payload.get("sub")
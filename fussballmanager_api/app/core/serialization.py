@@ -0,0 +1,52 @@
+from typing import Any, List, Optional, Sequence
+import orjson
+from app.models.member_model import Member
+from app.schemas.member_schema import MEMBER_FIELDS
+
+# MemberOut field order; full list pages select exactly these columns in this order
+MEMBER_OUT_FIELDS = MEMBER_FIELDS
+
+
+def member_list_json(
+    rows: Sequence[Sequence[Any]],
+    total: Optional[int],
+    limit: int,
+    offset: int,
+    next_cursor: Optional[str],
+    fields: List[str] = MEMBER_OUT_FIELDS
+) -> bytes:
+    """
+    MemberListResponse JSON straight from column tuples in `fields` order, without
+    building ORM instances or pydantic models. The rows were validated when
+    written; with all fields the output matches MemberListResponse(...).model_dump_json().
+    Columns past `fields` (the cursor keys of a sparse page) are not written.
+    """
+    return orjson.dumps(
+        {
+            "members": [dict(zip(fields, row)) for row in rows],
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "next_cursor": next_cursor,
+        },
+        # Same "Z" suffix pydantic writes for UTC datetimes
+        option=orjson.OPT_UTC_Z
+    )
+
+
+def member_lookup_json(rows: Sequence[Sequence[Any]], missing: List[str], fields: List[str] = MEMBER_OUT_FIELDS) -> bytes:
+    """MemberLookupResponse JSON from column tuples, like member_list_json"""
+    return orjson.dumps(
+        {"members": [dict(zip(fields, row)) for row in rows], "missing": missing},
+        option=orjson.OPT_UTC_Z
+    )
+
+
+def member_facets_json(facets: dict) -> bytes:
+    """MemberFacets JSON from the dict built by render_facets"""
+    return orjson.dumps(facets)
+
+
+def member_json(member: Member, fields: List[str]) -> bytes:
+    """JSON of the given fields of a member loaded with only those columns"""
+    return orjson.dumps({field: getattr(member, field) for field in fields}, option=orjson.OPT_UTC_Z)
@@ -0,0 +1,149 @@
+"""
+Opt-in slow-query recorder.
+
+Statements that run longer than the threshold are kept in a bounded ring buffer
+together with their (redacted) parameters and the backend's query plan, so a
+slow list or search can be diagnosed from GET /admin/slow-queries without
+reproducing it. Plans are captured on the same DBAPI connection right after the
+statement, outside SQLAlchemy, so the metrics hooks do not see them; on Postgres
+inside a savepoint, so a failed EXPLAIN leaves the transaction usable.
+"""
+
+import re
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+from app.core.cache import TTLCache
+from app.core.metrics import current_request_stats
+
+EMAIL_PATTERN = re.compile(r"[^\s@'\"%]+@[^\s@'\"%]+")
+REDACTED_EMAIL = "<email>"
+# Longer statements and parameter lists (executemany) are cut in the records
+MAX_STATEMENT_LENGTH = 4000
+MAX_PARAMETER_SETS = 5
+# Only read statements are explained: EXPLAIN of a write is not always side-effect free
+EXPLAINABLE = ("select", "with")
+# Seconds a plan is reused for the same SQL, so a burst of slow queries does not
+# run one EXPLAIN each
+PLAN_CACHE_TTL = 60.0
+
+
+def redact(value: Any) -> Any:
+    """Replace email addresses in (nested) parameters"""
+    if isinstance(value, str):
+        return EMAIL_PATTERN.sub(REDACTED_EMAIL, value)
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def redact_parameters(parameters: Any, executemany: bool) -> Any:
+    if executemany:
+        return [redact(p) for p in list(parameters)[:MAX_PARAMETER_SETS]]
+    return redact(parameters)
+
+
+def explain_statement(dialect: str, statement: str) -> Optional[str]:
+    if dialect == "sqlite":
+        return f"EXPLAIN QUERY PLAN {statement}"
+    if dialect == "postgresql":
+        return f"EXPLAIN {statement}"
+    return None
+
+
+def format_plan(dialect: str, rows: List[tuple]) -> List[str]:
+    if dialect != "sqlite":
+        return [str(row[0]) for row in rows]
+    # (id, parent, notused, detail): indent each step under its parent
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float = 0.0, maxsize: int = 100, explain: bool = True):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self.records: deque = deque(maxlen=maxsize)
+        self.plans = TTLCache(maxsize=128, ttl=PLAN_CACHE_TTL)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0 and self.records.maxlen > 0
+
+    def is_slow(self, seconds: float) -> bool:
+        return self.enabled and seconds >= self.threshold
+
+    def record(self, conn, statement: str, parameters: Any, executemany: bool, seconds: float) -> None:
+        """Store a slow statement, called from the engine's after_cursor_execute hook"""
+        dialect = conn.dialect.name
+        plan, explain_error = None, None
+        if self.explain and not executemany and statement.lstrip().lower().startswith(EXPLAINABLE):
+            plan = self.plans.get(statement)
+            if plan is None:
+                try:
+                    plan = self.capture_plan(conn, dialect, statement, parameters)
+                    if plan is not None:
+                        self.plans.set(statement, plan)
+                except Exception as exc:  # a failed EXPLAIN must not fail the query
+                    explain_error = f"{exc.__class__.__name__}: {exc}"
+
+        stats = current_request_stats.get()
+        record = {
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(seconds * 1000, 3),
+            "dialect": dialect,
+            "request": stats.request if stats is not None else None,
+            "statement": statement[:MAX_STATEMENT_LENGTH],
+            "parameters": redact_parameters(parameters, executemany),
+            "plan": plan,
+            "explain_error": explain_error,
+        }
+        with self._lock:
+            self.records.append(record)
+
+    def capture_plan(self, conn, dialect: str, statement: str, parameters: Any) -> Optional[List[str]]:
+        explain = explain_statement(dialect, statement)
+        if explain is None:
+            return None
+        # A failed statement aborts the whole transaction on Postgres, which is the
+        # request's own: EXPLAIN in a savepoint there, rolled back if it fails
+        savepoint = dialect == "postgresql"
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            if savepoint:
+                cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(explain, parameters)
+                rows = cursor.fetchall()
+            except Exception:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                raise
+            finally:
+                if savepoint:
+                    cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        finally:
+            cursor.close()
+        return format_plan(dialect, rows)
+
+    def entries(self, limit: Optional[int] = None) -> List[dict]:
+        """Newest records first"""
+        with self._lock:
+            records = list(reversed(self.records))
+        return records[:limit] if limit else records
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+        self.plans.clear()
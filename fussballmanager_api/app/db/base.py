@@ -1,4 +1,10 @@
 # Import all the models, so that Base has them before being
-# imported by Alembic
+# imported by Alembic (importing any model does as well, see app.models)
 from app.db.database import Base
 from app.models.user_model import User
+from app.models.member_model import Member
+from app.models.member_role_model import MemberRole
+from app.models.club_model import Club
+from app.models.event_model import Event
+from app.models.payment_model import Payment
+from app.models.table_version_model import TableVersion
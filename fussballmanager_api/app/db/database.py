@@ -1,29 +1,201 @@
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 from functools import lru_cache
+import time
+from app.core.metrics import record_query
+from app.core.slow_query_log import SlowQueryLog
+
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
 
 class Settings(BaseSettings):
     # Read .env, case-insensitive, and IGNORE any keys we don't define here
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
     database_url: str = Field(default="sqlite:///./dev.db", alias="DATABASE_URL")
+    async_database_url: Optional[str] = Field(default=None, alias="ASYNC_DATABASE_URL")
+    # Seconds a member list total may be served from cache (0 disables)
+    member_count_cache_ttl: float = Field(default=10.0, alias="MEMBER_COUNT_CACHE_TTL")
+    # Seconds facet counts (GET /members/facets) are cached; writes in this process
+    # adjust them, other workers see their writes after the TTL (0 disables)
+    member_facet_cache_ttl: float = Field(default=60.0, alias="MEMBER_FACET_CACHE_TTL")
+    # Season start and the date ages are taken at in that season ("MM-DD"), see
+    # app.core.age_groups; age groups move on at the season start
+    season_start: str = Field(default="07-01", alias="SEASON_START")
+    age_group_cutoff: str = Field(default="01-01", alias="AGE_GROUP_CUTOFF")
+    # Rendered member responses kept per ETag (0 disables); entries never go stale,
+    # a write changes the ETag, the TTL only frees memory
+    member_response_cache_size: int = Field(default=256, ge=0, alias="MEMBER_RESPONSE_CACHE_SIZE")
+    member_response_cache_ttl: float = Field(default=300.0, alias="MEMBER_RESPONSE_CACHE_TTL")
+    # Connection pool, per engine (the sync and the async engine have one each)
+    db_pool_size: int = Field(default=5, ge=1, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, ge=0, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, gt=0, alias="DB_POOL_TIMEOUT")
+    # Seconds after which a connection is replaced, below server-side idle timeouts
+    db_pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(default=True, alias="DB_POOL_PRE_PING")
+    # SQLite profile, applied to every new connection
+    sqlite_journal_mode: str = Field(default="WAL", alias="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: str = Field(default="NORMAL", alias="SQLITE_SYNCHRONOUS")
+    sqlite_busy_timeout_ms: int = Field(default=5000, ge=0, alias="SQLITE_BUSY_TIMEOUT_MS")
+    sqlite_cache_size_kib: int = Field(default=65536, ge=0, alias="SQLITE_CACHE_SIZE_KIB")
+    sqlite_mmap_size: int = Field(default=256 * 1024 * 1024, ge=0, alias="SQLITE_MMAP_SIZE")
+    # Log a warning (and count it in /metrics) when one request runs more SQL
+    # statements than this, usually an N+1 query pattern (0 disables)
+    request_query_warn_threshold: int = Field(default=25, ge=0, alias="REQUEST_QUERY_WARN_THRESHOLD")
+    # Statements slower than this are kept with their plan for GET /admin/slow-queries
+    # (0 disables, the default)
+    slow_query_threshold_ms: float = Field(default=0.0, ge=0, alias="SLOW_QUERY_THRESHOLD_MS")
+    slow_query_log_size: int = Field(default=100, ge=0, alias="SLOW_QUERY_LOG_SIZE")
+    slow_query_explain: bool = Field(default=True, alias="SLOW_QUERY_EXPLAIN")
 
 @lru_cache
 def get_settings() -> Settings:
     return Settings()
 
+def to_async_url(database_url: str) -> str:
+    """Swap the sync driver of a database URL for its async counterpart"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}', set ASYNC_DATABASE_URL")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def is_memory_sqlite(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def sqlite_pragmas(settings: Settings) -> list:
+    """
+    WAL lets readers work while one writer commits, synchronous=NORMAL is safe
+    with WAL and skips an fsync per commit, busy_timeout makes writers wait for
+    the lock instead of failing with "database is locked".
+    """
+    return [
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+    ]
+
+def engine_options(database_url: str, settings: Settings) -> dict:
+    """create_engine/create_async_engine keyword arguments for a URL"""
+    options = {"echo": False}
+    if make_url(database_url).get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if is_memory_sqlite(database_url):
+            # In-memory databases live in a single connection, no pool to size
+            return options
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    return options
+
+def apply_sqlite_profile(engine: Engine, settings: Settings) -> None:
+    """Run the SQLite pragmas on every new DBAPI connection of a (sync) engine"""
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas(settings)
+    if is_memory_sqlite(str(engine.url)):
+        pragmas = [p for p in pragmas if not p.startswith("PRAGMA journal_mode")]
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+def instrument_engine(engine: Engine, slow_queries: Optional[SlowQueryLog] = None) -> None:
+    """
+    Time every statement of a (sync) engine and count it for the current request,
+    statements above the slow query threshold also go to `slow_queries`
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        record_query(elapsed)
+        if slow_queries is not None and slow_queries.is_slow(elapsed):
+            slow_queries.record(conn, statement, parameters, executemany, elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def drop_timer(exception_context):
+        # after_cursor_execute does not run for failed statements
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        if starts:
+            starts.pop()
+
+def make_engine(database_url: str, settings: Settings, slow_queries: Optional[SlowQueryLog] = None) -> Engine:
+    engine = create_engine(database_url, **engine_options(database_url, settings))
+    apply_sqlite_profile(engine, settings)
+    instrument_engine(engine, slow_queries)
+    return engine
+
+def make_async_engine(database_url: str, settings: Settings, slow_queries: Optional[SlowQueryLog] = None) -> AsyncEngine:
+    engine = create_async_engine(database_url, **engine_options(database_url, settings))
+    apply_sqlite_profile(engine.sync_engine, settings)
+    instrument_engine(engine.sync_engine, slow_queries)
+    return engine
+
+def pool_stats() -> dict:
+    """Connection pool usage of both engines"""
+    stats = {}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.pool)):
+        stats[name] = {"pool": pool.__class__.__name__, "status": pool.status()}
+        if hasattr(pool, "checkedout"):
+            stats[name].update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+    return stats
+
 class Base(DeclarativeBase):
     pass
 
 settings = get_settings()
-connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-engine = create_engine(settings.database_url, future=True, echo=False, connect_args=connect_args)
+# One log for both engines, read by GET /admin/slow-queries
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_threshold_ms,
+    maxsize=settings.slow_query_log_size,
+    explain=settings.slow_query_explain,
+)
+engine = make_engine(settings.database_url, settings, slow_query_log)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+async_engine = make_async_engine(
+    settings.async_database_url or to_async_url(settings.database_url), settings, slow_query_log
+)
+# expire_on_commit=False: attributes must stay loaded, lazy loads are not possible with AsyncSession
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
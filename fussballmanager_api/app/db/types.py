@@ -0,0 +1,47 @@
+import uuid
+from typing import Optional
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+# Stored for ids that are not UUIDs: no generated (version 4) key equals it, so
+# lookups by a malformed id find nothing instead of failing
+NIL_UUID = uuid.UUID(int=0)
+
+
+class UUIDKey(TypeDecorator):
+    """
+    UUID key that the application reads and writes as the canonical string
+    ("3f2b...-..."), stored compactly: the native uuid type on Postgres,
+    16 bytes (BLOB) elsewhere instead of 36 characters of text. Stored bytes
+    sort like the strings, so ordering and keyset cursors are unchanged.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        key = parse_uuid(value)
+        if dialect.name == "postgresql":
+            return str(key)
+        return key.bytes
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None or dialect.name == "postgresql":
+            return value
+        h = value.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def parse_uuid(value) -> uuid.UUID:
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(value)
+    except (TypeError, ValueError, AttributeError):
+        return NIL_UUID
@@ -1,12 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routes import health, auth, members
+from app.routes import health, auth, members, metrics, admin
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.database import Base, engine
+from app.db import base  # noqa: F401  registers every model before mappers are configured
+from app.db.database import engine, async_engine, get_settings
+from app.core.metrics import MetricsMiddleware
+from app.core.security import password_hasher
 
-app = FastAPI(title="FussballManager API")
 
-# Create all DB tables on startup (only during dev)
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The schema is managed by Alembic (`alembic upgrade head`), not created here:
+    # importing or starting the app runs no DDL, so workers start quickly and
+    # several of them can start at once.
+    yield
+    password_hasher.shutdown()
+    await async_engine.dispose()
+    engine.dispose()
+
+
+app = FastAPI(title="FussballManager API", lifespan=lifespan)
 
 # CORS settings
 app.add_middleware(
@@ -20,7 +33,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so the timing includes the other middleware
+app.add_middleware(MetricsMiddleware, query_warn_threshold=get_settings().request_query_warn_threshold)
+
 # Routers
 app.include_router(health.router)
 app.include_router(auth.router)
 app.include_router(members.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
@@ -0,0 +1,10 @@
+# Importing any model imports them all: relationships and foreign keys refer to
+# each other by name (User.club -> "Club"), which only resolves once every model
+# is registered with Base, also in scripts that never import app.db.base
+from app.models.user_model import User
+from app.models.member_model import Member
+from app.models.member_role_model import MemberRole
+from app.models.club_model import Club
+from app.models.event_model import Event
+from app.models.payment_model import Payment
+from app.models.table_version_model import TableVersion
@@ -1,24 +1,36 @@
-from sqlalchemy import Column, String, Date, Integer, DateTime, Text, ForeignKey, Index, JSON
-from sqlalchemy.sql import func
+from sqlalchemy import Column, String, Date, Integer, DateTime, Text, ForeignKey, Index, JSON, DDL, event
+from sqlalchemy.sql import func, literal_column, text, table, column
 from sqlalchemy.orm import relationship
 from typing import Optional
+from datetime import datetime, timezone
 import uuid
 from app.db.database import Base
+from app.db.types import UUIDKey
+
+PG_SEARCH_TEXT = "(lower(first_name || ' ' || last_name || ' ' || coalesce(email, '')))"
 
 
 class Member(Base):
     __tablename__ = "members"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    # Public id, 16 bytes stored (see UUIDKey); the primary key index is its only index
+    id = Column(UUIDKey, primary_key=True, default=lambda: str(uuid.uuid4()))
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
-    email = Column(String(255), nullable=True, index=True)
+    email = Column(String(255), nullable=True)
     birthdate = Column(Date, nullable=True)
     roles = Column(JSON, nullable=False, default=list)
-    team = Column(Integer, nullable=True, index=True)
+    team = Column(Integer, nullable=True)
     status = Column(String(20), nullable=False, default="active")
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Set client-side as well so every row stores the same timestamp format,
+    # which keyset pagination on (created_at, id) compares against
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False
+    )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
     created_by = Column(String(36), nullable=True)
     updated_by = Column(String(36), nullable=True)
@@ -26,8 +38,87 @@ class Member(Base):
     # Indexes
     __table_args__ = (
         Index('idx_members_team_status', 'team', 'status'),
+        Index('idx_members_created_at_id', 'created_at', 'id'),
+        # Team lists in page order, without sorting the team
+        Index('idx_members_team_created_at_id', 'team', 'created_at', 'id'),
+        # Age groups are birthdate ranges (see app.core.age_groups); team and status
+        # are included so age group counts and rosters are read from the index alone
+        Index('idx_members_birthdate_team_status', 'birthdate', 'team', 'status'),
+        # Emails are unique ignoring case; also serves the lower(email) lookups.
+        # Several members may have no email (NULLs never collide)
+        Index('ux_members_email_lower', func.lower(email), unique=True),
+        # Search indexes on Postgres, see pg_search_text() below
+        Index(
+            'ix_members_search_tsv',
+            text("to_tsvector('simple'::regconfig, " + PG_SEARCH_TEXT + ")"),
+            postgresql_using='gin',
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_members_search_trgm',
+            text(PG_SEARCH_TEXT + " gin_trgm_ops"),
+            postgresql_using='gin',
+        ).ddl_if(dialect='postgresql'),
     )
 
+    # Fetch server-generated values (updated_at) with RETURNING as part of the
+    # INSERT/UPDATE instead of expiring them and selecting the row again
+    __mapper_args__ = {"eager_defaults": True}
+
     @property
     def full_name(self) -> str:
         return f"{self.first_name} {self.last_name}"
+
+
+# Full-text search
+#
+# SQLite: FTS5 index over first name, last name and email, kept in sync with
+# `members` by triggers. It is an external-content table keyed by the members
+# rowid, so run `INSERT INTO members_fts(members_fts) VALUES('rebuild')` after
+# a VACUUM.
+# Postgres: GIN index on a 'simple' tsvector (prefix matching and ranking) and
+# a trigram index on the same text (substring matching), see __table_args__.
+
+members_fts = table("members_fts", column("rowid"), column("members_fts"))
+
+SQLITE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE members_fts USING fts5(
+        first_name, last_name, email,
+        content='members', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER members_fts_ai AFTER INSERT ON members BEGIN
+        INSERT INTO members_fts(rowid, first_name, last_name, email)
+        VALUES (new.rowid, new.first_name, new.last_name, new.email);
+    END""",
+    """CREATE TRIGGER members_fts_ad AFTER DELETE ON members BEGIN
+        INSERT INTO members_fts(members_fts, rowid, first_name, last_name, email)
+        VALUES ('delete', old.rowid, old.first_name, old.last_name, old.email);
+    END""",
+    """CREATE TRIGGER members_fts_au AFTER UPDATE OF first_name, last_name, email ON members BEGIN
+        INSERT INTO members_fts(members_fts, rowid, first_name, last_name, email)
+        VALUES ('delete', old.rowid, old.first_name, old.last_name, old.email);
+        INSERT INTO members_fts(rowid, first_name, last_name, email)
+        VALUES (new.rowid, new.first_name, new.last_name, new.email);
+    END""",
+]
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(Member.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Member.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+
+def pg_search_text():
+    """Searchable text of a member on Postgres, same expression as PG_SEARCH_TEXT"""
+    # Constants are literal so the query expression is identical to the index expression
+    blank = literal_column("''")
+    space = literal_column("' '")
+    return func.lower(
+        Member.first_name + space + Member.last_name + space + func.coalesce(Member.email, blank)
+    )
+
+
+def pg_search_vector():
+    return func.to_tsvector(literal_column("'simple'::regconfig"), pg_search_text())
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, ForeignKey, Index
+from app.db.database import Base
+from app.db.types import UUIDKey
+
+
+class MemberRole(Base):
+    """
+    One row per (member, role). Members.roles stays the JSON list returned by the API,
+    this table is the indexed copy used for role filters and is kept in sync by
+    MemberRepository.
+    """
+    __tablename__ = "member_roles"
+
+    member_id = Column(UUIDKey, ForeignKey("members.id", ondelete="CASCADE"), primary_key=True)
+    role = Column(String(20), primary_key=True)
+
+    # Indexes
+    __table_args__ = (
+        # Covers "members with role X" without touching the members table
+        Index('idx_member_roles_role_member', 'role', 'member_id'),
+    )
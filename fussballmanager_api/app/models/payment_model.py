@@ -1,12 +1,13 @@
 from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey
 from sqlalchemy.orm import relationship
-from app.database import Base
+from app.db.database import Base
+from app.db.types import UUIDKey
 
 class Payment(Base):
     __tablename__ = "payments"
 
     id = Column(Integer, primary_key=True, index=True)
-    member_id = Column(Integer, ForeignKey("members.id"), nullable=False)
+    member_id = Column(UUIDKey, ForeignKey("members.id"), nullable=False, index=True)
     amount = Column(Float, nullable=False)
     status = Column(String, default="unpaid")  # or Enum
     due_date = Column(Date, nullable=False)
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, Integer, DDL, event
+from app.db.database import Base
+
+
+class TableVersion(Base):
+    """
+    Write counter per table, bumped in the same transaction as every write through
+    the repositories. Readers compare it to build ETags without touching the
+    table itself, and it is shared by all workers.
+
+    The bump locks the table's counter row until COMMIT, so writes to the same
+    table serialize on it (on Postgres; SQLite has one writer anyway). It is
+    therefore the last statement of each write, holding the lock only for the
+    commit itself. A separate transaction after the commit would hold the lock
+    even shorter, but until it ran, clients with the old ETag would get 304s for
+    changed rows, for good if the worker died in between.
+    """
+    __tablename__ = "table_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+# Counters are only ever incremented, so their rows have to exist up front
+event.listen(
+    TableVersion.__table__, "after_create",
+    DDL("INSERT INTO table_versions (name, version) VALUES ('members', 0)")
+)
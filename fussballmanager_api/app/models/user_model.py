@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
+from app.db.types import UUIDKey
 
 class User(Base):
     __tablename__ = "users"
@@ -10,5 +12,11 @@ class User(Base):
     username = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    club_id = Column(Integer, ForeignKey("clubs.id"), nullable=True, index=True)
+    # Member whose roles and team the account acts with (see app.core.rbac), set by
+    # an admin; never derived from the self-chosen registration email
+    member_id = Column(UUIDKey, ForeignKey("members.id", ondelete="SET NULL"), nullable=True, unique=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    club = relationship("Club", back_populates="users")
@@ -0,0 +1,145 @@
+"""
+Facet counts of the member list: members per team, status and role.
+
+Counts are built from two grouped queries and cached per filter combination and
+scope. Writes through the repositories do not drop them: each write passes the
+facet values of the rows it changed (before and after), and every cached entry
+those rows match is adjusted in place. Entries with a search term are dropped
+instead, whether a row matches `q` cannot be decided without the database.
+"""
+
+import threading
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+from app.core.age_groups import current_cutoff, in_age_group
+from app.core.cache import TTLCache
+from app.core.rbac import Scope
+from app.db.database import get_settings
+from app.models.member_model import Member
+from app.schemas.member_schema import MemberFilter
+
+FACETS = ("team", "status", "role")
+
+facet_cache = TTLCache(maxsize=256, ttl=get_settings().member_facet_cache_ttl)
+# Entries are adjusted in place, reads copy them under the same lock
+_lock = threading.Lock()
+
+
+class FacetRow(NamedTuple):
+    """The facet values of one member"""
+    id: str
+    team: Optional[int]
+    status: str
+    roles: tuple
+    birthdate: Optional[date] = None
+
+
+def facet_row(member: Member) -> FacetRow:
+    return FacetRow(member.id, member.team, member.status, tuple(member.roles or ()), member.birthdate)
+
+
+def changed_row(row: FacetRow, data: dict) -> FacetRow:
+    """`row` after an update that sets `data`"""
+    # Patches cannot set status or roles to null (see NOT_NULL_FIELDS)
+    return FacetRow(
+        row.id,
+        data.get("team", row.team),
+        data.get("status", row.status),
+        tuple(data.get("roles", row.roles)),
+        data.get("birthdate", row.birthdate),
+    )
+
+
+class FacetEntry:
+    """
+    Cached counts of one filter combination and scope, as of members `version`
+    (see TableVersion): they only serve reads of that version
+    """
+
+    def __init__(self, filters: MemberFilter, scope: Optional[Scope], version: Optional[int]):
+        self.filters = filters
+        self.scope = scope
+        self.version = version
+        self.total = 0
+        self.counts: Dict[str, Counter] = {name: Counter() for name in FACETS}
+
+    def matches(self, row: FacetRow) -> bool:
+        filters = self.filters
+        if filters.role and filters.role not in row.roles:
+            return False
+        if filters.team is not None and row.team != filters.team:
+            return False
+        if filters.status and row.status != filters.status:
+            return False
+        if filters.age_group and not in_age_group(row.birthdate, filters.age_group, current_cutoff()):
+            return False
+        return self.scope is None or self.scope.can_access(row)
+
+    def add(self, row: FacetRow, sign: int) -> None:
+        self.total += sign
+        self.counts["team"][row.team] += sign
+        self.counts["status"][row.status] += sign
+        for role in set(row.roles):
+            self.counts["role"][role] += sign
+
+
+def facet_cache_key(filters: MemberFilter, scope: Optional[Scope] = None) -> tuple:
+    return (filters.role, filters.team, filters.status, filters.age_group, filters.q, scope.key if scope else None)
+
+
+def count_facets(
+    filters: MemberFilter,
+    scope: Optional[Scope],
+    version: Optional[int],
+    groups: Sequence[tuple],
+    roles: Sequence[tuple]
+) -> FacetEntry:
+    """Entry from (team, status, count) groups and (role, count) pairs, see facets_query"""
+    entry = FacetEntry(filters, scope, version)
+    for team, status, count in groups:
+        entry.add(FacetRow("", team, status, ()), count)
+    for role, count in roles:
+        entry.counts["role"][role] += count
+    return entry
+
+
+def render_facets(entry: FacetEntry) -> dict:
+    """MemberFacets as a plain dict; teams run into the thousands, models would dominate a cached read"""
+    with _lock:
+        total = entry.total
+        counts = {name: dict(counter) for name, counter in entry.counts.items()}
+
+    def facet(name: str) -> List[dict]:
+        # Largest first, ties by value; no team (None) sorts last among equals
+        items = [(value, count) for value, count in counts[name].items() if count > 0]
+        items.sort(key=lambda item: (-item[1], item[0] is None, str(item[0])))
+        return [{"value": value, "count": count} for value, count in items]
+
+    return {"total": total, "team": facet("team"), "status": facet("status"), "role": facet("role")}
+
+
+def adjust_facets(
+    version: Optional[int], removed: Iterable[FacetRow] = (), added: Iterable[FacetRow] = ()
+) -> None:
+    """
+    Apply a committed write, which bumped the members version to `version`, to
+    the cached facet counts. Only entries of the version right before it can be
+    moved forward; for older ones other workers wrote in between, those are
+    counted again on their next read.
+    """
+    # Rows carry no names or emails: whether a write moved a member in or out
+    # of a search is unknown, also when the counted fields stayed the same
+    facet_cache.pop_matching(
+        lambda entry: bool(entry.filters.q) or version is None or entry.version != version - 1
+    )
+    removed, added = list(removed), list(added)
+    with _lock:
+        for entry in facet_cache.values():
+            entry.version = version
+            for row in removed:
+                if entry.matches(row):
+                    entry.add(row, -1)
+            for row in added:
+                if entry.matches(row):
+                    entry.add(row, 1)
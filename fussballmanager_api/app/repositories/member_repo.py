@@ -1,112 +1,614 @@
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from uuid import UUID
+import json
+import uuid
+from functools import wraps
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, select, func, tuple_, insert, update, delete
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.core.age_groups import birthdate_range, current_cutoff
+from app.core.cache import TTLCache
+from app.core.pagination import InvalidCursor, encode_cursor, decode_cursor
+from app.core.rbac import Scope, forget_scopes
+from app.db.database import get_settings
+from app.db.types import NIL_UUID, parse_uuid
 from app.models.member_model import Member
-from app.schemas.member_schema import MemberCreate, MemberUpdate, MemberFilter
+from app.models.member_role_model import MemberRole
+from app.models.table_version_model import TableVersion
+from app.repositories.member_facets import (
+    FacetRow, adjust_facets, changed_row, count_facets, facet_cache, facet_cache_key, facet_row, render_facets
+)
+from app.repositories.member_search import apply_search, search_rank
+from app.schemas.member_schema import (
+    MemberCreate, MemberUpdate, MemberOut, MemberFilter, MemberBatchUpdate, MemberBatchResult
+)
+
+# Totals per members version and filter combination, so paging through a list does
+# not recount every page. Cleared on every write through a repository; writes of
+# other workers change the version, so their totals are never served for it.
+count_cache = TTLCache(maxsize=1024, ttl=get_settings().member_count_cache_ttl)
+
+
+# Unique index on lower(email), see Member.__table_args__
+EMAIL_INDEX = "ux_members_email_lower"
+
+
+class DuplicateEmail(Exception):
+    """A write would give a member an email another member already has"""
+
+
+def raise_integrity_error(exc: IntegrityError) -> None:
+    """Re-raise a failed write, as DuplicateEmail if the email index rejected it"""
+    # The index name is in the message on SQLite and Postgres alike
+    if EMAIL_INDEX in str(exc.orig):
+        raise DuplicateEmail("Email already exists") from exc
+    raise exc
+
+
+def members_changed(
+    version: Optional[int],
+    member_ids: Iterable[str] = (),
+    removed: Iterable[FacetRow] = (),
+    added: Iterable[FacetRow] = ()
+) -> None:
+    """
+    Drop cached data derived from the members table and the scopes of the written
+    members; cached facet counts are adjusted by the rows the write removed and
+    added, up to the members `version` the write committed
+    """
+    count_cache.clear()
+    forget_scopes(member_ids)
+    adjust_facets(version, removed, added)
+
+
+def scope_restricted(scope: Optional[Scope]) -> bool:
+    return scope is not None and scope.member_clause() is not None
+
+
+def restrict(query: Select, scope: Optional[Scope]) -> Select:
+    """Limit a member query to the members `scope` may access, no scope: all members"""
+    clause = None if scope is None else scope.member_clause()
+    return query if clause is None else query.where(clause)
+
+
+# Statement builders shared by the sync and async repositories
+
+def version_query() -> Select:
+    return select(TableVersion.version).where(TableVersion.name == Member.__tablename__)
+
+
+def bump_version_query():
+    """Increment the members version, returning the new one"""
+    return update(TableVersion).where(TableVersion.name == Member.__tablename__).values(
+        version=TableVersion.version + 1
+    ).returning(TableVersion.version)
+
+
+def member_by_id_query(member_id: str, fields: Optional[List[str]] = None) -> Select:
+    return with_fields(select(Member).where(Member.id == member_id), fields)
+
+
+def member_by_email_query(email: str) -> Select:
+    return select(Member).where(func.lower(Member.email) == func.lower(email))
+
+
+def email_exists_query(email: str, exclude_id: Optional[str] = None) -> Select:
+    query = select(Member.id).where(func.lower(Member.email) == func.lower(email))
+    if exclude_id:
+        query = query.where(Member.id != exclude_id)
+    return query.limit(1)
+
+
+def members_query(
+    filters: MemberFilter, dialect: str, counting: bool = False, scope: Optional[Scope] = None
+) -> Select:
+    """
+    Filtered member query (no ordering or pagination), limited to the members
+    `scope` may access. Pages and exports walk the (created_at, id) index and test
+    the role per row, which stops after one page; a count reads the role's ids
+    from the role index instead (counting=True), unless the scope already narrows
+    the members to a team or one member.
+    """
+    query = select(Member)
+    restricted = scope_restricted(scope)
+
+    # Apply filters
+    if filters.role:
+        query = query.where(has_role(filters.role) if counting and not restricted else role_exists(filters.role))
+
+    if filters.team is not None:
+        query = query.where(Member.team == filters.team)
+
+    if filters.status:
+        query = query.where(Member.status == filters.status)
+
+    if filters.age_group:
+        query = query.where(*age_group_clauses(filters.age_group))
+
+    if filters.q:
+        query = apply_search(query, filters.q, dialect)
+
+    return restrict(query, scope)
+
+
+def age_group_clauses(age_group: str) -> list:
+    """Birthdate range of an age group this season, an index range on idx_members_birthdate_team_status"""
+    earliest, before = birthdate_range(age_group, current_cutoff())
+    clauses = []
+    if earliest is not None:
+        clauses.append(Member.birthdate >= earliest)
+    if before is not None:
+        clauses.append(Member.birthdate < before)
+    return clauses
+
+
+# Member columns in MemberOut field order, for list pages as column tuples
+MEMBER_OUT_COLUMNS = [getattr(Member, name) for name in MemberOut.model_fields]
+
+
+def member_columns(fields: Optional[List[str]] = None) -> list:
+    """
+    Columns of a list page for the given MemberOut fields (all by default), with
+    the cursor keys (created_at, id) appended if they are not among them
+    """
+    if fields is None:
+        return MEMBER_OUT_COLUMNS
+    columns = [getattr(Member, name) for name in fields]
+    return columns + [column for column in (Member.created_at, Member.id) if column.key not in fields]
+
+
+def with_fields(query: Select, fields: Optional[List[str]] = None) -> Select:
+    """Load only the columns of the given fields (and created_at for cursors) into Member instances"""
+    if fields is None:
+        return query
+    return query.options(load_only(*member_columns(fields)))
+
+
+def members_by_ids_query(member_ids: List[str], fields: Optional[List[str]] = None) -> Select:
+    return select(*member_columns(fields)).where(Member.id.in_(member_ids))
+
+
+def canonical_id(member_id: str) -> str:
+    """Member id in the form UUIDKey reads it back (any case, with or without dashes); malformed ids unchanged"""
+    key = parse_uuid(member_id)
+    return member_id if key == NIL_UUID else str(key)
+
+
+def order_lookup(member_ids: List[str], rows: Sequence) -> Tuple[list, List[str]]:
+    """
+    Rows of a lookup in the requested order (each member once) and the requested
+    ids that were not found. Ids match in any spelling of the UUID (case, dashes).
+    """
+    found = {row.id: row for row in rows}
+    ordered, missing, seen = [], [], set()
+    for member_id in member_ids:
+        key = canonical_id(member_id)
+        if key in seen:
+            continue
+        seen.add(key)
+        if key in found:
+            ordered.append(found[key])
+        else:
+            missing.append(member_id)
+    return ordered, missing
+
+
+def count_query(query: Select) -> Select:
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+
+def count_cache_key(filters: MemberFilter, scope: Optional[Scope] = None, version: Optional[int] = None) -> tuple:
+    return (
+        version, filters.role, filters.team, filters.status, filters.age_group, filters.q,
+        scope.key if scope else None
+    )
+
+
+def facets_query(filters: MemberFilter, dialect: str, scope: Optional[Scope] = None) -> Select:
+    """(team, status, count) groups of the filtered members, from idx_members_team_status without filters"""
+    return members_query(filters, dialect, counting=True, scope=scope).with_only_columns(
+        Member.team, Member.status, func.count()
+    ).group_by(Member.team, Member.status)
+
+
+def role_facets_query(filters: MemberFilter, dialect: str, scope: Optional[Scope] = None) -> Select:
+    """(role, count) of the filtered members, read from idx_member_roles_role_member"""
+    query = select(MemberRole.role, func.count()).group_by(MemberRole.role)
+    filtered = filters.role or filters.team is not None or filters.status or filters.age_group or filters.q
+    if filtered or scope_restricted(scope):
+        ids = members_query(filters, dialect, counting=True, scope=scope).with_only_columns(Member.id)
+        query = query.where(MemberRole.member_id.in_(ids))
+    return query
+
+
+def batch_rows_query(member_ids: List[str]) -> Select:
+    """Facet values of the members a batch may update"""
+    return select(Member.id, Member.team, Member.status, Member.roles, Member.birthdate).where(
+        Member.id.in_(member_ids)
+    )
+
+
+def batch_facet_rows(
+    rows: Sequence[tuple], changes: List[Tuple[str, dict]], results: List[MemberBatchResult]
+) -> Tuple[List[FacetRow], List[FacetRow]]:
+    """Facet values before and after a batch, for the members it updates"""
+    before = {row[0]: FacetRow(row[0], row[1], row[2], tuple(row[3] or ()), row[4]) for row in rows}
+    removed, added = [], []
+    for (member_id, data), result in zip(changes, results):
+        if result.status == "updated" and data:
+            removed.append(before[member_id])
+            added.append(changed_row(before[member_id], data))
+    return removed, added
+
+
+def bulk_facet_rows(rows: List[dict]) -> List[FacetRow]:
+    return [
+        FacetRow(row["id"], row["team"], row["status"], tuple(row["roles"] or ()), row["birthdate"]) for row in rows
+    ]
+
+
+def ranked(filters: MemberFilter) -> bool:
+    """Searches are ordered by relevance unless sort=newest is requested"""
+    return bool(filters.q) and filters.sort != "newest"
+
+
+def page_query(query: Select, filters: MemberFilter, dialect: str) -> Select:
+    """
+    Order newest first (best matches first for ranked searches) and paginate. With a
+    cursor the page starts right after the cursor position (keyset, served by
+    idx_members_created_at_id), otherwise at offset.
+    One extra row is fetched to tell whether there is a next page.
+    """
+    rank = search_rank(filters.q, dialect) if ranked(filters) else None
+    if rank is not None:
+        if filters.cursor:
+            raise InvalidCursor("Cursor pagination of search results requires sort=newest")
+        query = query.order_by(rank)
+    query = query.order_by(Member.created_at.desc(), Member.id.desc())
+    if filters.cursor:
+        created_at, member_id = decode_cursor(filters.cursor)
+        query = query.where(tuple_(Member.created_at, Member.id) < tuple_(created_at, member_id))
+    else:
+        query = query.offset(filters.offset)
+    return query.limit(filters.limit + 1)
+
+
+def split_page(rows: List[Member], filters: MemberFilter) -> Tuple[List[Member], Optional[str]]:
+    """Cut the extra row fetched by page_query and build the cursor for the next page"""
+    if len(rows) <= filters.limit:
+        return rows, None
+    rows = rows[:filters.limit]
+    if ranked(filters):
+        # Relevance order has no keyset, ranked results are paged by offset
+        return rows, None
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+# Columns written by GET /members/export, in file order
+EXPORT_COLUMNS = [
+    Member.id, Member.first_name, Member.last_name, Member.email, Member.birthdate,
+    Member.roles, Member.team, Member.status, Member.notes, Member.created_at, Member.updated_at,
+]
+
+
+def export_query(filters: MemberFilter, dialect: str, scope: Optional[Scope] = None) -> Select:
+    """
+    All members matching the filters (pagination fields are ignored), newest first.
+    Plain column rows: no ORM objects or identity map entries are built per row.
+    """
+    return members_query(filters, dialect, scope=scope).with_only_columns(*EXPORT_COLUMNS).order_by(
+        Member.created_at.desc(), Member.id.desc()
+    )
+
+
+def members_by_team_query(team: int, status: Optional[str] = None) -> Select:
+    query = select(Member).where(Member.team == team)
+    if status:
+        query = query.where(Member.status == status)
+    return query
+
+
+def members_by_role_query(role: str) -> Select:
+    return select(Member).where(has_role(role))
+
+
+def has_role(role: str):
+    """Role filter served by idx_member_roles_role_member, for unordered reads and counts"""
+    return Member.id.in_(select(MemberRole.member_id).where(MemberRole.role == role))
+
+
+def role_exists(role: str):
+    """
+    Role filter checked per member on the member_roles primary key, so ordered pages
+    come straight from idx_members_created_at_id instead of sorting every member
+    with the role (the IN form needs a temp B-tree for the ORDER BY)
+    """
+    return select(MemberRole.member_id).where(
+        MemberRole.member_id == Member.id, MemberRole.role == role
+    ).exists()
+
+
+def role_rows(member_id: str, roles: List[str]) -> List[dict]:
+    # dict.fromkeys drops duplicate roles but keeps their order
+    return [{"member_id": member_id, "role": role} for role in dict.fromkeys(roles)]
+
+
+def member_values(member_data: MemberCreate, created_by: Optional[str] = None) -> dict:
+    return dict(
+        first_name=member_data.first_name,
+        last_name=member_data.last_name,
+        email=member_data.email,
+        birthdate=member_data.birthdate,
+        roles=member_data.roles,
+        team=member_data.team,
+        status=member_data.status,
+        notes=member_data.notes,
+        created_by=created_by
+    )
+
+
+def new_member(member_data: MemberCreate, created_by: Optional[str] = None) -> Member:
+    return Member(**member_values(member_data, created_by))
+
+
+def existing_emails_query(emails: Iterable[str]) -> Select:
+    return select(func.lower(Member.email)).where(func.lower(Member.email).in_(list(emails)))
+
+
+def bulk_rows(members: List[MemberCreate], created_by: Optional[str] = None) -> Tuple[List[dict], List[dict]]:
+    """Insert parameters for members and their member_roles rows"""
+    rows = [
+        {"id": str(uuid.uuid4()), **member_values(member_data, created_by)}
+        for member_data in members
+    ]
+    roles = [role for row in rows for role in role_rows(row["id"], row["roles"])]
+    return rows, roles
+
+
+# Columns a patch may not set to null
+NOT_NULL_FIELDS = ("first_name", "last_name", "roles", "status")
+
+
+def batch_changes(batch: MemberBatchUpdate) -> List[Tuple[str, dict]]:
+    """
+    (member id, fields to set) per member of a batch, in request order. Ids are
+    canonical (see canonical_id), so they compare equal to the ids read back.
+    """
+    if batch.patches:
+        return [
+            (canonical_id(patch.id), patch.model_dump(exclude_unset=True, exclude={"id"}))
+            for patch in batch.patches
+        ]
+    update_data = batch.update.model_dump(exclude_unset=True)
+    return [(member_id, update_data) for member_id in dict.fromkeys(map(canonical_id, batch.ids))]
+
+
+def batch_emails(changes: List[Tuple[str, dict]]) -> List[str]:
+    return list({data["email"].lower() for _, data in changes if data.get("email")})
+
+
+def email_owners_query(emails: Iterable[str]) -> Select:
+    return select(func.lower(Member.email), Member.id).where(func.lower(Member.email).in_(list(emails)))
+
+
+def check_batch(
+    changes: List[Tuple[str, dict]],
+    found: Set[str],
+    email_owners: Dict[str, str]
+) -> List[MemberBatchResult]:
+    """
+    Result per change before anything is written: missing members, duplicate ids,
+    nulls in required fields and emails taken by another member (or by an earlier
+    change of the same batch) are rejected, everything else will be updated.
+    """
+    results = []
+    seen_ids = set()
+    claimed = dict(email_owners)
+    for member_id, data in changes:
+        error = None
+        nulls = [field for field in NOT_NULL_FIELDS if field in data and data[field] is None]
+        if member_id in seen_ids:
+            error = "Duplicate id in batch"
+        elif member_id not in found:
+            results.append(MemberBatchResult(id=member_id, status="not_found"))
+            continue
+        elif nulls:
+            error = f"May not be null: {', '.join(nulls)}"
+        elif data.get("email"):
+            email = data["email"].lower()
+            if claimed.get(email, member_id) != member_id:
+                error = "Email already exists"
+            else:
+                claimed[email] = member_id
+        seen_ids.add(member_id)
+        results.append(
+            MemberBatchResult(id=member_id, status="error", error=error) if error
+            else MemberBatchResult(id=member_id, status="updated")
+        )
+    return results
+
+
+def update_groups(changes: List[Tuple[str, dict]], results: List[MemberBatchResult]) -> List[Tuple[List[str], dict]]:
+    """
+    Group the accepted changes by the values they set, so that each group is one
+    UPDATE ... WHERE id IN (...) statement. An ids + update batch is a single group.
+    """
+    groups: Dict[str, Tuple[List[str], dict]] = {}
+    for (member_id, data), result in zip(changes, results):
+        if result.status != "updated" or not data:
+            continue
+        key = json.dumps(data, sort_keys=True, default=str)
+        groups.setdefault(key, ([], data))[0].append(member_id)
+    return list(groups.values())
+
+
+def batch_update_query(member_ids: List[str], data: dict, updated_by: Optional[str] = None):
+    return update(Member).where(Member.id.in_(member_ids)).values(**data, updated_by=updated_by)
+
+
+def apply_update(member: Member, member_data: MemberUpdate, updated_by: Optional[str] = None) -> dict:
+    """Apply the provided fields to `member`, returns them"""
+    # Update only provided fields
+    update_data = member_data.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(member, field, value)
+
+    member.updated_by = updated_by
+    return update_data
 
 
 class MemberRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, scope: Optional[Scope] = None):
+        """Reads see only the members `scope` may access (see Scope), all without a scope"""
         self.db = db
+        self.dialect = db.bind.dialect.name
+        self.scope = scope
 
-    def get_by_id(self, member_id: str) -> Optional[Member]:
-        """Get member by ID"""
-        return self.db.query(Member).filter(Member.id == member_id).first()
+    def get_by_id(self, member_id: str, fields: Optional[List[str]] = None) -> Optional[Member]:
+        """Get member by ID, with only the columns of `fields` if given"""
+        return self.db.scalars(restrict(member_by_id_query(member_id, fields), self.scope)).first()
 
     def get_by_email(self, email: str) -> Optional[Member]:
         """Get member by email (case-insensitive)"""
-        return self.db.query(Member).filter(
-            func.lower(Member.email) == func.lower(email)
-        ).first()
-
-    def list_members(self, filters: MemberFilter) -> Tuple[List[Member], int]:
-        """List members with filters and pagination"""
-        query = self.db.query(Member)
-
-        # Apply filters
-        if filters.role:
-            query = query.filter(Member.roles.contains([filters.role]))
-
-        if filters.team is not None:
-            query = query.filter(Member.team == filters.team)
-
-        if filters.status:
-            query = query.filter(Member.status == filters.status)
-
-        if filters.q:
-            search_term = f"%{filters.q}%"
-            query = query.filter(
-                or_(
-                    func.lower(Member.first_name).like(func.lower(search_term)),
-                    func.lower(Member.last_name).like(func.lower(search_term)),
-                    func.lower(Member.email).like(func.lower(search_term)),
-                    func.lower(
-                        func.concat(Member.first_name, ' ', Member.last_name)
-                    ).like(func.lower(search_term))
-                )
-            )
+        return self.db.scalars(restrict(member_by_email_query(email), self.scope)).first()
 
-        # Order by creation date (newest first)
-        query = query.order_by(Member.created_at.desc())
+    def lookup(self, member_ids: List[str], fields: Optional[List[str]] = None) -> Tuple[list, List[str]]:
+        """
+        Members by id with one IN query, as column tuples (see member_columns) in
+        request order, and the ids that were not found
+        """
+        rows = self.db.execute(restrict(members_by_ids_query(member_ids, fields), self.scope)).all()
+        return order_lookup(member_ids, rows)
 
-        # Get total count before pagination
-        total = query.count()
+    def list_members(
+        self,
+        filters: MemberFilter,
+        as_rows: bool = False,
+        fields: Optional[List[str]] = None,
+        version: Optional[int] = None
+    ) -> Tuple[list, Optional[int], Optional[str]]:
+        """
+        List members with filters and pagination, returns (members, total, next_cursor).
+        With as_rows the members are column tuples in MemberOut field order instead
+        of ORM instances, which is much cheaper to build and serialize. `fields`
+        limits the columns read to those MemberOut fields (see member_columns).
+        Pass the members `version` if it was already read (e.g. for an ETag), a
+        cached total is only used for the version it was counted at.
+        """
+        query = members_query(filters, self.dialect, scope=self.scope)
 
-        # Apply pagination
-        query = query.offset(filters.offset).limit(filters.limit)
+        total = None
+        if filters.include_total:
+            key = count_cache_key(filters, self.scope, self.version() if version is None else version)
+            total = count_cache.get(key)
+            if total is None:
+                total = self.db.scalar(count_query(members_query(filters, self.dialect, counting=True, scope=self.scope)))
+                count_cache.set(key, total)
 
-        return query.all(), total
+        if as_rows:
+            result = self.db.execute(
+                page_query(query.with_only_columns(*member_columns(fields)), filters, self.dialect)
+            )
+        else:
+            result = self.db.scalars(page_query(with_fields(query, fields), filters, self.dialect))
+        members, next_cursor = split_page(list(result), filters)
+        return members, total, next_cursor
 
-    def create_member(self, member_data: MemberCreate, created_by: Optional[str] = None) -> Member:
-        """Create a new member"""
-        member = Member(
-            first_name=member_data.first_name,
-            last_name=member_data.last_name,
-            email=member_data.email,
-            birthdate=member_data.birthdate,
-            roles=member_data.roles,
-            team=member_data.team,
-            status=member_data.status,
-            notes=member_data.notes,
-            created_by=created_by
+    def facets(self, filters: MemberFilter, version: Optional[int] = None) -> dict:
+        """
+        MemberFacets of the filtered members as a dict (see member_facets). Cached
+        counts are used for the members `version` only, like list totals.
+        """
+        if version is None:
+            version = self.version()
+        key = facet_cache_key(filters, self.scope)
+        entry = facet_cache.get(key)
+        if entry is None or entry.version != version:
+            groups = self.db.execute(facets_query(filters, self.dialect, self.scope)).all()
+            roles = self.db.execute(role_facets_query(filters, self.dialect, self.scope)).all()
+            entry = count_facets(filters, self.scope, version, groups, roles)
+            facet_cache.set(key, entry)
+        return render_facets(entry)
+
+    def iter_export(self, filters: MemberFilter, batch_size: int) -> Iterator[Sequence[tuple]]:
+        """
+        Yield the export rows in batches of `batch_size` from one query. yield_per
+        fetches from the cursor batch by batch (server-side cursor on Postgres), so
+        memory does not grow with the table.
+        """
+        result = self.db.execute(
+            export_query(filters, self.dialect, self.scope).execution_options(yield_per=batch_size)
         )
-        self.db.add(member)
-        self.db.commit()
+        yield from result.partitions()
+
+    def create_member(self, member_data: MemberCreate, created_by: Optional[str] = None) -> Member:
+        """Create a new member, raises DuplicateEmail if the email is taken"""
+        member = new_member(member_data, created_by)
+        try:
+            self.db.add(member)
+            self.db.flush()
+            self._set_roles(member.id, member.roles, replace=False)
+            self._commit([member.id], added=[facet_row(member)])
+        except IntegrityError as exc:
+            self.db.rollback()
+            raise_integrity_error(exc)
         self.db.refresh(member)
         return member
 
     def update_member(
-        self, 
-        member_id: str, 
-        member_data: MemberUpdate, 
+        self,
+        member: Member,
+        member_data: MemberUpdate,
         updated_by: Optional[str] = None
-    ) -> Optional[Member]:
-        """Update an existing member"""
-        member = self.get_by_id(member_id)
-        if not member:
-            return None
-
-        # Update only provided fields
-        update_data = member_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(member, field, value)
-
-        member.updated_by = updated_by
-        self.db.commit()
-        self.db.refresh(member)
+    ) -> Member:
+        """
+        Update an already loaded member. The write is a single UPDATE ... RETURNING
+        (plus the member_roles rows if roles change), no reload afterwards. Raises
+        DuplicateEmail if the new email is taken.
+        """
+        before = facet_row(member)
+        update_data = apply_update(member, member_data, updated_by)
+        try:
+            if "roles" in update_data:
+                self._set_roles(member.id, member.roles)
+            self._commit([member.id], [before], [facet_row(member)])
+        except IntegrityError as exc:
+            self.db.rollback()
+            raise_integrity_error(exc)
         return member
 
-    def delete_member(self, member_id: str, updated_by: Optional[str] = None) -> bool:
-        """Soft delete a member (set status to inactive)"""
-        member = self.get_by_id(member_id)
-        if not member:
-            return False
+    def batch_update(self, batch: MemberBatchUpdate, updated_by: Optional[str] = None) -> List[MemberBatchResult]:
+        """
+        Apply a batch of updates in one transaction: one query for the existing ids,
+        one for email conflicts and one UPDATE per distinct set of values.
+        """
+        changes = batch_changes(batch)
+        rows = self.db.execute(
+            restrict(batch_rows_query([i for i, _ in changes]), self.scope)
+        ).all()
+        found = {row[0] for row in rows}
+        emails = batch_emails(changes)
+        owners = dict(self.db.execute(email_owners_query(emails)).all()) if emails else {}
+        results = check_batch(changes, found, owners)
+
+        try:
+            for member_ids, data in update_groups(changes, results):
+                self.db.execute(batch_update_query(member_ids, data, updated_by))
+                if "roles" in data:
+                    self._replace_roles(member_ids, data["roles"])
+            self._commit(found, *batch_facet_rows(rows, changes, results))
+        except IntegrityError as exc:
+            # An email taken by a concurrent write after check_batch
+            self.db.rollback()
+            raise_integrity_error(exc)
+        return results
 
+    def delete_member(self, member: Member, updated_by: Optional[str] = None) -> None:
+        """Soft delete an already loaded member (set status to inactive)"""
+        before = facet_row(member)
         member.status = "inactive"
         member.updated_by = updated_by
-        self.db.commit()
-        return True
+        self._commit([member.id], removed=[before], added=[facet_row(member)])
 
     def hard_delete_member(self, member_id: str) -> bool:
         """Hard delete a member from database"""
@@ -114,26 +616,130 @@ class MemberRepository:
         if not member:
             return False
 
+        self.db.execute(delete(MemberRole).where(MemberRole.member_id == member.id))
         self.db.delete(member)
-        self.db.commit()
+        self._commit([member.id], removed=[facet_row(member)])
         return True
 
     def get_members_by_team(self, team: int, status: Optional[str] = None) -> List[Member]:
         """Get all members of a specific team"""
-        query = self.db.query(Member).filter(Member.team == team)
-        if status:
-            query = query.filter(Member.status == status)
-        return query.all()
+        return list(self.db.scalars(restrict(members_by_team_query(team, status), self.scope)))
 
     def get_members_by_role(self, role: str) -> List[Member]:
         """Get all members with a specific role"""
-        return self.db.query(Member).filter(Member.roles.contains([role])).all()
+        return list(self.db.scalars(restrict(members_by_role_query(role), self.scope)))
 
     def check_email_exists(self, email: str, exclude_id: Optional[str] = None) -> bool:
-        """Check if email already exists (case-insensitive)"""
-        query = self.db.query(Member).filter(
-            func.lower(Member.email) == func.lower(email)
+        """Check if email already exists (case-insensitive) among the members the scope may access"""
+        return self.db.scalar(restrict(email_exists_query(email, exclude_id), self.scope)) is not None
+
+    def existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Which of the given lower-case emails are taken, in one query"""
+        return set(self.db.scalars(existing_emails_query(emails)))
+
+    def bulk_create(self, members: List[MemberCreate], created_by: Optional[str] = None) -> int:
+        """
+        Insert many members in one transaction with multi-row INSERTs. A failed
+        insert is rolled back and re-raised, the session stays usable.
+        """
+        rows, roles = bulk_rows(members, created_by)
+        try:
+            if rows:
+                self.db.execute(insert(Member), rows)
+            if roles:
+                self.db.execute(insert(MemberRole), roles)
+            self._commit(added=bulk_facet_rows(rows))
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+        return len(rows)
+
+    def version(self) -> Optional[int]:
+        """Write counter of the members table (see TableVersion)"""
+        return self.db.scalar(version_query())
+
+    def _commit(
+        self,
+        member_ids: Iterable[str] = (),
+        removed: Iterable[FacetRow] = (),
+        added: Iterable[FacetRow] = ()
+    ) -> None:
+        """
+        Commit a write together with a members version bump, then drop derived caches
+        and the scopes of the users linked to the written members, and move the facet
+        counts from the `removed` to the `added` facet values
+        """
+        # Pending ORM changes first: the bump has to be the last statement before
+        # COMMIT, it locks the counter row every write shares (see TableVersion)
+        self.db.flush()
+        version = self.db.scalar(bump_version_query())
+        self.db.commit()
+        members_changed(version, member_ids, removed, added)
+
+    def _set_roles(self, member_id: str, roles: List[str], replace: bool = True) -> None:
+        """Write the member_roles rows of a member (in the current transaction)"""
+        if replace:
+            self.db.execute(delete(MemberRole).where(MemberRole.member_id == member_id))
+        if roles:
+            self.db.execute(insert(MemberRole), role_rows(member_id, roles))
+
+    def _replace_roles(self, member_ids: List[str], roles: List[str]) -> None:
+        """Give several members the same roles (in the current transaction)"""
+        self.db.execute(delete(MemberRole).where(MemberRole.member_id.in_(member_ids)))
+        rows = [row for member_id in member_ids for row in role_rows(member_id, roles)]
+        if rows:
+            self.db.execute(insert(MemberRole), rows)
+
+
+def run_sync(method):
+    """
+    `method` of MemberRepository as a coroutine of AsyncMemberRepository, run on
+    the session behind the AsyncSession (AsyncSession.run_sync)
+    """
+    @wraps(method)
+    async def run(self, *args, **kwargs):
+        return await self.db.run_sync(
+            lambda session: method(MemberRepository(session, self.scope), *args, **kwargs)
+        )
+    return run
+
+
+class AsyncMemberRepository:
+    """
+    MemberRepository for async routes. The operations are MemberRepository's, run
+    on the AsyncSession's own session, so each exists once; only the export
+    streams natively.
+    """
+
+    def __init__(self, db: AsyncSession, scope: Optional[Scope] = None):
+        self.db = db
+        self.dialect = db.bind.dialect.name
+        self.scope = scope
+
+    get_by_id = run_sync(MemberRepository.get_by_id)
+    get_by_email = run_sync(MemberRepository.get_by_email)
+    lookup = run_sync(MemberRepository.lookup)
+    list_members = run_sync(MemberRepository.list_members)
+    facets = run_sync(MemberRepository.facets)
+    create_member = run_sync(MemberRepository.create_member)
+    update_member = run_sync(MemberRepository.update_member)
+    batch_update = run_sync(MemberRepository.batch_update)
+    delete_member = run_sync(MemberRepository.delete_member)
+    hard_delete_member = run_sync(MemberRepository.hard_delete_member)
+    get_members_by_team = run_sync(MemberRepository.get_members_by_team)
+    get_members_by_role = run_sync(MemberRepository.get_members_by_role)
+    check_email_exists = run_sync(MemberRepository.check_email_exists)
+    existing_emails = run_sync(MemberRepository.existing_emails)
+    bulk_create = run_sync(MemberRepository.bulk_create)
+    version = run_sync(MemberRepository.version)
+
+    async def iter_export(self, filters: MemberFilter, batch_size: int) -> AsyncIterator[Sequence[tuple]]:
+        """
+        Yield the export rows in batches of `batch_size` from one streamed query
+        (server-side cursor on Postgres), so memory does not grow with the table.
+        """
+        result = await self.db.stream(
+            export_query(filters, self.dialect, self.scope).execution_options(yield_per=batch_size)
         )
-        if exclude_id:
-            query = query.filter(Member.id != exclude_id)
-        return query.first() is not None
+        async for partition in result.partitions():
+            yield partition
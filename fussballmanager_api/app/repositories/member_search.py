@@ -0,0 +1,68 @@
+import re
+from typing import List, Optional
+from sqlalchemy import Select, false, func, literal_column, or_
+from sqlalchemy.sql.elements import ColumnElement
+from app.models.member_model import Member, members_fts, pg_search_text, pg_search_vector
+
+# bm25 column weights for (first_name, last_name, email): name hits rank above email hits
+BM25_WEIGHTS = (10.0, 10.0, 1.0)
+
+
+def search_terms(q: str) -> List[str]:
+    """Split a search string into lower-case word tokens"""
+    return re.findall(r"\w+", q.lower())
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+def _pg_tsquery(terms: List[str]) -> ColumnElement:
+    # Every term is a prefix match, all terms must match
+    return func.to_tsquery(literal_column("'simple'::regconfig"), " & ".join(f"{t}:*" for t in terms))
+
+
+def apply_search(query: Select, q: str, dialect: str) -> Select:
+    """
+    Restrict a member query to members matching `q` in first name, last name or email.
+    Every word of `q` must match the start of a word ("jo mue" finds "Jonas Müller").
+    """
+    terms = search_terms(q)
+
+    if dialect == "sqlite":
+        if not terms:
+            return query.where(false())
+        match = " ".join(f'"{t}"*' for t in terms)
+        return query.join(
+            members_fts, members_fts.c.rowid == literal_column("members.rowid")
+        ).where(members_fts.c.members_fts.op("MATCH")(match))
+
+    if dialect == "postgresql":
+        # Substring match on the trigram index as well, e.g. "ller" finds "Müller"
+        substring = pg_search_text().like(f"%{_escape_like(q.lower())}%", escape="/")
+        if not terms:
+            return query.where(substring)
+        return query.where(or_(pg_search_vector().op("@@")(_pg_tsquery(terms)), substring))
+
+    # Other backends: unindexed substring match
+    search_term = f"%{_escape_like(q.lower())}%"
+    return query.where(
+        or_(
+            func.lower(Member.first_name).like(search_term, escape="/"),
+            func.lower(Member.last_name).like(search_term, escape="/"),
+            func.lower(Member.email).like(search_term, escape="/"),
+            func.lower(Member.first_name + " " + Member.last_name).like(search_term, escape="/")
+        )
+    )
+
+
+def search_rank(q: str, dialect: str) -> Optional[ColumnElement]:
+    """ORDER BY clause for best matches first, None if the backend cannot rank"""
+    terms = search_terms(q)
+    if not terms:
+        return None
+    if dialect == "sqlite":
+        return func.bm25(literal_column("members_fts"), *BM25_WEIGHTS).asc()
+    if dialect == "postgresql":
+        return func.ts_rank(pg_search_vector(), _pg_tsquery(terms)).desc()
+    return None
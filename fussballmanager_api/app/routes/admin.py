@@ -0,0 +1,81 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.rbac import Scope, check_user_roles, get_current_scope
+from app.db.database import get_async_db, slow_query_log
+from app.models.member_model import Member
+from app.models.user_model import User
+from app.routes.auth import get_current_user
+from app.schemas.user_schema import User as UserSchema, UserMemberLink
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin(
+    current_user: User = Depends(get_current_user),
+    scope: Scope = Depends(get_current_scope)
+) -> User:
+    if not check_user_roles(scope, ["admin"]):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions"
+        )
+    return current_user
+
+
+@router.get("/slow-queries")
+def list_slow_queries(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Recorded slow statements of this worker, newest first, with redacted
+    parameters and the query plan. Recording is off unless SLOW_QUERY_THRESHOLD_MS is set.
+    """
+    return {
+        "enabled": slow_query_log.enabled,
+        "threshold_ms": slow_query_log.threshold * 1000,
+        "capacity": slow_query_log.records.maxlen,
+        "queries": slow_query_log.entries(limit),
+    }
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries(current_user: User = Depends(require_admin)):
+    """Empty the slow query log, e.g. after deploying a fix"""
+    slow_query_log.clear()
+
+
+@router.put("/users/{user_id}/member", response_model=UserSchema)
+async def link_member(
+    user_id: int,
+    link: UserMemberLink,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Link an account to the member whose roles and team it acts with, or unlink it
+    (member_id null). This is the only way an account gets permissions; the
+    registration email plays no part. A member can be linked to one account.
+    """
+    user = await db.get(User, user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    if link.member_id is not None:
+        member_id = await db.scalar(select(Member.id).where(Member.id == link.member_id))
+        if member_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Member not found")
+        link.member_id = member_id
+    user.member_id = link.member_id
+    try:
+        # The update drops the user's cached principal and scope (see the User listeners)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Member is already linked to another account"
+        )
+    await db.refresh(user)
+    return user
@@ -1,71 +1,114 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy import select, event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.models.user_model import User
 from app.schemas.user_schema import UserCreate, User as UserSchema, Token
-from app.core.security import verify_password, hash_password, create_access_token, get_settings
-from jose import JWTError, jwt
+from app.core.security import (
+    create_access_token, decode_access_token, get_settings, password_hasher, PasswordHasherBusy
+)
+from app.core.cache import TTLCache
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+# Users resolved by get_current_user, keyed by token subject (username). Entries are
+# detached, read-only User instances; they are dropped whenever the user row is
+# updated or deleted through the ORM in this process, other workers pick up
+# changes after the TTL.
+principal_cache = TTLCache(
+    maxsize=get_settings().principal_cache_size,
+    ttl=get_settings().principal_cache_ttl
+)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    principal_cache.pop(target.username)
+    # Also the old name if the username itself changed
+    for username in inspect(target).attrs.username.history.deleted:
+        principal_cache.pop(username)
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        settings = get_settings()
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_alg])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
+    username = decode_access_token(token)
+    if username is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username).first()
+    user = principal_cache.get(username)
     if user is None:
+        user = (await db.scalars(select(User).where(User.username == username))).first()
+        if user is None:
+            raise credentials_exception
+        db.expunge(user)
+        principal_cache.set(username, user)
+    if not user.is_active:
         raise credentials_exception
     return user
 
+password_hasher_busy = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many concurrent password checks, try again shortly",
+    headers={"Retry-After": "1"},
+)
+
 @router.post("/register", response_model=UserSchema)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if user already exists
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = (await db.scalars(select(User).where(User.email == user.email))).first()
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    db_user = db.query(User).filter(User.username == user.username).first()
+    db_user = (await db.scalars(select(User).where(User.username == user.username))).first()
     if db_user:
         raise HTTPException(status_code=400, detail="Username already taken")
     
     # Create new user
-    hashed_password = hash_password(user.password)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHasherBusy:
+        raise password_hasher_busy
     db_user = User(
         email=user.email,
         username=user.username,
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = (await db.scalars(select(User).where(User.username == form_data.username))).first()
+    valid = False
+    if user:
+        try:
+            valid, new_hash = await password_hasher.verify_and_update(
+                form_data.password, user.hashed_password
+            )
+        except PasswordHasherBusy:
+            raise password_hasher_busy
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Transparently upgrade hashes made with an outdated bcrypt cost
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     access_token = create_access_token(sub=user.username)
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -1,7 +1,38 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.db.database import get_db, pool_stats
+from app.models.table_version_model import TableVersion
 
 router = APIRouter(prefix="/health", tags=["health"])
 
 @router.get("/")
 def health_check():
     return {"status": "healthy", "message": "Fussball Manager API is running"}
+
+@router.get("/ready")
+def readiness_check(db: Session = Depends(get_db)):
+    """
+    Ready when the database answers and the schema is migrated (table_versions
+    is filled by the migrations); 503 otherwise, so a load balancer holds traffic.
+    """
+    try:
+        schema_ready = db.scalar(select(TableVersion.version).limit(1)) is not None
+    except SQLAlchemyError as exc:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "database": "unreachable", "error": exc.__class__.__name__},
+        )
+    if not schema_ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "database": "not migrated, run alembic upgrade head"},
+        )
+    return {"status": "ready", "database": "ok"}
+
+@router.get("/pool")
+def pool_status():
+    """Connection pool usage of the sync and async engines"""
+    return pool_stats()
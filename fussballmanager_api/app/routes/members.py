@@ -1,101 +1,342 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+import json
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from app.db.database import get_db
+from app.db.database import get_async_db, AsyncSessionLocal
 from app.models.user_model import User
 from app.models.member_model import Member
 from app.schemas.member_schema import (
-    MemberCreate, MemberUpdate, MemberOut, MemberFilter, MemberListResponse
+    MemberCreate, MemberUpdate, MemberOut, MemberFilter, MemberListResponse,
+    MemberBatchUpdate, MemberBatchResponse, MemberLookup, MemberLookupResponse, MemberFacets,
+    MEMBER_FIELDS, LIST_FIELDS, MemberStatus, Role, parse_fields
 )
-from app.repositories.member_repo import MemberRepository
+from app.repositories.member_repo import AsyncMemberRepository, DuplicateEmail, EXPORT_COLUMNS, batch_changes
+from app.core.age_groups import AgeGroup, current_cutoff
+from app.core.pagination import InvalidCursor
+from app.core.http_cache import request_etag, conditional_json
+from app.core.serialization import member_facets_json, member_json, member_list_json, member_lookup_json
 from app.routes.auth import get_current_user
-from app.core.rbac import validate_member_permissions, get_user_id_from_token
+from app.core.rbac import (
+    Scope, validate_member_permissions, get_current_scope, get_user_id_from_token, check_user_roles, check_member_changes
+)
+from app.core.member_io import (
+    IMPORT_CONTENT_TYPES, EXPORT_MEDIA_TYPES, EXPORT_BATCH_SIZE, export_members, spool_body, iter_spool, iter_lines, iter_csv_rows, iter_ndjson_rows,
+    import_members as run_import
+)
 
 router = APIRouter(prefix="/members", tags=["Members"])
 
 
-def get_member_repo(db: Session = Depends(get_db)) -> MemberRepository:
-    return MemberRepository(db)
+def get_member_repo(
+    db: AsyncSession = Depends(get_async_db),
+    scope: Scope = Depends(get_current_scope)
+) -> AsyncMemberRepository:
+    """Repository limited to the members the caller may access"""
+    return AsyncMemberRepository(db, scope)
+
+
+insufficient_permissions = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="Insufficient permissions"
+)
+
+
+def requested_fields(value: Union[str, List[str], None], default: Optional[List[str]]) -> Optional[List[str]]:
+    """fields= query parameter as a list of MemberOut fields, 400 for unknown names"""
+    try:
+        return parse_fields(value, default)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+def scope_etag(repo: AsyncMemberRepository) -> List[str]:
+    """
+    Responses show the caller's visible members, which change with their scope
+    (e.g. when an admin links or moves them) while the data version stays
+    """
+    return [repr(repo.scope.key)]
+
+
+def season_etag(age_group: Optional[str]) -> List[str]:
+    """Age groups move at the season start while the data version stays, so their ETags carry the season"""
+    return [current_cutoff().isoformat()] if age_group else []
+
+
+FIELDS_DESCRIPTION = f"Comma-separated fields to return (id is always included): {', '.join(MEMBER_FIELDS)}"
+AGE_GROUP_DESCRIPTION = "Filter by age group of the current season, by birthdate (U9 includes all younger members)"
 
 
 @router.post("/", response_model=MemberOut, status_code=status.HTTP_201_CREATED)
 async def create_member(
     member_data: MemberCreate,
     current_user: User = Depends(get_current_user),
-    repo: MemberRepository = Depends(get_member_repo)
+    scope: Scope = Depends(get_current_scope),
+    repo: AsyncMemberRepository = Depends(get_member_repo)
 ):
     """
     Create a new member. Admin only.
     """
-    # Check if user has admin role (for now, assume all users are admin)
-    # In a real implementation, you'd check current_user.roles
-    
-    # Check if email already exists
-    if member_data.email:
-        if repo.check_email_exists(member_data.email):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already exists"
-            )
+    if not check_user_roles(scope, ["admin"]):
+        raise insufficient_permissions
     
     # Get user ID from token
     user_id = str(current_user.id)
     
-    member = repo.create_member(member_data, created_by=user_id)
+    # Email uniqueness is enforced by the unique index, no lookup beforehand
+    try:
+        member = await repo.create_member(member_data, created_by=user_id)
+    except DuplicateEmail:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already exists"
+        )
     return member
 
 
+@router.post("/import")
+async def import_members(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = Query(
+        None, description="Upload format, taken from Content-Type if not given"
+    ),
+    current_user: User = Depends(get_current_user),
+    scope: Scope = Depends(get_current_scope)
+):
+    """
+    Bulk import members from a CSV (header row, roles separated by ;) or NDJSON
+    request body. Admin only.
+    The body is spooled (to disk past 1 MiB), then parsed row by row and inserted in
+    batches, one transaction per batch. The response is NDJSON: one line per rejected row, one per committed
+    batch and a final summary line.
+    """
+    if not check_user_roles(scope, ["admin"]):
+        raise insufficient_permissions
+    
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = format or IMPORT_CONTENT_TYPES.get(content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson, or pass format="
+        )
+    
+    user_id = str(current_user.id)
+    body = await spool_body(request.stream())
+    lines = iter_lines(iter_spool(body))
+    rows = iter_csv_rows(lines) if fmt == "csv" else iter_ndjson_rows(lines)
+    
+    async def results():
+        # Own session: dependency sessions are closed before a streaming body runs
+        async with AsyncSessionLocal() as db:
+            async for result in run_import(AsyncMemberRepository(db), rows, fmt, created_by=user_id):
+                yield json.dumps(result) + "\n"
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
 @router.get("/", response_model=MemberListResponse)
 async def list_members(
-    role: Optional[str] = Query(None, description="Filter by role"),
+    request: Request,
+    role: Optional[Role] = Query(None, description="Filter by role"),
     team: Optional[int] = Query(None, description="Filter by team"),
-    status: Optional[str] = Query(None, description="Filter by status"),
-    q: Optional[str] = Query(None, description="Search in name and email"),
+    status: Optional[MemberStatus] = Query(None, description="Filter by status"),
+    age_group: Optional[AgeGroup] = Query(None, description=AGE_GROUP_DESCRIPTION),
+    q: Optional[str] = Query(None, description="Search in name and email (word prefixes)"),
+    sort: Optional[Literal["relevance", "newest"]] = Query(
+        None, description="Order of search results, relevance (default) or newest"
+    ),
     limit: int = Query(50, ge=1, le=100, description="Number of items per page"),
     offset: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page, replaces offset"),
+    include_total: bool = Query(True, description="Count matching members (may be cached for a few seconds)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION + ". Default: all but notes"),
     current_user: User = Depends(get_current_user),
-    repo: MemberRepository = Depends(get_member_repo)
+    repo: AsyncMemberRepository = Depends(get_member_repo)
 ):
     """
-    List members with optional filtering and pagination.
+    List members with optional filtering and pagination, limited to the members
+    the caller may see (coaches: their team, players and parents: themselves).
+    Only the columns of the requested `fields` are read; notes are left out unless
+    requested (e.g. fields=first_name,last_name,notes).
+    Pass `next_cursor` back as `cursor` to fetch the next page; deep pages stay as
+    cheap as the first one, unlike large offsets. Search results are ranked by
+    relevance and paged by offset, or use sort=newest to page them by cursor.
+    Responses carry an ETag: send it back as If-None-Match to get a 304 while no
+    member has changed.
     """
     filters = MemberFilter(
         role=role,
         team=team,
         status=status,
+        age_group=age_group,
         q=q,
+        sort=sort,
         limit=limit,
-        offset=offset
+        offset=offset,
+        cursor=cursor,
+        include_total=include_total
     )
+    selected = requested_fields(fields, LIST_FIELDS)
+    # The body is cached under the ETag, so cached totals must be of its version
+    version = await repo.version()
     
-    members, total = repo.list_members(filters)
+    async def render() -> bytes:
+        try:
+            rows, total, next_cursor = await repo.list_members(
+                filters, as_rows=True, fields=selected, version=version
+            )
+        except InvalidCursor as exc:
+            # `status` is shadowed by the query parameter here
+            raise HTTPException(status_code=400, detail=str(exc))
+        
+        # Column tuples straight to JSON: no ORM instances, no MemberOut validation
+        return member_list_json(rows, total, limit, offset, next_cursor, selected)
     
-    return MemberListResponse(
-        members=members,
-        total=total,
-        limit=limit,
-        offset=offset
+    etag = request_etag(request, version, str(current_user.id), scope_etag(repo) + season_etag(age_group))
+    return await conditional_json(request, etag, render)
+
+
+@router.get("/facets", response_model=MemberFacets)
+async def member_facets(
+    request: Request,
+    role: Optional[Role] = Query(None, description="Filter by role"),
+    team: Optional[int] = Query(None, description="Filter by team"),
+    status: Optional[MemberStatus] = Query(None, description="Filter by status"),
+    age_group: Optional[AgeGroup] = Query(None, description=AGE_GROUP_DESCRIPTION),
+    q: Optional[str] = Query(None, description="Search in name and email (word prefixes)"),
+    current_user: User = Depends(get_current_user),
+    repo: AsyncMemberRepository = Depends(get_member_repo)
+):
+    """
+    Number of members per team, status and role for the list filters, largest
+    first. Every filter applies to every facet, e.g. with team=5 the role counts
+    are those of team 5. Counts are cached and adjusted on writes, so repeated
+    calls do not scan the members again; same ETag handling as the list.
+    """
+    filters = MemberFilter(role=role, team=team, status=status, age_group=age_group, q=q)
+    version = await repo.version()
+    
+    async def render() -> bytes:
+        return member_facets_json(await repo.facets(filters, version))
+    
+    etag = request_etag(request, version, str(current_user.id), scope_etag(repo) + season_etag(age_group))
+    return await conditional_json(request, etag, render)
+
+
+@router.get("/export")
+async def export_members_file(
+    format: Literal["csv", "ndjson"] = Query("csv", description="File format"),
+    role: Optional[Role] = Query(None, description="Filter by role"),
+    team: Optional[int] = Query(None, description="Filter by team"),
+    status: Optional[MemberStatus] = Query(None, description="Filter by status"),
+    age_group: Optional[AgeGroup] = Query(None, description=AGE_GROUP_DESCRIPTION),
+    q: Optional[str] = Query(None, description="Search in name and email (word prefixes)"),
+    current_user: User = Depends(get_current_user),
+    scope: Scope = Depends(get_current_scope)
+):
+    """
+    Export all members matching the filters as CSV or NDJSON, newest first.
+    Rows are streamed from the database in batches, so the export is not capped
+    like GET /members/ and memory stays flat however large the table is.
+    Contains the members the caller may see, like the list.
+    """
+    filters = MemberFilter(role=role, team=team, status=status, age_group=age_group, q=q, include_total=False)
+    columns = [column.key for column in EXPORT_COLUMNS]
+    
+    async def body():
+        # Own session: dependency sessions are closed before a streaming body runs
+        async with AsyncSessionLocal() as db:
+            partitions = AsyncMemberRepository(db, scope).iter_export(filters, EXPORT_BATCH_SIZE)
+            async for chunk in export_members(partitions, columns, format):
+                yield chunk
+    
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="members.{format}"'}
     )
 
 
+@router.patch("/batch", response_model=MemberBatchResponse)
+async def batch_update_members(
+    batch: MemberBatchUpdate,
+    current_user: User = Depends(get_current_user),
+    scope: Scope = Depends(get_current_scope),
+    repo: AsyncMemberRepository = Depends(get_member_repo)
+):
+    """
+    Update many members in one transaction, e.g. team changes at season rollover.
+    Send `ids` with one `update` for all of them, or `patches` with an id each.
+    Admin or coach; coaches can only change members of their team, others are
+    reported as not found. Members that are missing or whose patch is rejected
+    are reported per id, all other changes are applied. Roles, status and
+    emails are admin only, and a coach cannot move themselves to another team.
+    """
+    if not check_user_roles(scope, ["admin", "coach"]):
+        raise insufficient_permissions
+    if not all(check_member_changes(scope, member_id, changes) for member_id, changes in batch_changes(batch)):
+        raise insufficient_permissions
+    
+    try:
+        results = await repo.batch_update(batch, updated_by=str(current_user.id))
+    except DuplicateEmail:
+        # Only when another request took an email between the check and the write
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email already exists, batch not applied"
+        )
+    updated = sum(result.status == "updated" for result in results)
+    return MemberBatchResponse(updated=updated, failed=len(results) - updated, results=results)
+
+
+@router.post("/lookup", response_model=MemberLookupResponse)
+async def lookup_members(
+    lookup: MemberLookup,
+    current_user: User = Depends(get_current_user),
+    repo: AsyncMemberRepository = Depends(get_member_repo)
+):
+    """
+    Fetch up to 500 members by id in one request, e.g. to resolve the coaches,
+    parents or created_by of a page instead of one GET /members/{id} each.
+    Members come back in the requested order (a repeated id once), ids that do
+    not exist are listed in `missing`. `fields` works like on the GET endpoints.
+    """
+    fields = requested_fields(lookup.fields, MEMBER_FIELDS)
+    rows, missing = await repo.lookup(lookup.ids, fields)
+    return Response(member_lookup_json(rows, missing, fields), media_type="application/json")
+
+
 @router.get("/{member_id}", response_model=MemberOut)
 async def get_member(
+    request: Request,
     member_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION + ". Default: all"),
     current_user: User = Depends(get_current_user),
-    repo: MemberRepository = Depends(get_member_repo)
+    repo: AsyncMemberRepository = Depends(get_member_repo)
 ):
     """
-    Get a specific member by ID.
+    Get a specific member by ID. Supports If-None-Match like the list.
+    With `fields` only those columns are read and returned. Members the caller
+    may not see are not found.
     """
-    member = repo.get_by_id(member_id)
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Member not found"
-        )
+    selected = requested_fields(fields, None)
     
-    return member
+    async def render() -> bytes:
+        member = await repo.get_by_id(member_id, selected)
+        if not member:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Member not found"
+            )
+        
+        if selected is not None:
+            return member_json(member, selected)
+        return MemberOut.model_validate(member).model_dump_json().encode()
+    
+    etag = request_etag(request, await repo.version(), str(current_user.id), scope_etag(repo))
+    return await conditional_json(request, etag, render)
 
 
 @router.patch("/{member_id}", response_model=MemberOut)
@@ -103,66 +344,59 @@ async def update_member(
     member_id: str,
     member_data: MemberUpdate,
     current_user: User = Depends(get_current_user),
-    repo: MemberRepository = Depends(get_member_repo)
+    scope: Scope = Depends(get_current_scope),
+    repo: AsyncMemberRepository = Depends(get_member_repo)
 ):
     """
-    Update a member. Admin or coach of the same team can update.
+    Update a member. Admin or coach of the same team can update; roles, status
+    and email only an admin, and a coach cannot move themselves to another team.
     """
     # Validate permissions (admin or coach of same team)
-    member = validate_member_permissions(
+    member = await validate_member_permissions(
         str(member_id), 
         ["admin", "coach"], 
-        current_user, 
-        repo.db
+        scope, 
+        repo
     )
-    
-    # Check if email already exists (if being updated)
-    if member_data.email and member_data.email != member.email:
-        if repo.check_email_exists(member_data.email, exclude_id=member_id):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already exists"
-            )
+    if not check_member_changes(scope, member.id, member_data.model_dump(exclude_unset=True)):
+        raise insufficient_permissions
     
     # Get user ID from token
     user_id = str(current_user.id)
     
-    updated_member = repo.update_member(member_id, member_data, updated_by=user_id)
-    if not updated_member:
+    # Writes to the instance loaded by the permission check, no second lookup;
+    # a taken email is rejected by the unique index
+    try:
+        return await repo.update_member(member, member_data, updated_by=user_id)
+    except DuplicateEmail:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Member not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already exists"
         )
-    
-    return updated_member
 
 
 @router.delete("/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_member(
     member_id: str,
     current_user: User = Depends(get_current_user),
-    repo: MemberRepository = Depends(get_member_repo)
+    scope: Scope = Depends(get_current_scope),
+    repo: AsyncMemberRepository = Depends(get_member_repo)
 ):
     """
     Soft delete a member (set status to inactive). Admin only.
     """
     # Validate permissions (admin only)
-    validate_member_permissions(
+    member = await validate_member_permissions(
         str(member_id), 
         ["admin"], 
-        current_user, 
-        repo.db
+        scope, 
+        repo
     )
     
     # Get user ID from token
     user_id = str(current_user.id)
     
-    success = repo.delete_member(member_id, updated_by=user_id)
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Member not found"
-        )
+    await repo.delete_member(member, updated_by=user_id)
 
 
 # Example curl commands for testing:
@@ -184,14 +418,49 @@ curl -X POST "http://localhost:8000/members/" \
 curl -X GET "http://localhost:8000/members/?team=1&status=active&limit=10" \
   -H "Authorization: Bearer YOUR_TOKEN"
 
+# Next page (cursor taken from next_cursor), without counting the total
+curl -X GET "http://localhost:8000/members/?limit=10&cursor=NEXT_CURSOR&include_total=false" \
+  -H "Authorization: Bearer YOUR_TOKEN"
+
+# Roster view: only names and team
+curl -X GET "http://localhost:8000/members/?team=1&fields=first_name,last_name,team" \
+  -H "Authorization: Bearer YOUR_TOKEN"
+
 # Search members
 curl -X GET "http://localhost:8000/members/?q=john" \
   -H "Authorization: Bearer YOUR_TOKEN"
 
+# Bulk import from CSV (streams one result line per rejected row / batch)
+curl -X POST "http://localhost:8000/members/import" \
+  -H "Authorization: Bearer YOUR_TOKEN" \
+  -H "Content-Type: text/csv" \
+  --data-binary @members.csv
+
+# Export all active members of team 1 as CSV
+curl -X GET "http://localhost:8000/members/export?format=csv&team=1&status=active" \
+  -H "Authorization: Bearer YOUR_TOKEN" -o members.csv
+
 # Get specific member
 curl -X GET "http://localhost:8000/members/MEMBER_UUID" \
   -H "Authorization: Bearer YOUR_TOKEN"
 
+# Revalidate: 304 Not Modified while no member has changed
+curl -i -X GET "http://localhost:8000/members/MEMBER_UUID" \
+  -H "Authorization: Bearer YOUR_TOKEN" \
+  -H 'If-None-Match: "ETAG_FROM_LAST_RESPONSE"'
+
+# Resolve several members in one request
+curl -X POST "http://localhost:8000/members/lookup" \
+  -H "Authorization: Bearer YOUR_TOKEN" \
+  -H "Content-Type: application/json" \
+  -d '{"ids": ["MEMBER_UUID_1", "MEMBER_UUID_2"], "fields": ["first_name", "last_name"]}'
+
+# Move several members to another team in one request
+curl -X PATCH "http://localhost:8000/members/batch" \
+  -H "Authorization: Bearer YOUR_TOKEN" \
+  -H "Content-Type: application/json" \
+  -d '{"ids": ["MEMBER_UUID_1", "MEMBER_UUID_2"], "update": {"team": 3}}'
+
 # Update member (admin or coach of same team)
 curl -X PATCH "http://localhost:8000/members/MEMBER_UUID" \
   -H "Authorization: Bearer YOUR_TOKEN" \
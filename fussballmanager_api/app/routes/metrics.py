@@ -0,0 +1,51 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.http_cache import response_cache
+from app.core.metrics import gauge, render_metrics
+from app.core.rbac import scope_cache
+from app.db.database import pool_stats
+from app.repositories.member_facets import facet_cache
+from app.repositories.member_repo import count_cache
+from app.routes.auth import principal_cache
+
+router = APIRouter(tags=["metrics"])
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def pool_gauges() -> list:
+    stats = pool_stats()
+    samples = {"size": [], "checked_out": [], "overflow": []}
+    for engine_name, pool in stats.items():
+        for key in samples:
+            if key in pool:
+                samples[key].append(({"engine": engine_name}, pool[key]))
+    lines = []
+    for key, values in samples.items():
+        lines += gauge(f"db_pool_{key}", f"Connection pool {key.replace('_', ' ')}", values)
+    return lines
+
+
+def cache_gauges() -> list:
+    caches = {
+        "member_count": count_cache,
+        "member_facets": facet_cache,
+        "member_response": response_cache,
+        "rbac_scope": scope_cache,
+        "auth_principal": principal_cache,
+    }
+    lines = []
+    for key in ("size", "hits", "misses"):
+        lines += gauge(
+            f"cache_{key}",
+            f"In-process cache {key}",
+            [({"cache": name}, cache.stats()[key]) for name, cache in caches.items()],
+        )
+    return lines
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Request, database, pool and cache metrics of this worker process"""
+    return PlainTextResponse(render_metrics(pool_gauges() + cache_gauges()), media_type=CONTENT_TYPE)
@@ -1,6 +1,10 @@
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List, Literal
+from pydantic import BaseModel, EmailStr, Field, validator, model_validator
+from typing import Optional, List, Literal, Union
 from datetime import date, datetime
+from app.core.age_groups import AgeGroup
+
+Role = Literal["admin", "coach", "player", "parent"]
+MemberStatus = Literal["active", "inactive"]
 
 
 class MemberBase(BaseModel):
@@ -46,6 +50,43 @@ class MemberUpdate(BaseModel):
         return v
 
 
+# Members changed by one PATCH /members/batch request
+MAX_BATCH_SIZE = 1000
+
+
+class MemberPatch(MemberUpdate):
+    id: str
+
+
+class MemberBatchUpdate(BaseModel):
+    """Either the same `update` for all `ids`, or one patch per member in `patches`"""
+    ids: List[str] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+    update: Optional[MemberUpdate] = None
+    patches: List[MemberPatch] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+
+    @model_validator(mode="after")
+    def check_shape(self):
+        if self.patches and (self.ids or self.update is not None):
+            raise ValueError("Send either ids with update, or patches")
+        if not self.patches and (not self.ids or self.update is None):
+            raise ValueError("Send ids with update, or patches")
+        if len(self.ids) + len(self.patches) > MAX_BATCH_SIZE:
+            raise ValueError(f"At most {MAX_BATCH_SIZE} members per batch")
+        return self
+
+
+class MemberBatchResult(BaseModel):
+    id: str
+    status: Literal["updated", "not_found", "error"]
+    error: Optional[str] = None
+
+
+class MemberBatchResponse(BaseModel):
+    updated: int
+    failed: int
+    results: List[MemberBatchResult]
+
+
 class MemberOut(MemberBase):
     id: str
     created_at: datetime
@@ -57,13 +98,68 @@ class MemberOut(MemberBase):
         from_attributes = True
 
 
+# Fields that fields= can select, in MemberOut order
+MEMBER_FIELDS = list(MemberOut.model_fields)
+# Not loaded for list pages unless requested: free text, the widest column by far
+DEFERRED_LIST_FIELDS = ("notes",)
+LIST_FIELDS = [field for field in MEMBER_FIELDS if field not in DEFERRED_LIST_FIELDS]
+
+
+def parse_fields(value: Union[str, List[str], None], default: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    Field names, comma-separated (fields=first_name,team) or as a list, in MemberOut
+    order; id is always included. Raises ValueError for unknown names.
+    """
+    if not value:
+        return default
+    names = value.split(",") if isinstance(value, str) else value
+    requested = {name.strip() for name in names if name.strip()}
+    unknown = requested.difference(MEMBER_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Allowed fields: {', '.join(MEMBER_FIELDS)}")
+    requested.add("id")
+    return [field for field in MEMBER_FIELDS if field in requested]
+
+
+# Ids resolved by one POST /members/lookup request
+MAX_LOOKUP_SIZE = 500
+
+
+class MemberLookup(BaseModel):
+    """Members to fetch by id, e.g. the coaches and parents referenced by a page"""
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_LOOKUP_SIZE)
+    fields: Optional[List[str]] = None  # Same as the fields= query parameter of the GET endpoints
+
+
+class MemberLookupResponse(BaseModel):
+    members: List[MemberOut]  # In request order, duplicates once
+    missing: List[str]
+
+
+class FacetCount(BaseModel):
+    value: Union[int, str, None]
+    count: int
+
+
+class MemberFacets(BaseModel):
+    """Members matching the filters, counted per team, status and role (largest first)"""
+    total: int
+    team: List[FacetCount]
+    status: List[FacetCount]
+    role: List[FacetCount]
+
+
 class MemberFilter(BaseModel):
-    role: Optional[str] = None
+    role: Optional[Role] = None
     team: Optional[int] = None
-    status: Optional[Literal["active", "inactive"]] = None
+    status: Optional[MemberStatus] = None
     q: Optional[str] = None  # Search query for name/email
+    age_group: Optional[AgeGroup] = None  # Of the current season, see app.core.age_groups
+    sort: Optional[Literal["relevance", "newest"]] = None  # Searches default to relevance
     limit: int = Field(default=50, ge=1, le=100)
     offset: int = Field(default=0, ge=0)
+    cursor: Optional[str] = None  # Keyset cursor, takes precedence over offset
+    include_total: bool = True
 
     @validator('role')
     def validate_role(cls, v):
@@ -76,6 +172,7 @@ class MemberFilter(BaseModel):
 
 class MemberListResponse(BaseModel):
     members: List[MemberOut]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
@@ -17,12 +17,17 @@ class UserUpdate(BaseModel):
 class User(UserBase):
     id: int
     is_active: bool
+    member_id: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
+class UserMemberLink(BaseModel):
+    """Member an account acts as, None to unlink"""
+    member_id: Optional[str] = None
+
 class UserInDB(User):
     hashed_password: str
 
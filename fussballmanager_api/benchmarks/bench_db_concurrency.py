@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Concurrent read/write benchmark.
+
+Runs readers (member lists) and writers (member creates and updates) against a
+running server at the same time for a fixed duration. Reports throughput,
+latency per kind, failed requests (e.g. "database is locked" errors surface as
+500s) and the connection pool state from GET /health/pool afterwards.
+
+    python benchmarks/bench_db_concurrency.py --readers 32 --writers 16 --seconds 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+from load_members import BASE_URL, FIRST_NAMES, LAST_NAMES, get_auth_headers, summarize
+
+
+async def main(args: argparse.Namespace) -> None:
+    concurrency = args.readers + args.writers
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        headers = await get_auth_headers(client, args.username, args.password)
+        latencies: Dict[str, List[float]] = {"read": [], "create": [], "update": [], "errors": []}
+        created: List[str] = []
+        deadline = time.perf_counter() + args.seconds
+
+        async def timed(kind: str, request):
+            started = time.perf_counter()
+            try:
+                response = await request
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                response, ok = None, False
+            latencies[kind if ok else "errors"].append((time.perf_counter() - started) * 1000)
+            return response if ok else None
+
+        async def reader():
+            while time.perf_counter() < deadline:
+                params = {"limit": 50, "team": random.randint(1, 20), "include_total": "false"}
+                await timed("read", client.get("/members/", params=params, headers=headers))
+
+        async def writer():
+            while time.perf_counter() < deadline:
+                if created and random.random() < args.update_ratio:
+                    member_id = random.choice(created)
+                    await timed("update", client.patch(
+                        f"/members/{member_id}", json={"team": random.randint(1, 20)}, headers=headers
+                    ))
+                    continue
+                first_name = random.choice(FIRST_NAMES)
+                last_name = random.choice(LAST_NAMES)
+                response = await timed("create", client.post("/members/", json={
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "email": f"{first_name}.{last_name}.{uuid.uuid4().hex[:8]}@example.com".lower(),
+                    "roles": ["player"],
+                    "team": random.randint(1, 20),
+                }, headers=headers))
+                if response is not None:
+                    created.append(response.json()["id"])
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(reader() for _ in range(args.readers)),
+            *(writer() for _ in range(args.writers))
+        )
+        summary = summarize(latencies, time.perf_counter() - started)
+        summary["pool"] = (await client.get("/health/pool")).json()
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent member reads and writes")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--username", default="rwbench")
+    parser.add_argument("--password", default="rwbench-pass")
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--update-ratio", type=float, default=0.5, help="Share of writes that are updates")
+    parser.add_argument("--output", help="Write the JSON summary to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Login throughput benchmark.
+
+Sends a burst of concurrent logins to a running server while probing
+GET /health/, and reports logins per second, login latency and how the
+health check latency holds up during the burst.
+
+    python benchmarks/bench_login.py --concurrency 32 --logins 400
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+import httpx
+
+from load_members import BASE_URL, latency_summary
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        await client.post("/auth/register", json={
+            "email": f"{args.username}@example.com",
+            "username": args.username,
+            "password": args.password
+        })
+
+        login_latencies: List[float] = []
+        health_latencies: List[float] = []
+        rejected = 0
+        remaining = args.logins
+        burst_done = asyncio.Event()
+
+        async def login_worker():
+            nonlocal remaining, rejected
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                response = await client.post(
+                    "/auth/login", data={"username": args.username, "password": args.password}
+                )
+                if response.status_code == 200:
+                    login_latencies.append((time.perf_counter() - started) * 1000)
+                else:
+                    rejected += 1
+
+        async def health_probe():
+            while not burst_done.is_set():
+                started = time.perf_counter()
+                await client.get("/health/")
+                health_latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.05)
+
+        probe = asyncio.create_task(health_probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(args.concurrency)))
+        wall_seconds = time.perf_counter() - started
+        burst_done.set()
+        await probe
+
+    summary = {
+        "logins_per_second": round(len(login_latencies) / wall_seconds, 1),
+        "rejected": rejected,
+        "login": latency_summary(login_latencies),
+        "health_during_burst": latency_summary(health_latencies),
+    }
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark /auth/login throughput")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--username", default="loginbench")
+    parser.add_argument("--password", default="loginbench-pass")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--output", help="Write the JSON summary to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Member key storage and lookup benchmark.
+
+Seeds a temporary SQLite database and reports the on-disk size of the member
+tables and of every index on them (from the DBSTAT virtual table), then times
+the lookups that go through the member key: a member by id, the members of a
+role (member_roles joined on the key) and the payments of a member.
+
+    python benchmarks/bench_member_keys.py --members 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.database import get_settings, make_engine  # noqa: E402
+from app.models.member_model import Member  # noqa: E402
+from app.models.payment_model import Payment  # noqa: E402
+from app.repositories.member_repo import MemberRepository  # noqa: E402
+from app.schemas.member_schema import MemberFilter  # noqa: E402
+from load_members import latency_summary  # noqa: E402
+from seed import seed  # noqa: E402
+
+TABLES = ("members", "member_roles", "payments")
+
+
+def storage(db: Session) -> Dict[str, int]:
+    """Bytes used by each member table and index"""
+    rows = db.execute(text(
+        "SELECT m.name, SUM(s.pgsize) FROM sqlite_master m JOIN dbstat s ON s.name = m.name "
+        "WHERE m.tbl_name IN ('members', 'member_roles', 'payments') AND m.type IN ('table', 'index') "
+        "GROUP BY m.name ORDER BY m.tbl_name, m.name"
+    )).all()
+    sizes = {name: size for name, size in rows}
+    sizes["total"] = sum(sizes.values())
+    return sizes
+
+
+def timed(call: Callable[[], object], rounds: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - started) * 1000)
+    summary = latency_summary(latencies, digits=4)
+    return {"median_ms": summary["p50_ms"], "p95_ms": summary["p95_ms"]}
+
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'keys.db')}", get_settings())
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.members, hashed_password="x")
+        rng = random.Random(1)
+        with Session(engine) as db:
+            ids = db.execute(select(Member.id)).scalars().all()
+            repo = MemberRepository(db)
+            report = {
+                "members": args.members,
+                "storage_bytes": storage(db),
+                "get_by_id": timed(lambda: repo.get_by_id(rng.choice(ids)), args.rounds),
+                "role_page": timed(
+                    lambda: repo.list_members(MemberFilter(role="coach", limit=50, include_total=False)), args.rounds
+                ),
+                "payments_by_member": timed(
+                    lambda: db.execute(select(Payment).where(Payment.member_id == rng.choice(ids))).all(),
+                    args.rounds,
+                ),
+            }
+        engine.dispose()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark member key storage and lookups")
+    parser.add_argument("--members", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=2000)
+    main(parser.parse_args())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Member list serialization micro-benchmark.
+
+Compares rows per second for building a 100-row GET /members/ body:
+- orm: ORM instances -> MemberListResponse -> validated again as the response
+  model -> jsonable_encoder + json.dumps (what FastAPI does for a returned model)
+- rows: column tuples -> member_list_json (orjson)
+
+Each path is measured for serialization alone and including the page query,
+on an in-memory SQLite database. No server needed:
+    python benchmarks/bench_serialization.py --members 2000 --page 100
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.core.serialization import member_list_json  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.database import SessionLocal, engine  # noqa: E402
+from app.repositories.member_repo import MemberRepository  # noqa: E402
+from app.schemas.member_schema import MemberCreate, MemberFilter, MemberListResponse  # noqa: E402
+
+
+def orm_body(members, total, filters) -> bytes:
+    response = MemberListResponse(
+        members=members, total=total, limit=filters.limit, offset=filters.offset, next_cursor=None
+    )
+    # FastAPI validates a returned model against response_model once more
+    validated = MemberListResponse.model_validate(response.model_dump())
+    return JSONResponse(content=jsonable_encoder(validated)).body
+
+
+def rows_body(rows, total, filters) -> bytes:
+    return member_list_json(rows, total, filters.limit, filters.offset, None)
+
+
+def rate(fn, rows_per_call: int, seconds: float) -> float:
+    calls = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        fn()
+        calls += 1
+    return calls * rows_per_call / (time.perf_counter() - started)
+
+
+def main(args: argparse.Namespace) -> None:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        repo = MemberRepository(db)
+        repo.bulk_create([
+            MemberCreate(
+                first_name=f"First{i}", last_name=f"Last{i}", email=f"m{i}.{uuid.uuid4().hex[:6]}@example.com",
+                birthdate=date(2010, 1, 1), roles=["player"], team=i % 20, notes="Some notes" if i % 2 else None
+            )
+            for i in range(args.members)
+        ])
+        filters = MemberFilter(limit=args.page)
+        members, total, _ = repo.list_members(filters)
+        rows, _, _ = repo.list_members(filters, as_rows=True)
+        assert json.loads(orm_body(members, total, filters)) == json.loads(rows_body(rows, total, filters))
+
+        def orm_end_to_end():
+            db.expunge_all()
+            page, count, _ = repo.list_members(filters)
+            return orm_body(page, count, filters)
+
+        def rows_end_to_end():
+            page, count, _ = repo.list_members(filters, as_rows=True)
+            return rows_body(page, count, filters)
+
+        page = len(rows)
+        result = {
+            "page_size": page,
+            "serialize_only_rows_per_s": {
+                "orm": round(rate(lambda: orm_body(members, total, filters), page, args.seconds)),
+                "rows": round(rate(lambda: rows_body(rows, total, filters), page, args.seconds)),
+            },
+            "query_and_serialize_rows_per_s": {
+                "orm": round(rate(orm_end_to_end, page, args.seconds)),
+                "rows": round(rate(rows_end_to_end, page, args.seconds)),
+            },
+        }
+    for section in ("serialize_only_rows_per_s", "query_and_serialize_rows_per_s"):
+        result[section]["speedup"] = round(result[section]["rows"] / result[section]["orm"], 1)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark member list serialization")
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--page", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=3)
+    main(parser.parse_args())
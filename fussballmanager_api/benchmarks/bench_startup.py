@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Import-time and cold-start benchmark.
+
+Measures, each in fresh interpreters:
+- how long `import app.main` takes (what every worker and test run pays first)
+- how long a uvicorn server takes from process start until GET /health/ answers
+
+Run from the fussballmanager_api directory against a migrated database:
+    alembic upgrade head
+    python benchmarks/bench_startup.py --runs 5 --workers 1 --workers 4
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def measure_import() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1]) * 1000
+
+
+def slowest_imports(count: int) -> list:
+    """Modules with the largest cumulative import time (python -X importtime)"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        check=True, capture_output=True, text=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative) / 1000, module))
+    return [{"module": module, "cumulative_ms": round(ms, 1)} for ms, module in sorted(rows, reverse=True)[:count]]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_cold_start(workers: int, timeout: float) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health/", timeout=1).status_code == 200:
+                    return (time.perf_counter() - started) * 1000
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.02)
+        raise RuntimeError(f"Server did not answer within {timeout} s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def summary(samples: list) -> dict:
+    return {
+        "runs": len(samples),
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "max_ms": round(max(samples), 1),
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    result = {"import_app_main": summary([measure_import() for _ in range(args.runs)])}
+    for workers in args.workers or [1]:
+        result[f"cold_start_{workers}_workers"] = summary(
+            [measure_cold_start(workers, args.timeout) for _ in range(args.runs)]
+        )
+    if args.top:
+        result["slowest_imports"] = slowest_imports(args.top)
+
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.getcwd())
+    parser = argparse.ArgumentParser(description="Benchmark app import time and server cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, action="append", help="Worker counts to cold start (repeatable)")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest imports")
+    parser.add_argument("--output", help="Write the JSON summary to this file")
+    main(parser.parse_args())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Mixed-traffic HTTP load driver for the /auth and /members routes.
+
+Runs a weighted mix of requests for a fixed duration with a number of concurrent
+clients, then reports throughput and p50/p95/p99 latency per request kind. A run
+can be saved as a baseline and later runs compared against it; the driver exits
+with status 1 when throughput drops or p95 latency grows beyond the tolerance.
+
+Seed the database and start the server first, e.g.:
+    python benchmarks/seed.py --scale 100k
+    uvicorn app.main:app --workers 1
+    python benchmarks/load_driver.py --duration 30 --save-baseline benchmarks/baselines/local.json
+    python benchmarks/load_driver.py --duration 30 --baseline benchmarks/baselines/local.json
+
+Baselines are machine specific, compare runs on the same host only.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+from load_members import BASE_URL, FIRST_NAMES, LAST_NAMES, SEARCH_TERMS, get_auth_headers, summarize
+
+DEFAULT_MIX = "list=35,search=20,get=20,update=10,create=5,me=8,login=2"
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    mix = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in REQUESTS:
+            raise argparse.ArgumentTypeError(f"Unknown request kind '{kind}', choose from {sorted(REQUESTS)}")
+        mix[kind] = int(weight or 1)
+    return mix
+
+
+class Driver:
+    """Shared state of the workers: client, credentials and known member ids"""
+
+    def __init__(self, client: httpx.AsyncClient, headers: Dict[str, str], args: argparse.Namespace):
+        self.client = client
+        self.headers = headers
+        self.args = args
+        self.member_ids: List[str] = []
+
+    async def load_member_ids(self) -> None:
+        response = await self.client.get(
+            "/members/", params={"limit": 100, "include_total": "false"}, headers=self.headers
+        )
+        response.raise_for_status()
+        self.member_ids = [m["id"] for m in response.json()["members"]]
+
+    async def list(self):
+        params = {"limit": 50, "offset": random.randint(0, 20) * 50}
+        return await self.client.get("/members/", params=params, headers=self.headers)
+
+    async def search(self):
+        params = {"q": random.choice(SEARCH_TERMS), "limit": 50}
+        return await self.client.get("/members/", params=params, headers=self.headers)
+
+    async def get(self):
+        return await self.client.get(f"/members/{random.choice(self.member_ids)}", headers=self.headers)
+
+    async def update(self):
+        return await self.client.patch(
+            f"/members/{random.choice(self.member_ids)}",
+            json={"notes": f"load test {uuid.uuid4().hex[:8]}"},
+            headers=self.headers,
+        )
+
+    async def create(self):
+        first_name = random.choice(FIRST_NAMES)
+        last_name = random.choice(LAST_NAMES)
+        response = await self.client.post("/members/", json={
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": f"{first_name}.{last_name}.{uuid.uuid4().hex[:12]}@load.example.com".lower(),
+            "roles": ["player"],
+            "team": random.randint(1, 20),
+        }, headers=self.headers)
+        if response.status_code == 201:
+            self.member_ids.append(response.json()["id"])
+        return response
+
+    async def me(self):
+        return await self.client.get("/auth/me", headers=self.headers)
+
+    async def login(self):
+        return await self.client.post(
+            "/auth/login", data={"username": self.args.username, "password": self.args.password}
+        )
+
+
+REQUESTS = {name: getattr(Driver, name) for name in ("list", "search", "get", "update", "create", "me", "login")}
+
+
+async def run_mix(driver: Driver, mix: Dict[str, int], concurrency: int, duration: float) -> Dict[str, List[float]]:
+    """Send requests picked from the mix until `duration` seconds have passed"""
+    latencies: Dict[str, List[float]] = {kind: [] for kind in mix}
+    latencies["errors"] = []
+    kinds, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            kind = random.choices(kinds, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await REQUESTS[kind](driver)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            latencies[kind if ok else "errors"].append(elapsed_ms)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def compare(summary: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Regressions of a run against a baseline: lower throughput or higher p95"""
+    regressions = []
+    current_rps = summary["overall"]["throughput_rps"]
+    baseline_rps = baseline["overall"]["throughput_rps"]
+    if current_rps < baseline_rps * (1 - tolerance):
+        regressions.append(f"throughput {current_rps} rps < baseline {baseline_rps} rps")
+    if summary["overall"]["errors"] > baseline["overall"]["errors"]:
+        regressions.append(f"errors {summary['overall']['errors']} > baseline {baseline['overall']['errors']}")
+    for kind, stats in summary.items():
+        if kind == "overall" or kind not in baseline or not stats["count"]:
+            continue
+        if stats["p95_ms"] > baseline[kind]["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{kind} p95 {stats['p95_ms']} ms > baseline {baseline[kind]['p95_ms']} ms")
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        headers = await get_auth_headers(client, args.username, args.password)
+        driver = Driver(client, headers, args)
+        await driver.load_member_ids()
+        if not driver.member_ids and any(kind in args.mix for kind in ("get", "update")):
+            print("No members found, seed the database first (benchmarks/seed.py)")
+            return 2
+
+        print(f"Running {args.mix} for {args.duration}s with concurrency {args.concurrency}...")
+        started = time.perf_counter()
+        latencies = await run_mix(driver, args.mix, args.concurrency, args.duration)
+        summary = summarize(latencies, time.perf_counter() - started)
+
+    print(json.dumps(summary, indent=2))
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(summary, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mixed load test for /auth and /members")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--username", default="loadtest")
+    parser.add_argument("--password", default="loadtest-pass")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help=f"Weights per request kind (default {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--save-baseline", help="Write the summary to this JSON file")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON, exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (default 0.2)")
+    sys.exit(asyncio.run(main(parser.parse_args())))
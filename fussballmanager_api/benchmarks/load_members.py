@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Concurrent load test for the Members API.
+
+Fires list and search requests at a running server with a fixed number of
+concurrent clients and reports throughput and p50/p95/p99 latency.
+
+Run the server first (e.g. `uvicorn app.main:app --workers 1`), then:
+    python benchmarks/load_members.py --seed 2000 --concurrency 50 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+
+SEARCH_TERMS = ["anna", "ben", "mueller", "schmidt", "example", "jo"]
+FIRST_NAMES = ["Anna", "Ben", "Clara", "David", "Emma", "Finn", "Jonas", "Lena", "Lukas", "Mia"]
+LAST_NAMES = ["Mueller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_summary(samples: List[float], digits: int = 2) -> dict:
+    """Count, mean and p50/p95/p99 of latency samples in ms, shared by the benchmarks"""
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples), digits) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50), digits),
+        "p95_ms": round(percentile(samples, 95), digits),
+        "p99_ms": round(percentile(samples, 99), digits),
+    }
+
+
+async def get_auth_headers(client: httpx.AsyncClient, username: str, password: str) -> Dict[str, str]:
+    """Register (if needed) and log in the load test user"""
+    await client.post("/auth/register", json={
+        "email": f"{username}@example.com",
+        "username": username,
+        "password": password
+    })
+    response = await client.post("/auth/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def seed_members(client: httpx.AsyncClient, headers: Dict[str, str], count: int) -> None:
+    """Create `count` random members"""
+    semaphore = asyncio.Semaphore(20)
+
+    async def create_one():
+        first_name = random.choice(FIRST_NAMES)
+        last_name = random.choice(LAST_NAMES)
+        member_data = {
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": f"{first_name}.{last_name}.{uuid.uuid4().hex[:8]}@example.com".lower(),
+            "roles": [random.choice(["player", "player", "player", "coach", "parent"])],
+            "team": random.randint(1, 20),
+            "status": random.choice(["active", "active", "active", "inactive"])
+        }
+        async with semaphore:
+            await client.post("/members/", json=member_data, headers=headers)
+
+    await asyncio.gather(*(create_one() for _ in range(count)))
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    concurrency: int,
+    total_requests: int,
+    search_ratio: float
+) -> Dict[str, List[float]]:
+    """Run list/search traffic and collect latencies (ms) per request kind"""
+    latencies: Dict[str, List[float]] = {"list": [], "search": [], "errors": []}
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total_requests):
+        queue.put_nowait("search" if random.random() < search_ratio else "list")
+
+    async def worker():
+        while True:
+            try:
+                kind = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if kind == "list":
+                params = {"limit": 50, "offset": random.randint(0, 10) * 50}
+            else:
+                params = {"q": random.choice(SEARCH_TERMS), "limit": 50}
+            started = time.perf_counter()
+            try:
+                response = await client.get("/members/", params=params, headers=headers)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if not ok:
+                latencies["errors"].append(elapsed_ms)
+            else:
+                latencies[kind].append(elapsed_ms)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def summarize(latencies: Dict[str, List[float]], wall_seconds: float) -> Dict[str, dict]:
+    """Build a latency/throughput summary"""
+    summary = {}
+    completed = 0
+    for kind, samples in latencies.items():
+        if kind == "errors":
+            continue
+        completed += len(samples)
+        summary[kind] = latency_summary(samples)
+    summary["overall"] = {
+        "requests": completed,
+        "errors": len(latencies["errors"]),
+        "seconds": round(wall_seconds, 2),
+        "throughput_rps": round(completed / wall_seconds, 1) if wall_seconds else 0.0,
+    }
+    return summary
+
+
+async def main(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        headers = await get_auth_headers(client, args.username, args.password)
+        if args.seed:
+            print(f"Seeding {args.seed} members...")
+            await seed_members(client, headers, args.seed)
+
+        print(f"Running {args.requests} requests with concurrency {args.concurrency}...")
+        started = time.perf_counter()
+        latencies = await run_load(
+            client, headers, args.concurrency, args.requests, args.search_ratio
+        )
+        summary = summarize(latencies, time.perf_counter() - started)
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Members API")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--username", default="loadtest")
+    parser.add_argument("--password", default="loadtest-pass")
+    parser.add_argument("--seed", type=int, default=0, help="Number of members to create first")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--search-ratio", type=float, default=0.5, help="Share of search requests")
+    parser.add_argument("--output", help="Write the JSON summary to this file")
+    asyncio.run(main(parser.parse_args()))
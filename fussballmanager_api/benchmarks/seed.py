@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Synthetic club data generator.
+
+Fills the configured database (DATABASE_URL) with clubs, users, members (with
+their member_roles rows), events and payments. Data is generated from a fixed
+random seed, so the same scale and seed always produce the same rows.
+
+    alembic upgrade head
+    python benchmarks/seed.py --scale 100k
+    python benchmarks/seed.py --members 25000 --random-seed 7
+
+Rows are written with multi-row INSERTs in batches, bypassing the API, and
+appended to whatever is in the database already.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import func, insert, select, text  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app.db import base  # noqa: E402,F401  registers all models
+from app.models.club_model import Club  # noqa: E402
+from app.models.event_model import Event  # noqa: E402
+from app.models.member_model import Member  # noqa: E402
+from app.models.member_role_model import MemberRole  # noqa: E402
+from app.models.payment_model import Payment  # noqa: E402
+from app.models.user_model import User  # noqa: E402
+from app.repositories.member_repo import bump_version_query  # noqa: E402
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+BATCH_SIZE = 5_000
+# Password of every generated user
+PASSWORD = "benchpass"
+
+MEMBERS_PER_CLUB = 400
+TEAMS_PER_CLUB = 20
+USERS_PER_CLUB = 20
+EVENTS_PER_CLUB = 150
+
+FIRST_NAMES = [
+    "Anna", "Ben", "Clara", "David", "Emma", "Finn", "Greta", "Hannah", "Jonas", "Jörg",
+    "Lena", "Leon", "Lukas", "Marie", "Mia", "Noah", "Paul", "Sophie", "Tim", "Zoë",
+]
+LAST_NAMES = [
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker",
+    "Schulz", "Hoffmann", "Koch", "Richter", "Klein", "Wolf", "Schröder", "Neumann",
+]
+ASCII = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss", "ë": "e"})
+ROLE_MIX = [["player"]] * 14 + [["coach"]] * 2 + [["parent"]] * 3 + [["player", "parent"], ["admin"]]
+EVENT_TYPES = ["training", "training", "training", "match", "event"]
+
+
+def batched(rows: Iterator[dict], size: int = BATCH_SIZE) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def club_rows(rng: random.Random, first_id: int, count: int) -> Iterator[dict]:
+    for club_id in range(first_id, first_id + count):
+        yield {
+            "id": club_id,
+            "name": f"{rng.choice(['FC', 'SV', 'TSV', 'SC'])} {rng.choice(LAST_NAMES)} {club_id}",
+            "address": f"Sportplatzweg {rng.randint(1, 120)}, {rng.randint(10000, 99999)}",
+            "founded_year": rng.randint(1890, 2015),
+        }
+
+
+def user_rows(rng: random.Random, first_id: int, clubs: List[int], hashed_password: str) -> Iterator[dict]:
+    user_id = first_id
+    for club_id in clubs:
+        for _ in range(USERS_PER_CLUB):
+            yield {
+                "id": user_id,
+                "email": f"user{user_id}@club{club_id}.example.com",
+                "username": f"user{user_id}",
+                "hashed_password": hashed_password,
+                "is_active": rng.random() > 0.02,
+                "club_id": club_id,
+            }
+            user_id += 1
+
+
+def member_rows(rng: random.Random, count: int, clubs: List[int], now: datetime) -> Iterator[dict]:
+    for i in range(count):
+        club_id = clubs[i % len(clubs)]
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        local = f"{first_name}.{last_name}".lower().translate(ASCII)
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "first_name": first_name,
+            "last_name": last_name,
+            # Parents and some youth players have no email of their own
+            "email": f"{local}.{rng.getrandbits(32):08x}@club{club_id}.example.com" if rng.random() < 0.85 else None,
+            "birthdate": date(2019, 12, 31) - timedelta(days=rng.randint(0, 70 * 365)),
+            "roles": rng.choice(ROLE_MIX),
+            "team": club_id * 100 + rng.randint(1, TEAMS_PER_CLUB),
+            "status": "active" if rng.random() < 0.9 else "inactive",
+            "notes": "Imported from the previous club system" if rng.random() < 0.1 else None,
+            "created_at": now - timedelta(seconds=rng.randint(0, 3 * 365 * 86400)),
+        }
+
+
+def event_rows(rng: random.Random, clubs: List[int], creators: Dict[int, List[int]], now: datetime) -> Iterator[dict]:
+    for club_id in clubs:
+        for _ in range(EVENTS_PER_CLUB):
+            start = now + timedelta(hours=rng.randint(-180 * 24, 180 * 24))
+            kind = rng.choice(EVENT_TYPES)
+            yield {
+                "club_id": club_id,
+                "type": kind,
+                "title": f"{kind.title()} {start:%d.%m.}",
+                "start_time": start.replace(tzinfo=None),
+                "end_time": (start + timedelta(minutes=rng.choice([90, 120, 180]))).replace(tzinfo=None),
+                "location": rng.choice(["Hauptplatz", "Kunstrasen", "Halle", "Auswärts"]),
+                "created_by": rng.choice(creators[club_id]),
+            }
+
+
+def payment_rows(rng: random.Random, member_ids: List[str], today: date) -> Iterator[dict]:
+    for member_id in member_ids:
+        # Quarterly fees for the last year
+        for quarter in range(rng.randint(1, 4)):
+            due = today - timedelta(days=90 * quarter)
+            paid = rng.random() < 0.85
+            yield {
+                "member_id": member_id,
+                "amount": rng.choice([15.0, 25.0, 40.0]),
+                "status": "paid" if paid else "unpaid",
+                "due_date": due,
+                "payment_date": due + timedelta(days=rng.randint(0, 20)) if paid else None,
+            }
+
+
+def seed(engine: Engine, members: int, random_seed: int = 42, hashed_password: str = None) -> Dict[str, int]:
+    """Generate and insert `members` members plus proportional clubs, users, events and payments"""
+    rng = random.Random(random_seed)
+    now = datetime(2026, 7, 1, tzinfo=timezone.utc)
+    if hashed_password is None:
+        from app.core.security import hash_password
+        hashed_password = hash_password(PASSWORD)
+
+    counts = dict.fromkeys(["clubs", "users", "members", "member_roles", "events", "payments"], 0)
+    with engine.begin() as conn:
+        first_club = (conn.scalar(select(func.max(Club.id))) or 0) + 1
+        first_user = (conn.scalar(select(func.max(User.id))) or 0) + 1
+        clubs = list(range(first_club, first_club + max(1, members // MEMBERS_PER_CLUB)))
+
+        for batch in batched(club_rows(rng, first_club, len(clubs))):
+            conn.execute(insert(Club), batch)
+            counts["clubs"] += len(batch)
+
+        creators: Dict[int, List[int]] = {}
+        for batch in batched(user_rows(rng, first_user, clubs, hashed_password)):
+            conn.execute(insert(User), batch)
+            counts["users"] += len(batch)
+            for row in batch:
+                creators.setdefault(row["club_id"], []).append(row["id"])
+
+        member_ids: List[str] = []
+        for batch in batched(member_rows(rng, members, clubs, now)):
+            conn.execute(insert(Member), batch)
+            roles = [{"member_id": row["id"], "role": role} for row in batch for role in row["roles"]]
+            conn.execute(insert(MemberRole), roles)
+            member_ids.extend(row["id"] for row in batch)
+            counts["members"] += len(batch)
+            counts["member_roles"] += len(roles)
+
+        for batch in batched(event_rows(rng, clubs, creators, now)):
+            conn.execute(insert(Event), batch)
+            counts["events"] += len(batch)
+
+        for batch in batched(payment_rows(rng, member_ids, now.date())):
+            conn.execute(insert(Payment), batch)
+            counts["payments"] += len(batch)
+
+        # Cached responses and ETags from before the seed are no longer valid
+        conn.execute(bump_version_query())
+
+    # Fresh planner statistics, as a production database would have
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    return counts
+
+
+def main(args: argparse.Namespace) -> None:
+    from app.db.database import engine
+
+    members = args.members if args.members is not None else SCALES[args.scale]
+    started = time.perf_counter()
+    counts = seed(engine, members, args.random_seed)
+    print(json.dumps({**counts, "seconds": round(time.perf_counter() - started, 1)}, indent=2))
+    print(f"Users log in as userN / {PASSWORD}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic club data")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k", help="Number of members")
+    parser.add_argument("--members", type=int, help="Exact number of members, overrides --scale")
+    parser.add_argument("--random-seed", type=int, default=42)
+    main(parser.parse_args())
@@ -0,0 +1,157 @@
+"""
+Micro-benchmarks for MemberRepository (pytest-benchmark).
+
+Runs every repository call against a seeded SQLite file with the production
+connection profile. Not part of the test suite; run explicitly:
+
+    pytest benchmarks/test_member_repository.py --benchmark-autosave
+    pytest benchmarks/test_member_repository.py --benchmark-compare --benchmark-compare-fail=median:15%
+
+BENCH_MEMBERS sets the number of seeded members (default 10000). Saved runs live
+in .benchmarks/, --benchmark-compare fails on a regression against the last one.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.database import get_settings, make_engine  # noqa: E402
+from app.models.member_model import Member  # noqa: E402
+from app.repositories.member_repo import MemberRepository, count_cache  # noqa: E402
+from app.schemas.member_schema import MemberBatchUpdate, MemberCreate, MemberFilter, MemberUpdate  # noqa: E402
+from seed import seed  # noqa: E402
+
+BENCH_MEMBERS = int(os.environ.get("BENCH_MEMBERS", "10000"))
+
+
+@pytest.fixture(scope="module")
+def bench_engine(tmp_path_factory):
+    url = f"sqlite:///{tmp_path_factory.mktemp('bench') / 'bench.db'}"
+    engine = make_engine(url, get_settings())
+    Base.metadata.create_all(bind=engine)
+    # A fixed hash: bcrypt cost is not what is measured here
+    seed(engine, BENCH_MEMBERS, hashed_password="x")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def sample(bench_engine):
+    """Ids and emails of seeded members, picked at random by the benchmarks"""
+    with Session(bench_engine) as db:
+        rows = db.execute(select(Member.id, Member.email).where(Member.email.is_not(None))).all()
+    rng = random.Random(1)
+    return [rng.choice(rows) for _ in range(1000)]
+
+
+@pytest.fixture
+def repo(bench_engine):
+    with Session(bench_engine, autoflush=False) as db:
+        yield MemberRepository(db)
+
+
+@pytest.fixture
+def picks(sample):
+    """Cycles through the sample so every round reads a different member"""
+    return iter(sample * 1000)
+
+
+def uncached(repo, filters, **kwargs):
+    """list_members including the count query, as on the first page view"""
+    count_cache.clear()
+    return repo.list_members(filters, **kwargs)
+
+
+def test_get_by_id(benchmark, repo, picks):
+    benchmark(lambda: repo.get_by_id(next(picks).id))
+
+
+def test_get_by_email(benchmark, repo, picks):
+    benchmark(lambda: repo.get_by_email(next(picks).email.upper()))
+
+
+def test_check_email_exists(benchmark, repo, picks):
+    benchmark(lambda: repo.check_email_exists(next(picks).email))
+
+
+def test_list_first_page_with_total(benchmark, repo):
+    benchmark(uncached, repo, MemberFilter())
+
+
+def test_list_first_page_cached_total(benchmark, repo):
+    benchmark(repo.list_members, MemberFilter())
+
+
+def test_list_first_page_as_rows(benchmark, repo):
+    benchmark(repo.list_members, MemberFilter(), as_rows=True)
+
+
+def test_list_deep_offset(benchmark, repo):
+    benchmark(repo.list_members, MemberFilter(offset=BENCH_MEMBERS // 2, include_total=False))
+
+
+def test_list_cursor_page(benchmark, repo):
+    _, _, cursor = repo.list_members(MemberFilter(include_total=False))
+    for _ in range(10):
+        _, _, cursor = repo.list_members(MemberFilter(cursor=cursor, include_total=False))
+    benchmark(repo.list_members, MemberFilter(cursor=cursor, include_total=False))
+
+
+def test_list_by_role_and_status(benchmark, repo):
+    benchmark(uncached, repo, MemberFilter(role="coach", status="active"))
+
+
+def test_list_by_team(benchmark, repo):
+    benchmark(uncached, repo, MemberFilter(team=105))
+
+
+def test_search_prefix(benchmark, repo):
+    benchmark(uncached, repo, MemberFilter(q="mül"))
+
+
+def test_search_two_terms(benchmark, repo):
+    benchmark(uncached, repo, MemberFilter(q="anna schmidt"))
+
+
+def test_iter_export(benchmark, repo):
+    benchmark(lambda: sum(len(batch) for batch in repo.iter_export(MemberFilter(), 1000)))
+
+
+def test_update_member(benchmark, repo, picks):
+    def update():
+        member = repo.get_by_id(next(picks).id)
+        repo.update_member(member, MemberUpdate(notes="benchmark"))
+
+    benchmark(update)
+
+
+def test_batch_update_100(benchmark, repo, sample):
+    ids = [row.id for row in sample[:100]]
+    benchmark(repo.batch_update, MemberBatchUpdate(ids=ids, update=MemberUpdate(team=1)))
+
+
+def test_bulk_create_500(benchmark, repo):
+    counter = iter(range(10**9))
+
+    def create():
+        n = next(counter)
+        repo.bulk_create([
+            MemberCreate(
+                first_name="Bench", last_name="Member",
+                email=f"bench.{n}.{i}@example.com", roles=["player"], team=1,
+            )
+            for i in range(500)
+        ])
+
+    benchmark(create)
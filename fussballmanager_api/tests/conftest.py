@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+# Add the fussballmanager_api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db.base import Base
+from app.db.database import engine
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_schema():
+    """The app no longer creates tables on import; tests create them once per session"""
+    Base.metadata.create_all(bind=engine)
+    yield
+
+
+@pytest.fixture(scope="session")
+def link_admin():
+    """
+    Make a registered account an admin, as `python -m app.cli make-admin` does.
+    Self-registered accounts have no role
+    """
+    from app.cli import make_admin
+    from app.db.database import SessionLocal
+
+    def link(username: str) -> None:
+        with SessionLocal() as db:
+            make_admin(db, username)
+
+    return link
@@ -0,0 +1,123 @@
+import pytest
+import sys
+import os
+import uuid
+from fastapi.testclient import TestClient
+
+# Add the fussballmanager_api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.main import app
+from app.db.database import SessionLocal
+from app.models.user_model import User
+from app.routes.auth import principal_cache
+from app.core.security import get_pwd_context, password_hasher, get_settings
+
+# Test client
+client = TestClient(app)
+
+
+@pytest.fixture
+def new_user():
+    """Register a fresh user and return (username, auth headers)"""
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "testpass"
+    response = client.post("/auth/register", json={
+        "email": f"{username}@example.com",
+        "username": username,
+        "password": password
+    })
+    assert response.status_code == 200
+    
+    response = client.post("/auth/login", data={"username": username, "password": password})
+    assert response.status_code == 200
+    return username, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class TestPrincipalCache:
+    """Test caching of resolved users in get_current_user"""
+    
+    def test_cache_hit(self, new_user):
+        """Test repeated requests are served from the cache"""
+        username, headers = new_user
+        
+        response = client.get("/auth/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["username"] == username
+        
+        hits = principal_cache.hits
+        response = client.get("/auth/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["username"] == username
+        assert principal_cache.hits == hits + 1
+    
+    def test_deactivated_user_is_rejected(self, new_user):
+        """Test deactivating a user invalidates the cached principal"""
+        username, headers = new_user
+        
+        assert client.get("/auth/me", headers=headers).status_code == 200
+        assert principal_cache.get(username) is not None
+        
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.username == username).first()
+            user.is_active = False
+            db.commit()
+        finally:
+            db.close()
+        
+        assert principal_cache.get(username) is None
+        response = client.get("/auth/me", headers=headers)
+        assert response.status_code == 401
+
+
+
+class TestPasswordHashing:
+    """Test password hashing in the worker pool"""
+    
+    def test_login_rehashes_outdated_hash(self):
+        """Test a hash with another bcrypt cost is replaced on login"""
+        username = f"user_{uuid.uuid4().hex[:8]}"
+        db = SessionLocal()
+        try:
+            db.add(User(
+                email=f"{username}@example.com",
+                username=username,
+                hashed_password=get_pwd_context().handler().using(rounds=4).hash("testpass")
+            ))
+            db.commit()
+        finally:
+            db.close()
+        
+        response = client.post("/auth/login", data={"username": username, "password": "testpass"})
+        assert response.status_code == 200
+        
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.username == username).first()
+            assert get_pwd_context().handler().from_string(user.hashed_password).rounds == get_settings().bcrypt_rounds
+        finally:
+            db.close()
+        
+        # The new hash still verifies
+        response = client.post("/auth/login", data={"username": username, "password": "testpass"})
+        assert response.status_code == 200
+    
+    def test_wrong_password(self, new_user):
+        """Test a wrong password is rejected"""
+        username, _ = new_user
+        response = client.post("/auth/login", data={"username": username, "password": "wrong"})
+        assert response.status_code == 401
+    
+    def test_busy_hasher_fails_fast(self, new_user, monkeypatch):
+        """Test logins are rejected with 503 when the hash queue is full"""
+        username, _ = new_user
+        monkeypatch.setattr(password_hasher, "max_pending", 0)
+        
+        response = client.post("/auth/login", data={"username": username, "password": "testpass"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
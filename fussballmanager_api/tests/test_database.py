@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import uuid
+
+from sqlalchemy import Column, MetaData, Table, create_engine, insert, select
+
+# Add the fussballmanager_api directory to the Python path
+API_DIR = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, API_DIR)
+
+from app.db.database import Settings, make_engine
+from app.db.types import UUIDKey
+
+
+def alembic(database: str, *args: str) -> None:
+    """Run the alembic CLI against a database file, as a deployment would"""
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+    subprocess.run([sys.executable, "-m", "alembic", *args], cwd=API_DIR, env=env, check=True, capture_output=True)
+
+
+class TestSqliteProfile:
+    """Pragmas run on every new connection of an SQLite engine"""
+
+    def test_pragmas_on_each_connection(self, tmp_path):
+        settings = Settings(SQLITE_SYNCHRONOUS="FULL", SQLITE_CACHE_SIZE_KIB=2048)
+        engine = make_engine(f"sqlite:///{tmp_path / 'profile.db'}", settings)
+        # Two connections held at once: both are new DBAPI connections
+        with engine.connect() as first, engine.connect() as second:
+            for conn in (first, second):
+                assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+                assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 2  # FULL
+                assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+                assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == -2048
+                assert conn.exec_driver_sql("PRAGMA mmap_size").scalar() == 256 * 1024 * 1024
+        engine.dispose()
+
+    def test_memory_database_keeps_its_journal(self):
+        engine = make_engine("sqlite://", Settings())
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "memory"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+
+
+class TestUUIDKey:
+    """Member ids are 16 bytes on SQLite and canonical strings in the application"""
+
+    def test_round_trip(self):
+        engine = create_engine("sqlite://")
+        keys = Table("keys", MetaData(), Column("id", UUIDKey, primary_key=True))
+        keys.create(engine)
+        generated = uuid.uuid4()
+        with engine.begin() as conn:
+            conn.execute(insert(keys), [{"id": str(generated).upper()}, {"id": uuid.UUID(int=1)}])
+
+            stored = conn.exec_driver_sql("SELECT typeof(id), length(id) FROM keys").all()
+            assert stored == [("blob", 16), ("blob", 16)]
+            assert conn.execute(select(keys.c.id).where(keys.c.id == str(generated))).scalar() == str(generated)
+            # Any spelling finds the row, malformed ids find nothing instead of failing
+            assert conn.execute(select(keys.c.id).where(keys.c.id == generated.hex)).scalar() == str(generated)
+            assert conn.execute(select(keys.c.id).where(keys.c.id == "not-a-uuid")).first() is None
+            # Bytes sort like the strings
+            ordered = conn.execute(select(keys.c.id).order_by(keys.c.id)).scalars().all()
+            assert ordered == sorted([str(generated), str(uuid.UUID(int=1))])
+
+
+class TestModels:
+    """Scripts and workers can use any model without importing app.db.base first"""
+
+    def test_models_register_themselves(self, tmp_path):
+        script = "\n".join([
+            "from app.db.database import Base, SessionLocal, engine",
+            "from app.repositories.member_repo import MemberRepository",
+            "from app.schemas.member_schema import MemberCreate",
+            "Base.metadata.create_all(engine)",
+            "with SessionLocal() as db:",
+            "    MemberRepository(db).create_member(MemberCreate(first_name='Stand', last_name='Alone'))",
+            "    from app.models.user_model import User",
+            "    print(db.query(User).join(User.club).count())",
+        ])
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'standalone.db'}", "PYTHONPATH": API_DIR}
+        result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "0"
+
+
+class TestIdMigration:
+    """e8c2a6f4b195 converts member ids and their references without losing rows"""
+
+    def test_upgrade_and_downgrade_keep_ids(self, tmp_path):
+        database = str(tmp_path / "migrate.db")
+        alembic(database, "upgrade", "d5b3f8a1c627")
+        ids = [str(uuid.uuid4()) for _ in range(3)]
+        with sqlite3.connect(database) as conn:
+            conn.executemany(
+                "INSERT INTO members (id, first_name, last_name, roles, status, created_at) "
+                "VALUES (?, ?, 'Migrated', '[]', 'active', CURRENT_TIMESTAMP)",
+                [(member_id, name) for member_id, name in zip(ids, ("Ida", "Jan", "Kim"))]
+            )
+            conn.executemany("INSERT INTO member_roles (member_id, role) VALUES (?, 'player')", [(i,) for i in ids])
+            conn.execute("INSERT INTO payments (member_id, amount, due_date) VALUES (?, 10, '2026-01-01')", (ids[1],))
+        conn.close()
+
+        alembic(database, "upgrade", "e8c2a6f4b195")
+        with sqlite3.connect(database) as conn:
+            stored = conn.execute("SELECT id, typeof(id) FROM members ORDER BY first_name").fetchall()
+            assert stored == [(uuid.UUID(member_id).bytes, "blob") for member_id in ids]
+            assert conn.execute(
+                "SELECT count(*) FROM member_roles JOIN members ON members.id = member_roles.member_id"
+            ).fetchone() == (3,)
+            assert conn.execute(
+                "SELECT first_name FROM payments JOIN members ON members.id = payments.member_id"
+            ).fetchall() == [("Jan",)]
+            # The search index refers to members by rowid, which the copy kept
+            assert conn.execute(
+                "SELECT members.id FROM members_fts JOIN members ON members.rowid = members_fts.rowid "
+                "WHERE members_fts MATCH 'kim'"
+            ).fetchall() == [(uuid.UUID(ids[2]).bytes,)]
+        conn.close()
+
+        alembic(database, "downgrade", "d5b3f8a1c627")
+        with sqlite3.connect(database) as conn:
+            assert conn.execute("SELECT id FROM members ORDER BY first_name").fetchall() == [(i,) for i in ids]
+            assert conn.execute("SELECT member_id FROM payments").fetchall() == [(ids[1],)]
+        conn.close()
@@ -12,6 +12,7 @@ from app.db.database import get_db
 from app.models.member_model import Member
 from sqlalchemy.orm import Session
 import uuid
+from datetime import timedelta
 
 # Test client
 client = TestClient(app)
@@ -28,8 +29,8 @@ def get_test_db():
 
 
 @pytest.fixture
-def auth_token():
-    """Get authentication token for testing"""
+def auth_token(link_admin):
+    """Get authentication token of an admin account for testing"""
     # Try to register a test user (might already exist)
     register_data = {
         "email": "test@example.com",
@@ -38,7 +39,8 @@ def auth_token():
     }
     response = client.post("/auth/register", json=register_data)
     # Don't assert status code - user might already exist
-    
+    link_admin("testuser")
+
     # Login to get token
     login_data = {
         "username": "testuser",
@@ -139,6 +141,88 @@ class TestMembersAPI:
         data = response.json()
         assert data["status"] == "inactive"
     
+    def test_update_and_delete_statement_count(self, auth_headers):
+        """PATCH and DELETE load the member once and write it with one statement, then bump the version"""
+        from sqlalchemy import event
+        from app.db.database import async_engine
+        member_id = self.test_create_member(auth_headers)
+        # Resolves the caller into the principal cache before counting
+        client.get(f"/members/{member_id}", headers=auth_headers)
+        
+        statements = []
+        
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+        
+        def count(method, url, **kwargs):
+            statements.clear()
+            event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+            try:
+                response = client.request(method, url, headers=auth_headers, **kwargs)
+            finally:
+                event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+            # The version bump locks the shared counter row, so it runs right before COMMIT
+            assert "table_versions" in statements[-1]
+            return response, [statement.split()[0].upper() for statement in statements]
+        
+        response, executed = count("PATCH", f"/members/{member_id}", json={"team": 7, "notes": "x"})
+        assert response.status_code == 200
+        assert response.json()["updated_at"] is not None
+        # Member row and the members version stamp
+        assert executed == ["SELECT", "UPDATE", "UPDATE"]
+        
+        # A new email adds no uniqueness check, the unique index enforces it
+        response, executed = count(
+            "PATCH", f"/members/{member_id}", json={"email": f"{uuid.uuid4().hex[:12]}@example.com"}
+        )
+        assert response.status_code == 200
+        assert executed == ["SELECT", "UPDATE", "UPDATE"]
+        
+        response, executed = count("DELETE", f"/members/{member_id}")
+        assert response.status_code == 204
+        assert executed == ["SELECT", "UPDATE", "UPDATE"]
+    
+    def test_conditional_get(self, auth_headers):
+        """ETag / If-None-Match on member reads"""
+        from sqlalchemy import event
+        from app.db.database import async_engine
+        member_id = self.test_create_member(auth_headers)
+        
+        response = client.get(f"/members/{member_id}", headers=auth_headers)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        
+        statements = []
+        
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+        
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            response = client.get(f"/members/{member_id}", headers={**auth_headers, "If-None-Match": etag})
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        # Only the version stamp was read
+        assert len(statements) == 1 and "table_versions" in statements[0]
+        
+        # Lists have their own tag per query string
+        response = client.get("/members/?limit=5", headers=auth_headers)
+        list_etag = response.headers["etag"]
+        assert list_etag != etag
+        response = client.get("/members/?limit=5", headers={**auth_headers, "If-None-Match": list_etag})
+        assert response.status_code == 304
+        
+        # Any write changes the tags
+        client.patch(f"/members/{member_id}", json={"notes": "changed"}, headers=auth_headers)
+        response = client.get(f"/members/{member_id}", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["notes"] == "changed"
+        assert response.headers["etag"] != etag
+        response = client.get("/members/?limit=5", headers={**auth_headers, "If-None-Match": list_etag})
+        assert response.status_code == 200
+    
     def test_list_members(self, auth_headers):
         """Test listing members with filters"""
         import uuid
@@ -194,6 +278,521 @@ class TestMembersAPI:
         for member in data["members"]:
             assert member["status"] == "active"
     
+    def test_list_members_cursor_pagination(self, auth_headers):
+        """Test walking a filtered list with next_cursor"""
+        team = 100000 + int(uuid.uuid4().int % 100000)
+        created_ids = set()
+        for i in range(5):
+            member_data = {
+                "first_name": f"Page{i}",
+                "last_name": "Walker",
+                "roles": ["player"],
+                "team": team,
+                "status": "active"
+            }
+            response = client.post("/members/", json=member_data, headers=auth_headers)
+            assert response.status_code == 201
+            created_ids.add(response.json()["id"])
+        
+        response = client.get(f"/members/?team={team}&limit=2", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 5
+        seen_ids = [member["id"] for member in data["members"]]
+        
+        while data["next_cursor"]:
+            response = client.get(
+                f"/members/?team={team}&limit=2&include_total=false&cursor={data['next_cursor']}",
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] is None
+            seen_ids.extend(member["id"] for member in data["members"])
+        
+        assert len(seen_ids) == len(set(seen_ids))
+        assert set(seen_ids) == created_ids
+        
+        # Invalid cursor
+        response = client.get("/members/?cursor=not-a-cursor", headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_list_fast_path_matches_response_model(self, auth_headers):
+        """Column-tuple JSON is byte-identical to MemberListResponse serialization"""
+        from app.db.database import SessionLocal
+        from app.repositories.member_repo import MemberRepository
+        from app.schemas.member_schema import MemberFilter, MemberListResponse
+        from app.core.serialization import member_list_json
+        team = 100000 + int(uuid.uuid4().int % 100000)
+        client.post("/members/", json={
+            "first_name": "Jörg", "last_name": "Fast", "email": f"{uuid.uuid4().hex[:8]}@example.com",
+            "birthdate": "2012-03-04", "roles": ["player", "parent"], "team": team, "notes": "a \"quoted\"\nnote"
+        }, headers=auth_headers)
+        client.post("/members/", json={"first_name": "Bare", "last_name": "Fast", "team": team}, headers=auth_headers)
+        
+        filters = MemberFilter(team=team, limit=1)
+        with SessionLocal() as db:
+            repo = MemberRepository(db)
+            members, total, cursor = repo.list_members(filters)
+            rows, rows_total, rows_cursor = repo.list_members(filters, as_rows=True)
+            expected = MemberListResponse(
+                members=members, total=total, limit=1, offset=0, next_cursor=cursor
+            ).model_dump_json().encode()
+            assert member_list_json(rows, rows_total, 1, 0, rows_cursor) == expected
+            assert rows_cursor is not None
+            
+            rows, _, _ = repo.list_members(MemberFilter(team=team, cursor=rows_cursor), as_rows=True)
+            members, _, _ = repo.list_members(MemberFilter(team=team, cursor=cursor))
+            assert member_list_json(rows, None, 50, 0, None) == MemberListResponse(
+                members=members, limit=50, offset=0
+            ).model_dump_json().encode()
+    
+    def test_sparse_fields(self, auth_headers):
+        """fields= selects the returned columns; list pages leave notes out by default"""
+        from sqlalchemy import event
+        from app.db.database import async_engine
+        team = 100000 + int(uuid.uuid4().int % 100000)
+        for name in ("Lena", "Mia", "Nele"):
+            response = client.post("/members/", json={
+                "first_name": name, "last_name": "Sparse", "team": team, "notes": "long text"
+            }, headers=auth_headers)
+        member_id = response.json()["id"]
+        
+        response = client.get(f"/members/?team={team}", headers=auth_headers)
+        member = response.json()["members"][0]
+        assert "notes" not in member and member["first_name"] == "Nele"
+        
+        selects = []
+        
+        def record(conn, cursor, statement, *args):
+            if "FROM members" in statement and "count(" not in statement:
+                selects.append(statement)
+        
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            response = client.get(f"/members/?team={team}&limit=2&fields=first_name,team", headers=auth_headers)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+        data = response.json()
+        assert data["members"] == [
+            {"first_name": "Nele", "id": member_id, "team": team},
+            {"first_name": "Mia", "id": data["members"][1]["id"], "team": team},
+        ]
+        assert "notes" not in selects[0] and "last_name" not in selects[0]
+        
+        # The cursor keys are read even when not requested
+        response = client.get(
+            f"/members/?team={team}&fields=first_name&cursor={data['next_cursor']}", headers=auth_headers
+        )
+        assert [member["first_name"] for member in response.json()["members"]] == ["Lena"]
+        
+        response = client.get(f"/members/{member_id}?fields=notes,created_at", headers=auth_headers)
+        assert set(response.json()) == {"id", "notes", "created_at"}
+        assert response.json()["notes"] == "long text"
+        assert client.get(f"/members/{member_id}", headers=auth_headers).json()["notes"] == "long text"
+        
+        response = client.get("/members/?fields=first_name,password", headers=auth_headers)
+        assert response.status_code == 400
+        assert "password" in response.json()["detail"]
+    
+    def test_lookup(self, auth_headers):
+        """POST /members/lookup returns members in request order with one query"""
+        from sqlalchemy import event
+        from app.db.database import async_engine
+        ids = [self.test_create_member(auth_headers) for _ in range(3)]
+        missing = str(uuid.uuid4())
+        requested = [ids[2], missing, ids[0].upper(), ids[2], "not-a-uuid", ids[1]]
+        
+        statements = []
+        
+        def record(conn, cursor, statement, *args):
+            if "FROM members" in statement:
+                statements.append(statement)
+        
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            response = client.post("/members/lookup", json={"ids": requested}, headers=auth_headers)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+        assert response.status_code == 200
+        data = response.json()
+        assert [member["id"] for member in data["members"]] == [ids[2], ids[0], ids[1]]
+        assert data["missing"] == [missing, "not-a-uuid"]
+        assert data["members"][1] == client.get(f"/members/{ids[0]}", headers=auth_headers).json()
+        assert len(statements) == 1
+        
+        response = client.post(
+            "/members/lookup", json={"ids": ids[:1], "fields": ["first_name"]}, headers=auth_headers
+        )
+        assert response.json()["members"] == [{"first_name": "John", "id": ids[0]}]
+        
+        response = client.post("/members/lookup", json={"ids": [missing] * 501}, headers=auth_headers)
+        assert response.status_code == 422
+        response = client.post("/members/lookup", json={"ids": ids, "fields": ["secret"]}, headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_facets(self, auth_headers):
+        """GET /members/facets counts once, then follows writes without recounting"""
+        from sqlalchemy import event
+        from app.db.database import async_engine
+        team = 300000 + int(uuid.uuid4().int % 100000)
+        ids = []
+        for roles in (["player"], ["player", "parent"], ["coach"]):
+            response = client.post("/members/", json={
+                "first_name": "Facet", "last_name": "Count", "roles": roles, "team": team
+            }, headers=auth_headers)
+            ids.append(response.json()["id"])
+        
+        statements = []
+        
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+        
+        def facets(url):
+            statements.clear()
+            event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+            try:
+                response = client.get(url, headers=auth_headers)
+            finally:
+                event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+            assert response.status_code == 200
+            return response.json(), any("GROUP BY" in statement for statement in statements)
+        
+        data, counted = facets(f"/members/facets?team={team}")
+        assert counted
+        assert data["total"] == 3
+        assert data["team"] == [{"value": team, "count": 3}]
+        assert data["status"] == [{"value": "active", "count": 3}]
+        assert data["role"] == [
+            {"value": "player", "count": 2}, {"value": "coach", "count": 1}, {"value": "parent", "count": 1}
+        ]
+        assert client.get(f"/members/?team={team}", headers=auth_headers).json()["total"] == 3
+        facets(f"/members/facets?team={team}&q=facet")
+        
+        # Create, update and delete adjust the cached counts in place
+        response = client.post("/members/", json={
+            "first_name": "Facet", "last_name": "Late", "roles": ["player"], "team": team
+        }, headers=auth_headers)
+        client.patch(f"/members/{ids[2]}", json={"roles": ["coach", "player"]}, headers=auth_headers)
+        client.patch(f"/members/{ids[1]}", json={"team": team + 1}, headers=auth_headers)
+        client.delete(f"/members/{ids[0]}", headers=auth_headers)
+        client.patch("/members/batch", json={
+            "patches": [{"id": response.json()["id"], "roles": ["parent"]}]
+        }, headers=auth_headers)
+        
+        data, counted = facets(f"/members/facets?team={team}")
+        assert not counted
+        assert data["total"] == 3
+        assert data["status"] == [{"value": "active", "count": 2}, {"value": "inactive", "count": 1}]
+        assert data["role"] == [
+            {"value": "player", "count": 2}, {"value": "coach", "count": 1}, {"value": "parent", "count": 1}
+        ]
+        data, counted = facets(f"/members/facets?team={team}&status=active")
+        assert counted and data["total"] == 2
+        
+        # Whether a write matches a search cannot be told without the database
+        data, counted = facets(f"/members/facets?team={team}&q=facet")
+        assert counted and data["total"] == 3
+    
+    def test_cached_counts_follow_other_workers(self, auth_headers):
+        """Totals and facets cached by this process are not served for a version another worker wrote"""
+        from sqlalchemy import insert, update
+        from app.db.database import SessionLocal
+        from app.models.table_version_model import TableVersion
+        team = 360000 + int(uuid.uuid4().int % 100000)
+        client.post("/members/", json={"first_name": "Here", "last_name": "Worker", "team": team}, headers=auth_headers)
+        assert client.get(f"/members/?team={team}", headers=auth_headers).json()["total"] == 1
+        assert client.get(f"/members/facets?team={team}", headers=auth_headers).json()["total"] == 1
+        
+        # A write of another process: it bumps the version but cannot touch our caches
+        with SessionLocal() as db:
+            db.execute(insert(Member).values(first_name="Other", last_name="Worker", roles=[], team=team))
+            db.execute(update(TableVersion).where(TableVersion.name == "members").values(version=TableVersion.version + 1))
+            db.commit()
+        
+        assert client.get(f"/members/?team={team}", headers=auth_headers).json()["total"] == 2
+        assert client.get(f"/members/facets?team={team}", headers=auth_headers).json()["total"] == 2
+    
+    def test_facets_follow_renames(self, auth_headers):
+        """A rename leaves the counted rows as they were but changes what a search finds"""
+        team = 350000 + int(uuid.uuid4().int % 100000)
+        response = client.post("/members/", json={
+            "first_name": "Bob", "last_name": "Rename", "roles": ["player"], "team": team
+        }, headers=auth_headers)
+        member_id = response.json()["id"]
+        assert client.get(f"/members/facets?team={team}&q=bob", headers=auth_headers).json()["total"] == 1
+        assert client.get(f"/members/facets?team={team}&q=zed", headers=auth_headers).json()["total"] == 0
+        
+        client.patch(f"/members/{member_id}", json={"first_name": "Zed"}, headers=auth_headers)
+        assert client.get(f"/members/facets?team={team}&q=bob", headers=auth_headers).json()["total"] == 0
+        assert client.get(f"/members/facets?team={team}&q=zed", headers=auth_headers).json()["total"] == 1
+        
+        client.patch("/members/batch", json={"ids": [member_id], "update": {"first_name": "Bob"}}, headers=auth_headers)
+        assert client.get(f"/members/facets?team={team}&q=zed", headers=auth_headers).json()["total"] == 0
+    
+    def test_filter_by_age_group(self, auth_headers):
+        """age_group selects members by birthdate relative to the season cutoff"""
+        from app.core.age_groups import current_cutoff
+        cutoff = current_cutoff()
+        team = 400000 + int(uuid.uuid4().int % 100000)
+        born = {
+            "U9": cutoff.replace(year=cutoff.year - 7),
+            "U15": cutoff.replace(year=cutoff.year - 15),
+            "U16": cutoff.replace(year=cutoff.year - 15) - timedelta(days=1),
+            "senior": cutoff.replace(year=cutoff.year - 40),
+        }
+        ids = {}
+        for group, birthdate in born.items():
+            response = client.post("/members/", json={
+                "first_name": group, "last_name": "Age", "birthdate": birthdate.isoformat(), "team": team
+            }, headers=auth_headers)
+            ids[group] = response.json()["id"]
+        client.post("/members/", json={"first_name": "No", "last_name": "Birthdate", "team": team}, headers=auth_headers)
+        
+        for group in born:
+            response = client.get(f"/members/?team={team}&age_group={group}", headers=auth_headers)
+            assert response.status_code == 200
+            assert [m["id"] for m in response.json()["members"]] == [ids[group]]
+            assert response.json()["total"] == 1
+        response = client.get(f"/members/?team={team}&age_group=U12", headers=auth_headers)
+        assert response.json()["total"] == 0
+        assert client.get("/members/?age_group=U20", headers=auth_headers).status_code == 422
+        for url in ("/members/", "/members/facets", "/members/export"):
+            assert client.get(f"{url}?role=bogus", headers=auth_headers).status_code == 422
+            assert client.get(f"{url}?status=bogus", headers=auth_headers).status_code == 422
+        
+        # Cached facets of an age group follow a changed birthdate
+        response = client.get(f"/members/facets?team={team}&age_group=U15", headers=auth_headers)
+        assert response.json()["total"] == 1
+        client.patch(f"/members/{ids['U16']}", json={"birthdate": born["U15"].isoformat()}, headers=auth_headers)
+        response = client.get(f"/members/facets?team={team}&age_group=U15", headers=auth_headers)
+        assert response.json()["total"] == 2
+    
+    def test_filter_by_role(self, auth_headers):
+        """Test the role filter follows role changes"""
+        team = 100000 + int(uuid.uuid4().int % 100000)
+        member_data = {
+            "first_name": "Rolf",
+            "last_name": "Roles",
+            "roles": ["coach", "parent"],
+            "team": team,
+            "status": "active"
+        }
+        response = client.post("/members/", json=member_data, headers=auth_headers)
+        assert response.status_code == 201
+        member_id = response.json()["id"]
+        assert response.json()["roles"] == ["coach", "parent"]
+        
+        response = client.get(f"/members/?team={team}&role=parent", headers=auth_headers)
+        assert [member["id"] for member in response.json()["members"]] == [member_id]
+        
+        response = client.patch(f"/members/{member_id}", json={"roles": ["player"]}, headers=auth_headers)
+        assert response.json()["roles"] == ["player"]
+        
+        response = client.get(f"/members/?team={team}&role=parent", headers=auth_headers)
+        assert response.json()["members"] == []
+        response = client.get(f"/members/?team={team}&role=player", headers=auth_headers)
+        assert [member["id"] for member in response.json()["members"]] == [member_id]
+    
+    def test_import_members_csv(self, auth_headers):
+        """Test bulk import from CSV with per-row errors"""
+        import json
+        unique_id = str(uuid.uuid4())[:8]
+        team = 100000 + int(uuid.uuid4().int % 100000)
+        
+        # An existing member whose email the import must not reuse
+        existing_email = f"taken.{unique_id}@example.com"
+        client.post("/members/", json={
+            "first_name": "Taken", "last_name": "Email", "email": existing_email
+        }, headers=auth_headers)
+        
+        csv_body = "\n".join([
+            "first_name,last_name,email,roles,team,status,notes",
+            f"Anna,Import,anna.{unique_id}@example.com,player;parent,{team},active,",
+            f'Ben,Import,ben.{unique_id}@example.com,coach,{team},active,"two\nlines"',
+            f"Clara,Import,{existing_email},player,{team},active,",
+            f"Dora,Import,ANNA.{unique_id}@example.com,player,{team},active,",
+            f"Emil,Import,,goalkeeper,{team},active,",
+            f"Finn,Import,,player,{team},,",
+        ])
+        response = client.post(
+            "/members/import",
+            content=csv_body.encode(),
+            headers={**auth_headers, "Content-Type": "text/csv"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        
+        results = [json.loads(line) for line in response.text.splitlines()]
+        errors = {result["line"]: result["errors"] for result in results if result["status"] == "error"}
+        assert set(errors) == {5, 6, 7}
+        assert "Email already exists" in errors[5][0]
+        assert "Duplicate email" in errors[6][0]
+        assert "roles" in errors[7][0]
+        assert results[-1] == {"status": "done", "imported": 3, "failed": 3}
+        
+        response = client.get(
+            f"/members/?team={team}&limit=10&fields=first_name,roles,status,notes", headers=auth_headers
+        )
+        members = {member["first_name"]: member for member in response.json()["members"]}
+        assert set(members) == {"Anna", "Ben", "Finn"}
+        assert members["Anna"]["roles"] == ["player", "parent"]
+        assert members["Ben"]["notes"] == "two\nlines"
+        assert members["Finn"]["status"] == "active"
+        
+        # Roles are indexed for imported members too
+        response = client.get(f"/members/?team={team}&role=parent", headers=auth_headers)
+        assert [member["first_name"] for member in response.json()["members"]] == ["Anna"]
+    
+    def test_import_failed_batch(self, auth_headers, monkeypatch):
+        """A batch the database rejects is reported per row, the next batches still commit"""
+        import json
+        from app.core import member_io
+        from app.repositories.member_repo import AsyncMemberRepository
+        team = 100000 + int(uuid.uuid4().int % 100000)
+        email = f"race.{uuid.uuid4().hex[:8]}@example.com"
+        client.post("/members/", json={"first_name": "Race", "last_name": "Won", "email": email}, headers=auth_headers)
+        
+        # As if another request took the email between the check and the insert
+        async def no_emails_taken(self, emails):
+            return set()
+        
+        monkeypatch.setattr(AsyncMemberRepository, "existing_emails", no_emails_taken)
+        monkeypatch.setattr(member_io, "IMPORT_BATCH_SIZE", 2)
+        body = "\n".join(json.dumps(row) for row in [
+            {"first_name": "Race", "last_name": "Lost", "email": email, "team": team},
+            {"first_name": "Same", "last_name": "Batch", "team": team},
+            {"first_name": "Next", "last_name": "Batch", "team": team},
+        ])
+        response = client.post(
+            "/members/import",
+            content=body.encode(),
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+        )
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [result["errors"] for result in results if result["status"] == "error"] == [
+            ["Insert failed: IntegrityError"], ["Insert failed: IntegrityError"]
+        ]
+        assert results[-1] == {"status": "done", "imported": 1, "failed": 2}
+        response = client.get(f"/members/?team={team}", headers=auth_headers)
+        assert [member["first_name"] for member in response.json()["members"]] == ["Next"]
+    
+    def test_import_members_ndjson(self, auth_headers):
+        """Test bulk import from NDJSON"""
+        import json
+        team = 100000 + int(uuid.uuid4().int % 100000)
+        body = "\n".join([
+            json.dumps({"first_name": "Nora", "last_name": "Json", "team": team}),
+            "not json",
+            json.dumps({"last_name": "Missing first name", "team": team}),
+        ])
+        response = client.post(
+            "/members/import",
+            content=body.encode(),
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+        )
+        assert response.status_code == 200
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert results[-1] == {"status": "done", "imported": 1, "failed": 2}
+        
+        response = client.post(
+            "/members/import", content=b"x", headers={**auth_headers, "Content-Type": "text/plain"}
+        )
+        assert response.status_code == 415
+    
+    def test_export_members(self, auth_headers):
+        """Test streaming export as CSV and NDJSON"""
+        import csv
+        import io
+        import json
+        team = 100000 + int(uuid.uuid4().int % 100000)
+        for first_name, roles in [("Olga", ["player", "parent"]), ("Paul", ["coach"])]:
+            client.post("/members/", json={
+                "first_name": first_name, "last_name": "Export", "roles": roles,
+                "team": team, "notes": "line one\nline two"
+            }, headers=auth_headers)
+        
+        response = client.get(f"/members/export?team={team}", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["first_name"] for row in rows] == ["Paul", "Olga"]
+        assert rows[1]["roles"] == "player;parent"
+        assert rows[1]["notes"] == "line one\nline two"
+        
+        response = client.get(f"/members/export?format=ndjson&team={team}&role=coach", headers=auth_headers)
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["first_name"] for row in rows] == ["Paul"]
+        assert rows[0]["roles"] == ["coach"]
+        
+        # No matches: CSV still has its header
+        response = client.get(f"/members/export?team={team}&q=nomatchxyz", headers=auth_headers)
+        assert response.text.startswith("id,first_name,last_name")
+        assert len(response.text.splitlines()) == 1
+    
+    def test_batch_update_members(self, auth_headers):
+        """Test batch updates with ids + update and with per-id patches"""
+        unique_id = str(uuid.uuid4())[:8]
+        team = 100000 + int(uuid.uuid4().int % 100000)
+        ids = []
+        for name in ["Ada", "Bo", "Cy"]:
+            response = client.post("/members/", json={
+                "first_name": name, "last_name": "Batch", "roles": ["player"],
+                "email": f"{name.lower()}.{unique_id}@example.com", "team": team
+            }, headers=auth_headers)
+            ids.append(response.json()["id"])
+        missing_id = str(uuid.uuid4())
+        
+        response = client.patch("/members/batch", json={
+            "ids": ids[:2] + [missing_id],
+            "update": {"team": team + 1, "roles": ["coach"]}
+        }, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["updated"], data["failed"]) == (2, 1)
+        assert [result["status"] for result in data["results"]] == ["updated", "updated", "not_found"]
+        
+        response = client.get(f"/members/?team={team + 1}&role=coach", headers=auth_headers)
+        assert {member["id"] for member in response.json()["members"]} == set(ids[:2])
+        assert all(member["updated_at"] for member in response.json()["members"])
+        
+        response = client.patch("/members/batch", json={"patches": [
+            {"id": ids[0], "status": "inactive"},
+            {"id": ids[1], "email": f"cy.{unique_id}@example.com"},
+            {"id": ids[2], "first_name": None},
+            {"id": ids[2], "notes": "rolled over"},
+        ]}, headers=auth_headers)
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == ["updated", "error", "error", "error"]
+        assert results[1]["error"] == "Email already exists"
+        assert results[2]["error"] == "May not be null: first_name"
+        assert results[3]["error"] == "Duplicate id in batch"
+        assert client.get(f"/members/{ids[0]}", headers=auth_headers).json()["status"] == "inactive"
+        assert client.get(f"/members/{ids[2]}", headers=auth_headers).json()["notes"] is None
+        
+        # Ids match in any spelling of the UUID, results carry the canonical id
+        response = client.patch("/members/batch", json={"patches": [
+            {"id": ids[2].upper(), "notes": "upper"},
+            {"id": ids[1].replace("-", ""), "notes": "no dashes"},
+            {"id": ids[2], "notes": "again"},
+        ]}, headers=auth_headers)
+        results = response.json()["results"]
+        assert [(r["id"], r["status"]) for r in results] == [
+            (ids[2], "updated"), (ids[1], "updated"), (ids[2], "error")
+        ]
+        assert client.get(f"/members/{ids[1]}", headers=auth_headers).json()["notes"] == "no dashes"
+        response = client.patch("/members/batch", json={
+            "ids": [ids[0].upper(), ids[0]], "update": {"notes": "once"}
+        }, headers=auth_headers)
+        assert [(r["id"], r["status"]) for r in response.json()["results"]] == [(ids[0], "updated")]
+        
+        # ids + update and patches cannot be mixed
+        response = client.patch("/members/batch", json={
+            "ids": ids, "update": {"team": 1}, "patches": [{"id": ids[0]}]
+        }, headers=auth_headers)
+        assert response.status_code == 422
+    
     def test_search_members(self, auth_headers):
         """Test searching members"""
         import uuid
@@ -220,12 +819,25 @@ class TestMembersAPI:
         assert any("john" in member["first_name"].lower() for member in data["members"])
         
         # Test search by email
-        response = client.get("/members/?q=john.doe@example.com", headers=auth_headers)
+        response = client.get(f"/members/?q={member_data['email']}", headers=auth_headers)
         assert response.status_code == 200
         
         data = response.json()
         assert len(data["members"]) >= 1
-        assert any("john.doe@example.com" in member["email"] for member in data["members"])
+        assert data["members"][0]["email"] == member_data["email"]
+        
+        # Test prefix search on first and last name
+        response = client.get(f"/members/?q=jo%20do%20{unique_id}", headers=auth_headers)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert [member["email"] for member in data["members"]] == [member_data["email"]]
+        
+        # Test search index follows updates
+        member_id = client.get(f"/members/?q={unique_id}", headers=auth_headers).json()["members"][0]["id"]
+        client.patch(f"/members/{member_id}", json={"last_name": f"Renamed{unique_id}"}, headers=auth_headers)
+        response = client.get(f"/members/?q=renamed{unique_id}", headers=auth_headers)
+        assert [member["id"] for member in response.json()["members"]] == [member_id]
     
     def test_validation_errors(self, auth_headers):
         """Test validation errors"""
@@ -278,6 +890,56 @@ class TestMembersAPI:
         response = client.post("/members/", json=member_data, headers=auth_headers)
         assert response.status_code == 400
         assert "Email already exists" in response.json()["detail"]
+
+        # Emails are unique ignoring case
+        member_data["email"] = member_data["email"].upper()
+        response = client.post("/members/", json=member_data, headers=auth_headers)
+        assert response.status_code == 400
+
+    def test_duplicate_email_on_update(self, auth_headers):
+        """Updates to a taken email are rejected by the unique index and change nothing"""
+        unique_id = str(uuid.uuid4())[:8]
+        ids = []
+        for n in range(2):
+            response = client.post("/members/", json={
+                "first_name": f"Dup{n}", "last_name": "Update",
+                "email": f"dup{n}.{unique_id}@example.com", "roles": ["player"]
+            }, headers=auth_headers)
+            assert response.status_code == 201
+            ids.append(response.json()["id"])
+
+        response = client.patch(f"/members/{ids[1]}", json={
+            "first_name": "Changed", "email": f"DUP0.{unique_id}@example.com"
+        }, headers=auth_headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Email already exists"
+        member = client.get(f"/members/{ids[1]}", headers=auth_headers).json()
+        assert (member["first_name"], member["email"]) == ("Dup1", f"dup1.{unique_id}@example.com")
+
+        # A member may change the case of its own email
+        response = client.patch(f"/members/{ids[0]}", json={"email": f"Dup0.{unique_id}@example.com"}, headers=auth_headers)
+        assert response.status_code == 200
+
+    def test_create_runs_no_email_lookup(self, auth_headers):
+        """POST /members/ relies on the unique index instead of a SELECT beforehand"""
+        from sqlalchemy import event
+        from app.db.database import async_engine
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            response = client.post("/members/", json={
+                "first_name": "No", "last_name": "Lookup",
+                "email": f"nolookup.{uuid.uuid4().hex[:8]}@example.com", "roles": ["player"]
+            }, headers=auth_headers)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+        assert response.status_code == 201
+        assert not [s for s in statements if s.startswith("SELECT") and "lower(members.email)" in s]
     
     def test_unauthorized_access(self):
         """Test unauthorized access"""
@@ -0,0 +1,173 @@
+import logging
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add the fussballmanager_api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.main import app
+from app.core.metrics import (
+    MetricsMiddleware, RequestStats, http_request_queries, http_requests, n_plus_one_requests
+)
+from app.core.slow_query_log import SlowQueryLog, redact
+from app.db.base import Base
+from app.db.database import get_settings, make_engine, slow_query_log
+from sqlalchemy import text
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(link_admin):
+    client.post("/auth/register", json={
+        "email": "metrics@example.com",
+        "username": "metricsuser",
+        "password": "metricspass"
+    })
+    link_admin("metricsuser")
+    response = client.post("/auth/login", data={"username": "metricsuser", "password": "metricspass"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class TestMetrics:
+    """Request metrics, query counting and the /metrics endpoint"""
+
+    def test_requests_are_counted_per_route(self, auth_headers):
+        before = http_requests.value("GET", "/members/{member_id}", "404")
+        client.get("/members/does-not-exist", headers=auth_headers)
+        client.get("/members/also-missing", headers=auth_headers)
+        assert http_requests.value("GET", "/members/{member_id}", "404") == before + 2
+
+    def test_unknown_paths_share_one_label(self):
+        before = http_requests.value("GET", "<unmatched>", "404")
+        client.get("/no/such/path/1")
+        client.get("/no/such/path/2")
+        assert http_requests.value("GET", "<unmatched>", "404") == before + 2
+
+    def test_queries_are_counted_for_sync_and_async_routes(self, auth_headers):
+        for route, path in (("/members/", "/members/?limit=5"), ("/members/export", "/members/export")):
+            series = http_request_queries._values
+            before = list(series.get(("GET", route), [0] * 12))
+            response = client.get(path, headers=auth_headers)
+            assert response.status_code == 200
+            after = series[("GET", route)]
+            # One more observation, and its sum of statements grew
+            assert after[-1] == before[-1] + 1
+            assert after[-2] > before[-2]
+
+    def test_metrics_endpoint(self, auth_headers):
+        client.get("/members/?limit=5", headers=auth_headers)
+        client.get("/members/?limit=5", headers=auth_headers)
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert '# TYPE http_request_duration_seconds histogram' in text
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/members/",le="+Inf"}' in text
+        assert 'http_request_queries_count{method="GET",route="/members/"}' in text
+        assert 'db_pool_checked_out{engine="sync"}' in text
+        assert 'cache_hits{cache="member_count"}' in text
+        # The second request found its user in the principal cache
+        hits = next(line for line in text.splitlines() if line.startswith('cache_hits{cache="auth_principal"}'))
+        assert float(hits.split()[-1]) >= 1
+
+    def test_query_threshold_warning(self, caplog):
+        middleware = MetricsMiddleware(app=None, query_warn_threshold=3)
+        before = n_plus_one_requests.value("GET", "/test")
+        with caplog.at_level(logging.WARNING, logger="app.core.metrics"):
+            middleware.record("GET", "/test", 200, 0.01, RequestStats(queries=3))
+            middleware.record("GET", "/test", 200, 0.01, RequestStats(queries=4))
+        assert n_plus_one_requests.value("GET", "/test") == before + 1
+        assert len(caplog.records) == 1
+        assert "executed 4 SQL statements" in caplog.records[0].getMessage()
+
+    def test_readiness(self):
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ready", "database": "ok"}
+
+
+@pytest.fixture
+def record_all_queries():
+    """Make every statement of the app's engines count as slow"""
+    threshold = slow_query_log.threshold
+    slow_query_log.threshold = 1e-9
+    slow_query_log.clear()
+    yield slow_query_log
+    slow_query_log.threshold = threshold
+    slow_query_log.clear()
+
+
+class TestSlowQueryLog:
+    """Slow statement recording with query plans"""
+
+    def test_redacts_emails(self):
+        assert redact(("%anna@example.com%", 5, None)) == ["%<email>%", 5, None]
+        assert redact({"email": "Anna.B@club1.example.com", "q": "anna"}) == {"email": "<email>", "q": "anna"}
+
+    def test_records_plan_and_keeps_only_the_newest(self):
+        log = SlowQueryLog(threshold_ms=1e-6, maxsize=2)
+        engine = make_engine("sqlite://", get_settings(), log)
+        Base.metadata.create_all(bind=engine)
+        log.clear()
+        with engine.connect() as conn:
+            for n in range(3):
+                conn.execute(
+                    text("SELECT id FROM members WHERE lower(email) = :email AND team = :team"),
+                    {"email": "someone@example.com", "team": n},
+                )
+        entries = log.entries()
+        assert len(entries) == 2
+        # Cursor-level parameters, positional for SQLite
+        assert entries[0]["parameters"] == ["<email>", 2]
+        assert any("members" in line for line in entries[0]["plan"])
+        assert entries[0]["explain_error"] is None
+        engine.dispose()
+
+    def test_failed_explain_keeps_the_transaction(self):
+        """On Postgres a failed EXPLAIN is rolled back to a savepoint instead of aborting the request"""
+        from types import SimpleNamespace
+        executed = []
+
+        class Cursor:
+            def execute(self, statement, parameters=None):
+                executed.append(statement.split(" SELECT")[0])
+                if statement.startswith("EXPLAIN"):
+                    raise RuntimeError("explain failed")
+
+            def close(self):
+                pass
+
+        conn = SimpleNamespace(
+            dialect=SimpleNamespace(name="postgresql"),
+            connection=SimpleNamespace(dbapi_connection=SimpleNamespace(cursor=Cursor)),
+        )
+        log = SlowQueryLog(threshold_ms=1e-6)
+        log.record(conn, "SELECT 1", (), False, 1.0)
+        assert log.entries()[0]["explain_error"] == "RuntimeError: explain failed"
+        assert executed == [
+            "SAVEPOINT slow_query_explain", "EXPLAIN", "ROLLBACK TO SAVEPOINT slow_query_explain",
+            "RELEASE SAVEPOINT slow_query_explain",
+        ]
+
+    def test_disabled_by_default(self):
+        assert not SlowQueryLog().enabled
+        assert not SlowQueryLog().is_slow(10.0)
+
+    def test_admin_endpoint(self, auth_headers, record_all_queries):
+        client.get("/members/?q=anna&limit=5", headers=auth_headers)
+        response = client.get("/admin/slow-queries", headers=auth_headers)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["enabled"] is True
+        searches = [q for q in body["queries"] if q["request"] == "GET /members/" and "members" in q["statement"]]
+        assert searches and searches[0]["plan"]
+
+        assert client.delete("/admin/slow-queries", headers=auth_headers).status_code == 204
+        remaining = client.get("/admin/slow-queries", headers=auth_headers).json()["queries"]
+        assert all(q["request"] == "GET /admin/slow-queries" for q in remaining)
+        assert client.get("/admin/slow-queries").status_code == 401
@@ -0,0 +1,140 @@
+import os
+import re
+import sys
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+# Add the fussballmanager_api directory (and the data generator) to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from app.core.pagination import encode_cursor
+from app.core.rbac import Scope
+from app.core.slow_query_log import SlowQueryLog
+from app.db.base import Base
+from app.db.database import get_settings, make_engine
+from app.repositories.member_repo import MemberRepository
+from app.schemas.member_schema import MemberBatchUpdate, MemberFilter, MemberPatch
+from seed import seed
+
+# A plan line that reads a whole table without any index
+FULL_SCAN = re.compile(r"^\s*SCAN (members|member_roles)\s*$")
+TEMP_BTREE = "USE TEMP B-TREE"
+CURSOR = encode_cursor(datetime(2025, 1, 1, tzinfo=timezone.utc), "m")
+MEMBER_ID = "0f8fad5b-d9cb-469f-a165-70867728950e"
+COACH = Scope(1, MEMBER_ID, frozenset(["coach"]), frozenset([105]))
+PLAYER = Scope(2, MEMBER_ID, frozenset(["player"]), frozenset([105]))
+
+
+@pytest.fixture(scope="module")
+def plan_log(tmp_path_factory):
+    """
+    Seeded SQLite database whose engine records the plan of every statement;
+    ANALYZE has run (seed does it), so the planner sees realistic statistics
+    """
+    log = SlowQueryLog(threshold_ms=1e-9, maxsize=100)
+    engine = make_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}", get_settings(), log)
+    Base.metadata.create_all(bind=engine)
+    seed(engine, 2000, hashed_password="x")
+    with Session(engine) as db:
+        yield log, MemberRepository(db)
+    engine.dispose()
+
+
+def list_members(**filters):
+    return lambda repo: repo.list_members(MemberFilter(**filters))
+
+
+def scoped_list(scope, **filters):
+    return lambda repo: MemberRepository(repo.db, scope).list_members(MemberFilter(**filters))
+
+
+def export(**filters):
+    return lambda repo: [batch for batch in repo.iter_export(MemberFilter(**filters), 500)]
+
+
+# name: (repository call, indexes the plans must use, temp B-tree allowed)
+CASES = {
+    "get_by_id": (lambda repo: repo.get_by_id("missing"), ["SEARCH members USING"], False),
+    "get_by_email": (lambda repo: repo.get_by_email("Anna.Weber@Example.com"), ["ux_members_email_lower"], False),
+    "check_email_exists": (
+        lambda repo: repo.check_email_exists("anna.weber@example.com", "missing"), ["ux_members_email_lower"], False
+    ),
+    "existing_emails": (
+        lambda repo: repo.existing_emails(["a@example.com", "b@example.com"]), ["ux_members_email_lower"], False
+    ),
+    "batch_update_email": (
+        lambda repo: repo.batch_update(MemberBatchUpdate(patches=[MemberPatch(id="missing", email="c@example.com")])),
+        ["ux_members_email_lower"],
+        False,
+    ),
+    "get_members_by_team": (lambda repo: repo.get_members_by_team(105, "active"), ["idx_members_team_status"], False),
+    "get_members_by_role": (lambda repo: repo.get_members_by_role("coach"), ["idx_member_roles_role_member"], False),
+    "list": (list_members(), ["idx_members_created_at_id"], False),
+    "list_deep_offset": (list_members(offset=1500, include_total=False), ["idx_members_created_at_id"], False),
+    "list_cursor": (list_members(cursor=CURSOR), ["idx_members_created_at_id ((created_at,id)<(?,?))"], False),
+    "list_status": (list_members(status="inactive"), ["idx_members_created_at_id"], False),
+    "list_team": (list_members(team=105), ["idx_members_team_created_at_id (team=?)"], False),
+    "list_team_status": (
+        list_members(team=105, status="active"),
+        ["idx_members_team_status (team=? AND status=?)", "idx_members_team_created_at_id (team=?)"],
+        False,
+    ),
+    "list_role": (
+        list_members(role="coach"), ["idx_members_created_at_id", "idx_member_roles_role_member (role=?)"], False
+    ),
+    "list_role_status": (
+        list_members(role="player", status="active"),
+        ["idx_members_created_at_id", "idx_member_roles_role_member (role=?)"],
+        False,
+    ),
+    # Age groups are birthdate ranges: counts read the index alone, a group's page
+    # (one birth year) is small enough to sort
+    "list_age_group": (
+        list_members(age_group="U15"),
+        ["idx_members_birthdate_team_status (birthdate>? AND birthdate<?)",
+         "COVERING INDEX idx_members_birthdate_team_status"],
+        True,
+    ),
+    "list_team_age_group": (
+        list_members(team=105, age_group="U15"),
+        ["idx_members_team_created_at_id (team=?)", "COVERING INDEX idx_members_birthdate_team_status"],
+        False,
+    ),
+    # Scoped lists read the team's rows and the member's own row (the pages of a
+    # team are small enough to sort), never the whole table
+    "list_coach": (scoped_list(COACH), ["MULTI-INDEX OR", "(team=?)", "(id=?)"], True),
+    "list_coach_role": (scoped_list(COACH, role="player"), ["MULTI-INDEX OR", "(member_id=? AND role=?)"], True),
+    "list_player": (scoped_list(PLAYER, role="player"), ["(id=?)"], False),
+    "export": (export(), ["idx_members_created_at_id"], False),
+    "export_role": (export(role="parent"), ["idx_members_created_at_id"], False),
+    # Search results come from the FTS index; ranked results are sorted by bm25 score,
+    # which no index can provide, and sort=newest sorts the (few) matches
+    "search": (list_members(q="anna"), ["members_fts VIRTUAL TABLE"], True),
+    "search_newest": (list_members(q="mül", sort="newest"), ["members_fts VIRTUAL TABLE"], True),
+}
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_query_plan(plan_log, name):
+    log, repo = plan_log
+    call, expected_indexes, temp_btree_allowed = CASES[name]
+    log.clear()
+    call(repo)
+    repo.db.rollback()
+
+    plans = [
+        (entry["statement"], entry["plan"])
+        for entry in log.entries()
+        if entry["plan"] and "table_versions" not in entry["statement"]
+    ]
+    assert plans, f"{name} ran no SELECT on members"
+    lines = [line for _, plan in plans for line in plan]
+    for statement, plan in plans:
+        assert not any(FULL_SCAN.match(line) for line in plan), f"Full table scan:\n{statement}\n{plan}"
+        if not temp_btree_allowed:
+            assert not any(TEMP_BTREE in line for line in plan), f"Sort without index:\n{statement}\n{plan}"
+    for index in expected_indexes:
+        assert any(index in line for line in lines), f"{index} not used by {name}:\n" + "\n".join(lines)
@@ -0,0 +1,326 @@
+import os
+import sys
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+# Add the fussballmanager_api directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.main import app
+from app.core.rbac import Scope, check_member_changes
+from app.db.database import async_engine
+from app.models.member_model import Member
+
+client = TestClient(app)
+
+
+def login(username: str, password: str = "rbacpass") -> dict:
+    response = client.post("/auth/login", data={"username": username, "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def admin_headers(link_admin):
+    client.post("/auth/register", json={"email": "rbac-admin@example.com", "username": "rbacadmin", "password": "rbacpass"})
+    link_admin("rbacadmin")
+    return login("rbacadmin")
+
+
+def register(username: str, email: str) -> int:
+    response = client.post("/auth/register", json={"email": email, "username": username, "password": "rbacpass"})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+@pytest.fixture
+def club(admin_headers):
+    """
+    Two teams with two players each, a coach of the first team and an account
+    per member, linked by the admin
+    """
+    team = 200000 + int(uuid.uuid4().int % 100000)
+    members = {}
+    for name, roles, member_team in (
+        ("coach", ["coach"], team), ("anna", ["player"], team), ("ben", ["player"], team),
+        ("carl", ["player"], team + 1), ("dora", ["player", "parent"], team + 1),
+    ):
+        username = f"{name}_{uuid.uuid4().hex[:8]}"
+        response = client.post("/members/", json={
+            "first_name": name.title(), "last_name": "Rbac", "email": f"{username}@example.com",
+            "roles": roles, "team": member_team
+        }, headers=admin_headers)
+        assert response.status_code == 201
+        user_id = register(username, f"{username}@example.com")
+        link = client.put(f"/admin/users/{user_id}/member", json={"member_id": response.json()["id"]}, headers=admin_headers)
+        assert link.status_code == 200 and link.json()["member_id"] == response.json()["id"]
+        members[name] = {"id": response.json()["id"], "username": username}
+    return team, members
+
+
+def statements_of(method: str, url: str, headers: dict, **kwargs):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = client.request(method, url, headers=headers, **kwargs)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    return response, statements
+
+
+class TestMemberScopes:
+    """Row-level access rules applied in the member queries"""
+
+    def test_scope_rules(self):
+        coach = Scope(1, "m1", frozenset(["coach"]), frozenset([7]))
+        sql = str(coach.member_clause())
+        assert sql.startswith("members.team IN") and " OR members.id = " in sql
+        player = Scope(2, "m2", frozenset(["player"]), frozenset([7]))
+        assert player.can_access(Member(id="m2", team=8))
+        assert not player.can_access(Member(id="m3", team=7))
+        assert coach.can_access(Member(id="m3", team=7))
+        assert Scope(3, None, frozenset(["admin"]), frozenset()).member_clause() is None
+        nobody = Scope(4, None, frozenset(), frozenset())
+        assert str(nobody.member_clause()) == "false"
+        assert nobody.key != coach.key != player.key
+
+    def test_coach_sees_own_team(self, club):
+        team, members = club
+        headers = login(members["coach"]["username"])
+
+        response = client.get(f"/members/?team={team}", headers=headers)
+        assert {m["first_name"] for m in response.json()["members"]} == {"Coach", "Anna", "Ben"}
+        # Totals count visible members only
+        response = client.get(f"/members/?team={team + 1}", headers=headers)
+        assert response.json()["members"] == [] and response.json()["total"] == 0
+        response = client.get("/members/?q=rbac&sort=newest", headers=headers)
+        assert {m["first_name"] for m in response.json()["members"]} <= {"Coach", "Anna", "Ben"}
+
+        assert client.get(f"/members/{members['anna']['id']}", headers=headers).status_code == 200
+        assert client.get(f"/members/{members['carl']['id']}", headers=headers).status_code == 404
+        response = client.post("/members/lookup", json={
+            "ids": [members["anna"]["id"], members["carl"]["id"]]
+        }, headers=headers)
+        assert response.json()["missing"] == [members["carl"]["id"]]
+        export = client.get(f"/members/export?format=ndjson&team={team + 1}", headers=headers)
+        assert export.text == ""
+
+        assert client.patch(f"/members/{members['ben']['id']}", json={"notes": "ok"}, headers=headers).status_code == 200
+        assert client.patch(f"/members/{members['carl']['id']}", json={"notes": "no"}, headers=headers).status_code == 404
+        response = client.patch("/members/batch", json={
+            "ids": [members["anna"]["id"], members["dora"]["id"]], "update": {"notes": "batch"}
+        }, headers=headers)
+        assert [r["status"] for r in response.json()["results"]] == ["updated", "not_found"]
+
+        # Admin only
+        assert client.delete(f"/members/{members['ben']['id']}", headers=headers).status_code == 403
+        response = client.post("/members/", json={"first_name": "X", "last_name": "Y"}, headers=headers)
+        assert response.status_code == 403
+        assert client.get("/admin/slow-queries", headers=headers).status_code == 403
+
+    def test_coach_cannot_change_roles_or_email(self, club):
+        team, members = club
+        coach, anna = members["coach"]["id"], members["anna"]["id"]
+        headers = login(members["coach"]["username"])
+
+        for member_id, change in (
+            (coach, {"roles": ["admin"]}), (anna, {"roles": ["coach"]}),
+            (anna, {"email": "mine@example.com"}), (coach, {"team": team + 1}),
+        ):
+            assert client.patch(f"/members/{member_id}", json=change, headers=headers).status_code == 403
+            response = client.patch("/members/batch", json={"ids": [member_id], "update": change}, headers=headers)
+            assert response.status_code == 403
+        response = client.patch("/members/batch", json={"patches": [
+            {"id": anna, "notes": "ok"}, {"id": coach.upper(), "roles": ["admin"]}
+        ]}, headers=headers)
+        assert response.status_code == 403
+
+        assert client.get(f"/members/{coach}", headers=headers).json()["roles"] == ["coach"]
+        assert client.get(f"/members/{anna}", headers=headers).json()["notes"] is None
+        assert client.get("/admin/slow-queries", headers=headers).status_code == 403
+        # Other fields and players' teams stay the coach's to change
+        assert client.patch(f"/members/{anna}", json={"team": team + 1}, headers=headers).status_code == 200
+
+    def test_coach_cannot_deactivate_members(self, club, admin_headers):
+        team, members = club
+        headers = login(members["coach"]["username"])
+        # An admin who plays in the coach's team
+        response = client.post("/members/", json={
+            "first_name": "Admin", "last_name": "Rbac", "roles": ["admin", "player"], "team": team
+        }, headers=admin_headers)
+        admin_member = response.json()["id"]
+        username = f"admin_{uuid.uuid4().hex[:8]}"
+        user_id = register(username, f"{username}@example.com")
+        client.put(f"/admin/users/{user_id}/member", json={"member_id": admin_member}, headers=admin_headers)
+        admin = login(username)
+
+        assert client.patch(f"/members/{admin_member}", json={"status": "inactive"}, headers=headers).status_code == 403
+        for batch in (
+            {"ids": [admin_member], "update": {"status": "inactive"}},
+            {"patches": [{"id": admin_member, "status": "inactive"}]},
+        ):
+            assert client.patch("/members/batch", json=batch, headers=headers).status_code == 403
+
+        assert client.get(f"/members/{admin_member}", headers=admin).json()["status"] == "active"
+        response = client.post("/members/", json={"first_name": "Still", "last_name": "Admin"}, headers=admin)
+        assert response.status_code == 201
+
+    def test_check_member_changes(self):
+        coach = Scope(1, "m1", frozenset(["coach"]), frozenset([7]))
+        assert check_member_changes(coach, "m2", {"team": 8, "notes": "x"})
+        assert not check_member_changes(coach, "m1", {"team": 8})
+        assert not check_member_changes(coach, "m2", {"roles": ["player"]})
+        assert not check_member_changes(coach, "m2", {"email": None})
+        assert not check_member_changes(coach, "m2", {"status": "inactive"})
+        admin = Scope(3, "m3", frozenset(["admin"]), frozenset())
+        assert check_member_changes(admin, "m3", {"roles": [], "status": "inactive", "email": None, "team": 1})
+
+    def test_email_lookups_apply_the_scope(self, club):
+        from app.db.database import SessionLocal
+        from app.repositories.member_repo import MemberRepository
+        team, members = club
+        coach = Scope(1, members["coach"]["id"], frozenset(["coach"]), frozenset([team]))
+        anna, carl = (f"{members[name]['username']}@example.com" for name in ("anna", "carl"))
+        with SessionLocal() as db:
+            repo = MemberRepository(db, coach)
+            assert repo.get_by_email(anna.upper()).id == members["anna"]["id"]
+            assert repo.get_by_email(carl) is None
+            assert repo.check_email_exists(anna) and not repo.check_email_exists(carl)
+            assert MemberRepository(db).get_by_email(carl).id == members["carl"]["id"]
+
+    def test_facets_count_visible_members(self, club):
+        team, members = club
+        response = client.get("/members/facets", headers=login(members["coach"]["username"]))
+        data = response.json()
+        assert data["total"] >= 3
+        assert all(facet["value"] == team for facet in data["team"])
+        response = client.get("/members/facets", headers=login(members["dora"]["username"]))
+        assert response.json()["total"] == 1
+        assert response.json()["role"] == [{"value": "parent", "count": 1}, {"value": "player", "count": 1}]
+
+    def test_player_sees_only_themselves(self, club):
+        team, members = club
+        headers = login(members["dora"]["username"])
+
+        response = client.get(f"/members/?team={team + 1}", headers=headers)
+        assert [m["id"] for m in response.json()["members"]] == [members["dora"]["id"]]
+        assert response.json()["total"] == 1
+        assert client.get(f"/members/{members['carl']['id']}", headers=headers).status_code == 404
+        response = client.patch(f"/members/{members['dora']['id']}", json={"notes": "me"}, headers=headers)
+        assert response.status_code == 403
+
+    def test_scope_is_cached_and_follows_changes(self, club, admin_headers):
+        team, members = club
+        headers = login(members["coach"]["username"])
+        client.get("/members/?limit=1", headers=headers)
+
+        # The cached scope adds no query: only the version stamp and the page
+        response, statements = statements_of("GET", f"/members/?team={team}&include_total=false", headers)
+        assert response.status_code == 200
+        assert len(statements) == 2 and "table_versions" in statements[0]
+
+        # Moving the coach to the other team drops the cached scope
+        response = client.patch(f"/members/{members['coach']['id']}", json={"team": team + 1}, headers=admin_headers)
+        assert response.status_code == 200
+        response = client.get(f"/members/?team={team + 1}", headers=headers)
+        assert {m["first_name"] for m in response.json()["members"]} == {"Coach", "Carl", "Dora"}
+
+        # A deactivated member loses their roles
+        client.delete(f"/members/{members['coach']['id']}", headers=admin_headers)
+        response = client.get(f"/members/?team={team + 1}", headers=headers)
+        assert response.json()["members"] == []
+
+
+class TestAccountLinks:
+    """Accounts get roles only through a member an admin linked them to"""
+
+    def test_unlinked_account_has_no_access(self, club):
+        team, members = club
+        username = f"self_{uuid.uuid4().hex[:8]}"
+        register(username, f"{username}@example.com")
+        headers = login(username)
+
+        response = client.get(f"/members/?team={team}", headers=headers)
+        assert response.json()["members"] == [] and response.json()["total"] == 0
+        assert client.get(f"/members/{members['anna']['id']}", headers=headers).status_code == 404
+        response = client.post("/members/", json={"first_name": "X", "last_name": "Y"}, headers=headers)
+        assert response.status_code == 403
+        assert client.get("/admin/slow-queries", headers=headers).status_code == 403
+
+    def test_registering_with_a_member_email_grants_nothing(self, admin_headers):
+        email = f"boss_{uuid.uuid4().hex[:8]}@example.com"
+        response = client.post("/members/", json={
+            "first_name": "Boss", "last_name": "Rbac", "email": email, "roles": ["admin"]
+        }, headers=admin_headers)
+        assert response.status_code == 201
+        username = f"boss_{uuid.uuid4().hex[:8]}"
+        register(username, email)
+        headers = login(username)
+
+        assert client.get("/members/", headers=headers).json()["members"] == []
+        assert client.get("/admin/slow-queries", headers=headers).status_code == 403
+
+    def test_link_member(self, club, admin_headers):
+        team, members = club
+        username = f"link_{uuid.uuid4().hex[:8]}"
+        user_id = register(username, f"{username}@example.com")
+        headers = login(username)
+
+        # A member is linked to one account
+        response = client.put(f"/admin/users/{user_id}/member", json={"member_id": members["anna"]["id"]}, headers=admin_headers)
+        assert response.status_code == 409
+        response = client.put(f"/admin/users/{user_id}/member", json={"member_id": str(uuid.uuid4())}, headers=admin_headers)
+        assert response.status_code == 404
+        response = client.put("/admin/users/999999999/member", json={"member_id": None}, headers=admin_headers)
+        assert response.status_code == 404
+        response = client.put(f"/admin/users/{user_id}/member", json={"member_id": None}, headers=headers)
+        assert response.status_code == 403
+
+        # Unlinking the coach hands their member to the new account, the cached scopes follow
+        coach = login(members["coach"]["username"])
+        assert client.get(f"/members/?team={team}", headers=headers).json()["total"] == 0
+        assert client.get(f"/members/?team={team}", headers=coach).json()["total"] == 3
+        coach_user = client.get("/auth/me", headers=coach).json()["id"]
+        assert client.put(f"/admin/users/{coach_user}/member", json={"member_id": None}, headers=admin_headers).status_code == 200
+        response = client.put(
+            f"/admin/users/{user_id}/member", json={"member_id": members["coach"]["id"].upper()}, headers=admin_headers
+        )
+        assert response.status_code == 200 and response.json()["member_id"] == members["coach"]["id"]
+        # Same page as before the link: cached responses are per scope
+        assert client.get(f"/members/?team={team}", headers=headers).json()["total"] == 3
+        assert client.get(f"/members/?team={team}", headers=coach).json()["total"] == 0
+
+    def test_make_admin(self, admin_headers):
+        from app.cli import main
+        username = f"first_{uuid.uuid4().hex[:8]}"
+        register(username, f"{username}@example.com")
+        headers = login(username)
+        assert client.get("/admin/slow-queries", headers=headers).status_code == 403
+
+        assert main(["make-admin", username]) == 0
+        assert client.get("/admin/slow-queries", headers=headers).status_code == 200
+        member_id = client.get("/auth/me", headers=headers).json()["member_id"]
+        assert client.get(f"/members/{member_id}", headers=headers).json()["roles"] == ["admin"]
+        # Running it again changes nothing
+        assert main(["make-admin", username]) == 0
+        assert client.get("/auth/me", headers=headers).json()["member_id"] == member_id
+
+        # An existing member gets the admin role, unless another account has it
+        response = client.post("/members/", json={
+            "first_name": "Made", "last_name": "Admin", "roles": ["coach"], "status": "inactive"
+        }, headers=admin_headers)
+        other = f"second_{uuid.uuid4().hex[:8]}"
+        register(other, f"{other}@example.com")
+        assert main(["make-admin", other, "--member-id", response.json()["id"]]) == 0
+        response = client.get(f"/members/{response.json()['id']}", headers=admin_headers).json()
+        assert response["roles"] == ["coach", "admin"] and response["status"] == "active"
+        assert main(["make-admin", username, "--member-id", response["id"]]) == 1
+        assert main(["make-admin", "nobody-" + uuid.uuid4().hex]) == 1
+        assert main(["make-admin", username, "--member-id", str(uuid.uuid4())]) == 1